@@ -0,0 +1,125 @@
+"""
+Compare the memory and attribute access time of merged configurations held as dictionaries and bound to
+__slots__ objects, e.g. one configuration per tenant in a multi-tenant service.
+
+    python benchmarks/bench_binding.py --depth 4 --width 8 --configs 1000
+"""
+
+import argparse
+import copy
+import dataclasses
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from synthetic import make_tree  # noqa: E402
+
+from config_loader import bind  # noqa: E402
+from config_loader.stats import count_nodes  # noqa: E402
+
+
+def infer_model(value: dict, name: str = "Config") -> type:
+    """
+    Return a dataclass with a field for every key of the value, nested dataclasses for nested tables.
+    """
+    fields = []
+    for key, item in value.items():
+        if isinstance(item, dict):
+            annotation = infer_model(item, name + key.title().replace("_", ""))
+        elif isinstance(item, list):
+            annotation = List[int]
+        else:
+            annotation = type(item)
+        fields.append((key, annotation))
+    return dataclasses.make_dataclass(name, fields)
+
+
+def leaf_path(value: dict) -> List[str]:
+    """
+    Return the key path of the deepest scalar reached by following the first nested table.
+    """
+    path = []
+    while True:
+        tables = [key for key, item in value.items() if isinstance(item, dict)]
+        if not tables:
+            path.append(
+                next(key for key, item in value.items() if not isinstance(item, list))
+            )
+            return path
+        path.append(tables[0])
+        value = value[tables[0]]
+
+
+def peak_memory(build) -> int:
+    tracemalloc.start()
+    try:
+        result = build()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--width", type=int, default=8)
+    parser.add_argument("--configs", type=int, default=1000)
+    parser.add_argument("--lookups", type=int, default=200000)
+    args = parser.parse_args()
+
+    template = make_tree(args.depth, args.width, 0.0, random.Random(0))
+    model = infer_model(template)
+    configs = [
+        make_tree(args.depth, args.width, 0.0, random.Random(i))
+        for i in range(args.configs)
+    ]
+    bind(configs[0], model)
+
+    # Both copies share the scalar values of configs, so only the containers are measured
+    dict_bytes = peak_memory(lambda: [copy.deepcopy(config) for config in configs])
+    bound_bytes = peak_memory(lambda: [bind(config, model) for config in configs])
+    print(f"{args.configs} configs of {count_nodes(template)} nodes")
+    print(f"  dict       {dict_bytes / 1024:10.0f} KiB")
+    print(f"  bound      {bound_bytes / 1024:10.0f} KiB")
+    print(f"  saved      {1 - bound_bytes / dict_bytes:10.1%}")
+
+    path = leaf_path(template)
+    config = configs[0]
+    bound = bind(config, model)
+    lookups = range(args.lookups)
+    expression = "".join(f"[{key!r}]" for key in path)
+    dict_lookup = eval(f"lambda config: config{expression}")
+    attribute = eval(f"lambda config: config.{'.'.join(path)}")
+    assert dict_lookup(config) == attribute(bound)
+
+    timings = {}
+    for name, lookup, value in [
+        ("dict", dict_lookup, config),
+        ("attribute", attribute, bound),
+    ]:
+        start = time.perf_counter()
+        for _ in lookups:
+            lookup(value)
+        timings[name] = (time.perf_counter() - start) / args.lookups
+        print(
+            f"  {name:<10} {timings[name] * 1e9:10.1f} ns per lookup of {'.'.join(path)}"
+        )
+
+    start = time.perf_counter()
+    for config in configs:
+        bind(config, model)
+    print(
+        f"  binding    {(time.perf_counter() - start) / len(configs) * 1000:10.3f} ms per config"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Compare loading a config set whose files include shared fragments with one resolver per load, which parses
+each fragment once, and with one resolver per file, which parses a fragment once for every file including it.
+
+    python benchmarks/bench_includes.py --files 40 --fragments 8 --depth 4 --width 8
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from synthetic import make_tree  # noqa: E402
+
+from config_loader import ConfigLoader, LoadStats  # noqa: E402
+
+
+def write_config_set(
+    directory: Path, files: int, fragments: int, depth: int, width: int, seed: int
+):
+    """
+    Write fragments of synthetic trees, and files that each include every fragment under its own key.
+    """
+    rng = random.Random(seed)
+    (directory / "default").mkdir()
+    (directory / "shared").mkdir()
+    for i in range(fragments):
+        (directory / "shared" / f"fragment_{i}.json").write_text(
+            json.dumps(make_tree(depth, width, 0.0, rng))
+        )
+    filepaths = []
+    for i in range(files):
+        config = {
+            f"section_{j}": {"$include": f"shared/fragment_{j}.json", "file": i}
+            for j in range(fragments)
+        }
+        filepath = directory / f"config_{i}.json"
+        filepath.write_text(json.dumps(config))
+        filepaths.append(filepath)
+    return filepaths
+
+
+def load(filepaths, default_directory, per_file: bool) -> LoadStats:
+    stats = LoadStats()
+    loader = ConfigLoader(
+        filepaths, default_directory, cache=False, stats=stats, includes=True
+    )
+    if per_file:
+        # A resolver for every file, as if each file were loaded on its own
+        for filepath in filepaths:
+            loader._load_config(filepath, resolver=loader._resolver())
+    else:
+        loader.load()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=40)
+    parser.add_argument("--fragments", type=int, default=8)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--width", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        filepaths = write_config_set(
+            directory, args.files, args.fragments, args.depth, args.width, args.seed
+        )
+        print(f"{args.files} files including {args.fragments} fragments each")
+        timings = {}
+        for name, per_file in [("per file", True), ("per load", False)]:
+            seconds = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                stats = load(filepaths, directory / "default", per_file)
+                seconds.append(time.perf_counter() - start)
+            timings[name] = min(seconds)
+            parses = sum(1 for record in stats.records if record.phase == "parse")
+            print(
+                f"  {name:<10} {timings[name] * 1000:9.2f} ms {parses:6d} files parsed"
+            )
+        print(f"  speedup    {timings['per file'] / timings['per load']:9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Compare the memory held by many per-tenant configurations loaded with and without an InternPool.
+Each tenant file is generated from the same structure, so the configurations share their keys and many values.
+
+    python benchmarks/bench_intern.py --tenants 2000 --depth 3 --width 8
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from synthetic import make_tree  # noqa: E402
+
+from config_loader import ConfigLoader, InternPool  # noqa: E402
+
+
+def load_tenants(filepaths, default_directory, pool):
+    """
+    Load every tenant with its own loader, as a service does when tenants are added, and keep the configurations.
+    """
+    intern = pool if pool is not None else False
+    return [
+        ConfigLoader(filepath, default_directory, cache=False, intern=intern).load()
+        for filepath in filepaths
+    ]
+
+
+def retained_memory(load) -> int:
+    """
+    Return the memory still allocated by load() once it returns, i.e. the size of the configurations it keeps.
+    """
+    gc.collect()
+    tracemalloc.start()
+    configs = load()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del configs
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tenants", type=int, default=2000)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--width", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        (directory / "default").mkdir()
+        filepaths = []
+        for i in range(args.tenants):
+            # Tenants draw their values from a small set, like hostnames and regions
+            tree = make_tree(
+                args.depth, args.width, 0.0, random.Random(args.seed + i % 50)
+            )
+            filepath = directory / f"tenant_{i}.json"
+            filepath.write_text(json.dumps(tree))
+            filepaths.append(filepath)
+
+        print(f"{args.tenants} tenant configs")
+        sizes = {}
+        for name, make_pool in [("plain", lambda: None), ("interned", InternPool)]:
+            start = time.perf_counter()
+            load_tenants(filepaths, directory / "default", make_pool())
+            seconds = time.perf_counter() - start
+            pool = make_pool()
+            sizes[name] = retained_memory(
+                lambda: load_tenants(filepaths, directory / "default", pool)
+            )
+            print(
+                f"  {name:<10} {sizes[name] / 1024:10.0f} KiB {seconds * 1000:9.1f} ms"
+            )
+        print(f"  saved      {1 - sizes['interned'] / sizes['plain']:10.1%}")
+        print(f"  pool       {pool.stats()}")
+
+
+if __name__ == "__main__":
+    main()
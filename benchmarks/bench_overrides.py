@@ -0,0 +1,88 @@
+"""
+Compare applying environment overrides through the prefix trie of EnvOverrides with a naive approach that looks up
+a variable for every key path of the configuration, as the environment and the configuration grow.
+
+    python benchmarks/bench_overrides.py --overrides 20
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from synthetic import make_tree  # noqa: E402
+
+from config_loader.overrides import EnvOverrides, coerce  # noqa: E402
+from config_loader.stats import count_nodes  # noqa: E402
+
+
+def leaf_paths(config, path=()):
+    for key, value in config.items():
+        if isinstance(value, dict):
+            yield from leaf_paths(value, path + (key,))
+        else:
+            yield path + (key,)
+
+
+def naive_apply(config, environ, prefix):
+    """
+    Build the variable name of every leaf and look it up, overriding the config in place.
+    """
+    for path in list(leaf_paths(config)):
+        variable = "__".join((prefix, *(key.upper() for key in path)))
+        if variable in environ:
+            parent = config
+            for key in path[:-1]:
+                parent = parent[key]
+            parent[path[-1]] = coerce(environ[variable], parent[path[-1]], variable)
+    return config
+
+
+def environment(config, overrides, size, rng):
+    paths = list(leaf_paths(config))
+    environ = {f"UNRELATED_{i}": "x" for i in range(size)}
+    for path in rng.sample(paths, overrides):
+        value = config
+        for key in path:
+            value = value[key]
+        environ["__".join(("APP", *(key.upper() for key in path)))] = (
+            json.dumps(value) if isinstance(value, list) else str(value)
+        )
+    return environ
+
+
+def timed(function, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--overrides", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'nodes':>8} {'environ':>8} {'index':>10} {'apply':>10} {'naive':>10}")
+    for depth, width, size in [(3, 8, 100), (4, 10, 100), (5, 10, 100), (5, 10, 10000)]:
+        config = make_tree(depth, width, 0.0, rng)
+        environ = environment(config, args.overrides, size, rng)
+        overrides = EnvOverrides("APP", environ)
+        index = timed(lambda: EnvOverrides("APP", environ))
+        apply = timed(lambda: overrides.apply(config))
+        naive = timed(lambda: naive_apply(config, environ, "APP"), repeat=3)
+        print(
+            f"{count_nodes(config):8d} {len(environ):8d} {index * 1e6:8.1f}us "
+            f"{apply * 1e6:8.1f}us {naive * 1e6:8.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Compare the parser backends available for each format on realistic configuration sizes.
+
+    python benchmarks/bench_parsers.py
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import yaml  # noqa: E402
+
+from config_loader.parsers import available_parsers  # noqa: E402
+from synthetic import to_toml  # noqa: E402
+
+SIZES = {"small": 5, "medium": 100, "large": 2000}
+
+
+def make_config(services: int) -> dict:
+    """
+    Build a configuration with one section per service, similar to a service bundle.
+    """
+    return {
+        "name": "benchmark",
+        "version": 1.5,
+        "services": {
+            f"service_{i}": {
+                "host": f"service-{i}.internal.example.com",
+                "port": 8000 + i,
+                "enabled": i % 3 != 0,
+                "timeout": 30.5,
+                "tags": ["web", "internal", f"zone-{i % 4}"],
+                "pool": {"min": 1, "max": 10 + i % 7, "idle_timeout": 300},
+                "retry": {"attempts": 3, "backoff": 0.25},
+            }
+            for i in range(services)
+        },
+    }
+
+
+def documents(size: int) -> dict:
+    config = make_config(size)
+    return {
+        ".json": json.dumps(config, indent=2).encode(),
+        ".yaml": yaml.safe_dump(config, sort_keys=False).encode(),
+        ".toml": to_toml(config).encode(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=0, help="Parses per timing")
+    args = parser.parse_args()
+
+    for size_name, size in SIZES.items():
+        for suffix, document in documents(size).items():
+            print(f"{suffix[1:]:>5} {size_name:<7} ({len(document) / 1024:,.1f} KiB)")
+            results = []
+            for backend in available_parsers(suffix):
+                number = args.number or max(1, 200 // size)
+                seconds = min(
+                    timeit.repeat(
+                        lambda: backend.loads(document), number=number, repeat=5
+                    )
+                )
+                results.append((seconds / number, backend))
+            slowest = max(seconds for seconds, _ in results)
+            for seconds, backend in sorted(results, key=lambda result: result[0]):
+                print(
+                    f"    {backend.name:<10} {seconds * 1000:10.3f} ms"
+                    f" {slowest / seconds:6.1f}x"
+                )
+
+
+if __name__ == "__main__":
+    main()
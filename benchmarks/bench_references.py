@@ -0,0 +1,115 @@
+"""
+Compare resolving references between config values in one topological pass with repeated substitution passes
+over the whole configuration until nothing changes.
+
+    python benchmarks/bench_references.py --depth 4 --width 10 --references 200 --chain 10
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from synthetic import make_tree  # noqa: E402
+
+from config_loader.cache import copy_tree  # noqa: E402
+from config_loader.references import REFERENCE_PATTERN  # noqa: E402
+from config_loader.references import resolve_references  # noqa: E402
+from config_loader.stats import count_nodes  # noqa: E402
+
+
+def string_paths(config, path=()):
+    for key, value in config.items():
+        if isinstance(value, dict):
+            yield from string_paths(value, path + (key,))
+        elif isinstance(value, str):
+            yield path + (key,)
+
+
+def add_references(config, references, chain, rng):
+    """
+    Replace strings with references to other strings, in chains of up to chain references.
+    """
+    paths = list(string_paths(config))
+    rng.shuffle(paths)
+    paths = paths[: references + 1]
+    for i, path in enumerate(paths[1:], 1):
+        target = paths[i - 1] if i % chain else paths[0]
+        parent = config
+        for key in path[:-1]:
+            parent = parent[key]
+        parent[path[-1]] = f"https://${{{'.'.join(target)}}}/api"
+
+
+def fixed_point(config):
+    """
+    Substitute every reference in every string, walking the whole configuration until a pass changes nothing.
+    """
+
+    def lookup(match):
+        value = config
+        for key in match.group(1).split("."):
+            value = value[key]
+        return value if isinstance(value, str) else str(value)
+
+    changed = True
+    passes = 0
+    while changed:
+        changed = False
+        passes += 1
+        stack = [config]
+        while stack:
+            node = stack.pop()
+            for key, value in node.items():
+                if isinstance(value, dict):
+                    stack.append(value)
+                elif isinstance(value, str) and "${" in value:
+                    new = REFERENCE_PATTERN.sub(lookup, value)
+                    if new != value:
+                        node[key] = new
+                        changed = True
+    return passes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--width", type=int, default=10)
+    parser.add_argument("--references", type=int, default=200)
+    parser.add_argument("--chain", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    config = make_tree(args.depth, args.width, 0.0, rng)
+    add_references(config, args.references, args.chain, rng)
+
+    expected = copy_tree(config)
+    passes = fixed_point(expected)
+    assert resolve_references(copy_tree(config)) == expected
+    print(
+        f"{count_nodes(config)} nodes, {args.references} references in chains of {args.chain}, "
+        f"{passes} passes to a fixed point"
+    )
+
+    timings = {}
+    for name, resolve in [
+        ("fixed point", fixed_point),
+        ("topological", resolve_references),
+    ]:
+        copies = [copy_tree(config) for _ in range(args.repeat)]
+        start = time.perf_counter()
+        for copy in copies:
+            resolve(copy)
+        timings[name] = (time.perf_counter() - start) / args.repeat
+        print(f"  {name:<12} {timings[name] * 1000:9.3f} ms")
+    print(f"  speedup      {timings['fixed point'] / timings['topological']:9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Compare validating merged configurations with a compiled schema and with a naive recursive validator.
+
+    python benchmarks/bench_schema.py --depth 5 --width 10 --configs 20
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from synthetic import make_tree  # noqa: E402
+
+from config_loader import compile_schema  # noqa: E402
+from config_loader.stats import count_nodes  # noqa: E402
+
+TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+}
+
+
+def infer_schema(value) -> dict:
+    """
+    Return a schema that the value matches, requiring every key and allowing no others.
+    """
+    if isinstance(value, dict):
+        return {
+            "type": "object",
+            "properties": {key: infer_schema(item) for key, item in value.items()},
+            "required": list(value),
+            "additionalProperties": False,
+        }
+    if isinstance(value, list):
+        return {"type": "array", "items": {"type": "integer", "minimum": 0}}
+    if isinstance(value, bool):
+        return {"type": "boolean"}
+    if isinstance(value, int):
+        return {"type": "integer", "minimum": 0, "maximum": 65535}
+    if isinstance(value, float):
+        return {"type": "number"}
+    return {"type": "string", "minLength": 1}
+
+
+def naive_validate(schema: dict, value, path=()) -> list:
+    """
+    Interpret the schema while walking the value, as a hand-written validator does.
+    """
+    errors = []
+    expected = schema.get("type")
+    if expected is not None:
+        if isinstance(value, bool) and expected in ("integer", "number"):
+            return [(path, f"expected {expected}")]
+        if not isinstance(value, TYPES[expected]):
+            return [(path, f"expected {expected}")]
+    if "minimum" in schema and value < schema["minimum"]:
+        errors.append((path, "too small"))
+    if "maximum" in schema and value > schema["maximum"]:
+        errors.append((path, "too large"))
+    if "minLength" in schema and len(value) < schema["minLength"]:
+        errors.append((path, "too short"))
+    if isinstance(value, dict):
+        properties = schema.get("properties", {})
+        for key in schema.get("required", ()):
+            if key not in value:
+                errors.append((path + (key,), "missing"))
+        for key, item in value.items():
+            if key in properties:
+                errors.extend(naive_validate(properties[key], item, path + (key,)))
+            elif schema.get("additionalProperties") is False:
+                errors.append((path + (key,), "unexpected"))
+    elif isinstance(value, list) and "items" in schema:
+        for index, item in enumerate(value):
+            errors.extend(naive_validate(schema["items"], item, path + (index,)))
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--depth", type=int, default=5)
+    parser.add_argument("--width", type=int, default=10)
+    parser.add_argument("--configs", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    template = make_tree(args.depth, args.width, 0.0, rng)
+    schema = infer_schema(template)
+    configs = [
+        make_tree(args.depth, args.width, 0.0, random.Random(i))
+        for i in range(args.configs)
+    ]
+
+    start = time.perf_counter()
+    compiled = compile_schema(schema)
+    compile_seconds = time.perf_counter() - start
+    assert all(not naive_validate(schema, config) for config in configs)
+    assert all(not compiled.validate(config) for config in configs)
+
+    print(
+        f"{count_nodes(template)} nodes per config, schema compiled in {compile_seconds * 1000:.2f} ms"
+    )
+    timings = {}
+    for name, validate in [
+        ("naive", lambda config: naive_validate(schema, config)),
+        ("compiled", compiled.validate),
+    ]:
+        start = time.perf_counter()
+        for config in configs:
+            validate(config)
+        timings[name] = (time.perf_counter() - start) / len(configs)
+        print(
+            f"  {name:<10} {timings[name] * 1000:9.3f} ms per config "
+            f"{1 / timings[name]:10.0f} configs/s"
+        )
+    print(f"  speedup    {timings['naive'] / timings['compiled']:9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Compare loading one section of a large JSON configuration with loading all of it.
+
+    python benchmarks/bench_select.py --regions 24 --routes 20000
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from config_loader import ConfigLoader  # noqa: E402
+
+
+def make_routing_table(regions: int, routes: int, rng: random.Random) -> dict:
+    """
+    Return a routing table with the given number of regions and routes per region.
+    """
+    return {
+        "routing": {
+            f"region-{i}": {
+                f"route-{j}": {
+                    "target": f"host-{rng.randint(0, 999)}.example.com",
+                    "weight": rng.random(),
+                    "tags": ["primary", "tls"],
+                }
+                for j in range(routes)
+            }
+            for i in range(regions)
+        },
+        "flags": {f"flag-{i}": rng.random() < 0.5 for i in range(routes)},
+    }
+
+
+def measure(load) -> tuple:
+    start = time.perf_counter()
+    load()
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    load()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--regions", type=int, default=24)
+    parser.add_argument("--routes", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        filepath = directory / "routes.json"
+        table = make_routing_table(args.regions, args.routes, random.Random(args.seed))
+        filepath.write_text(json.dumps(table))
+        size = filepath.stat().st_size
+        loader = ConfigLoader(filepath, directory, cache=False)
+        middle = f"routing.region-{args.regions // 2}"
+
+        print(f"{size / 1024 / 1024:.1f} MiB, {args.regions} regions")
+        for name, load in [
+            ("whole file", lambda: loader.load()),
+            (middle, lambda: loader.load(select=[middle])),
+            ("flags.flag-0", lambda: loader.load(select=["flags.flag-0"])),
+        ]:
+            seconds, peak = measure(load)
+            print(
+                f"  {name:<20} {seconds * 1000:9.1f} ms {peak / 1024 / 1024:9.2f} MiB peak"
+            )
+
+
+if __name__ == "__main__":
+    main()
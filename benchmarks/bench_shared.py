@@ -0,0 +1,109 @@
+"""
+Compare worker processes that each load a config set with workers that attach to one published SharedConfig.
+
+    python benchmarks/bench_shared.py --files 40 --workers 8
+"""
+
+import argparse
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from synthetic import generate_config_set  # noqa: E402
+
+from config_loader import ConfigLoader, SharedConfig  # noqa: E402
+
+
+def measure(run) -> tuple:
+    start = time.perf_counter()
+    run()
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def load_worker(filepaths, default_directory, environ) -> tuple:
+    """
+    Load the config set as every worker does without sharing.
+    """
+    os.environ.update(environ)
+    return measure(
+        lambda: ConfigLoader(filepaths, default_directory, cache=False).load()
+    )
+
+
+def attach_worker(name) -> tuple:
+    """
+    Attach to the published config set and read one value from each file.
+    """
+
+    def attach():
+        with SharedConfig.attach(name=name) as shared:
+            for config in shared.root.values():
+                next(iter(config.values()))
+
+    return measure(attach)
+
+
+def report(name, results):
+    seconds = statistics.median(result[0] for result in results)
+    peak = statistics.median(result[1] for result in results)
+    print(f"  {name:<10} {seconds * 1000:9.2f} ms {peak / 1024:10.1f} KiB peak")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--width", type=int, default=10)
+    parser.add_argument("--files", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        filepaths, default_directory, environ = generate_config_set(
+            Path(directory),
+            depth=args.depth,
+            width=args.width,
+            files=args.files,
+            seed=args.seed,
+        )
+        os.environ.update(environ)
+        configs = ConfigLoader(filepaths, default_directory, cache=False).load()
+        start = time.perf_counter()
+        shared = SharedConfig.publish(configs)
+        publish_seconds = time.perf_counter() - start
+        print(
+            f"{args.files} files, published {shared.nbytes / 1024:.1f} KiB "
+            f"in {publish_seconds * 1000:.2f} ms; median per worker of {args.workers}:"
+        )
+        try:
+            # Spawned workers start from a fresh interpreter, as workers that do not preload the app do
+            context = multiprocessing.get_context("spawn")
+            with context.Pool(args.workers) as pool:
+                report(
+                    "load",
+                    pool.starmap(
+                        load_worker,
+                        [(filepaths, default_directory, environ)] * args.workers,
+                    ),
+                )
+                report("attach", pool.map(attach_worker, [shared.name] * args.workers))
+        finally:
+            shared.close()
+            shared.unlink()
+
+
+if __name__ == "__main__":
+    main()
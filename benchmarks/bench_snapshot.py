@@ -0,0 +1,75 @@
+"""
+Compare the cold start of a fresh interpreter loading a config set with and without a snapshot.
+
+    python benchmarks/bench_snapshot.py --files 40 --runs 10
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic import generate_config_set  # noqa: E402
+
+SCRIPT = """
+import time
+start = time.perf_counter()
+from config_loader import ConfigLoader
+ConfigLoader({filepaths!r}, {default_directory!r}, snapshot={snapshot!r}).load()
+print(time.perf_counter() - start)
+"""
+
+
+def cold_start(filepaths, default_directory, snapshot, runs) -> list:
+    script = SCRIPT.format(
+        filepaths=filepaths, default_directory=default_directory, snapshot=snapshot
+    )
+    src = str(Path(__file__).resolve().parent.parent / "src")
+    env = dict(os.environ, PYTHONPATH=src)
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            env=env,
+            check=True,
+        )
+        timings.append(float(result.stdout))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=40)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        filepaths, default_directory, _ = generate_config_set(
+            directory, depth=3, width=12, files=args.files
+        )
+        filepaths = [str(filepath) for filepath in filepaths]
+        default_directory = str(default_directory)
+        snapshot = str(directory / "snapshot.pickle")
+
+        parsed = cold_start(filepaths, default_directory, None, args.runs)
+        # The first run writes the snapshot, every following run reads it
+        cold_start(filepaths, default_directory, snapshot, 1)
+        snapshotted = cold_start(filepaths, default_directory, snapshot, args.runs)
+
+    parsed_ms = statistics.median(parsed) * 1000
+    snapshot_ms = statistics.median(snapshotted) * 1000
+    print(f"{args.files} files, median of {args.runs} cold starts")
+    print(f"  parse and merge: {parsed_ms:8.2f} ms")
+    print(f"  snapshot:        {snapshot_ms:8.2f} ms ({parsed_ms / snapshot_ms:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Benchmark the load path on a synthetic configuration set and compare against a stored baseline.
+
+    python benchmarks/run.py --save benchmarks/baseline.json
+    python benchmarks/run.py --baseline benchmarks/baseline.json --threshold 0.2
+
+Each benchmark records the minimum and median wall time of several runs and the peak memory
+allocated during one run. With --baseline, the run fails if any minimum time or peak memory
+exceeds the baseline by more than the threshold.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from config_loader import ConfigLoader, FlatConfig, ParsedFileCache  # noqa: E402
+from config_loader.cache import copy_tree  # noqa: E402
+from config_loader.merge import merge_configs, merge_layers  # noqa: E402
+from config_loader.secrets_loader import load_secrets, parse_secrets  # noqa: E402
+from synthetic import FORMATS, generate_config_set, overlay  # noqa: E402
+
+
+def measure(
+    setup: Callable[[], Any], run: Callable[[Any], Any], repeat: int
+) -> Dict[str, float]:
+    """
+    Time run(setup()) repeat times, then measure its peak memory once with tracemalloc.
+    """
+    timings = []
+    for _ in range(repeat):
+        args = setup()
+        start = time.perf_counter()
+        run(args)
+        timings.append(time.perf_counter() - start)
+
+    args = setup()
+    tracemalloc.start()
+    run(args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "min_s": min(timings),
+        "median_s": statistics.median(timings),
+        "peak_bytes": peak,
+    }
+
+
+def run_benchmarks(directory: Path, args: argparse.Namespace) -> Dict[str, Dict]:
+    filepaths, default_directory, environ = generate_config_set(
+        directory,
+        depth=args.depth,
+        width=args.width,
+        files=args.files,
+        formats=args.formats,
+        placeholder_density=args.placeholders,
+        seed=args.seed,
+    )
+    env_filepath = directory / "secrets.env"
+    env_filepath.write_text("".join(f"{k}={v}\n" for k, v in environ.items()))
+    os.environ.update(environ)
+
+    loader = ConfigLoader(filepaths, default_directory, cache=False)
+    configs = loader.load()
+    pairs = [
+        (loader._load_defaults(filepath), loader._load_file(filepath))
+        for filepath in filepaths
+    ]
+    cache = ParsedFileCache()
+    cached_loader = ConfigLoader(filepaths, default_directory, cache=cache)
+    cached_loader.load()
+
+    def merge_all(pairs):
+        for default_config, user_config in pairs:
+            loader._merge_configs(default_config, user_config)
+
+    # Stacks of a default, three overlay layers (base, environment, region) and the user file
+    rng = random.Random(args.seed)
+    stacks = []
+    for default_config, user_config in pairs:
+        layers = [overlay(default_config, rng) for _ in range(3)]
+        stacks.append([default_config, *layers, user_config])
+    names = ["default", "base", "environment", "region", "user"]
+
+    def merge_chains(stacks):
+        for stack in stacks:
+            merged = stack[0]
+            for layer in stack[1:]:
+                merged = merge_configs(merged, layer)
+
+    def merge_stacks(stacks):
+        for stack in stacks:
+            merge_layers(stack, names)
+
+    flat = FlatConfig(configs)
+    paths = [path.split(".") for path in flat]
+
+    def lookup_nested(_):
+        for path in paths:
+            node = configs
+            for key in path:
+                node = node.get(key, {})
+
+    def lookup_flat(_):
+        get = flat.get
+        for path in flat:
+            get(path)
+
+    benchmarks = {
+        "load": (lambda: None, lambda _: loader.load()),
+        "load_cached": (lambda: None, lambda _: cached_loader.load()),
+        "merge_configs": (lambda: copy_tree(pairs), merge_all),
+        "merge_chain": (lambda: stacks, merge_chains),
+        "merge_layers": (lambda: stacks, merge_stacks),
+        "load_secrets": (lambda: None, lambda _: load_secrets(env_filepath)),
+        "parse_secrets": (lambda: copy_tree(configs), parse_secrets),
+        "flatten": (lambda: None, lambda _: FlatConfig(configs)),
+        "lookup_nested": (lambda: None, lookup_nested),
+        "lookup_flat": (lambda: None, lookup_flat),
+    }
+    selected = args.only or list(benchmarks)
+    return {name: measure(*benchmarks[name], repeat=args.repeat) for name in selected}
+
+
+def compare(
+    results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float
+) -> bool:
+    """
+    Print each result against the baseline and return False if any of them regressed.
+    """
+    ok = True
+    print(
+        f"{'benchmark':<15} {'min':>12} {'baseline':>12} {'peak':>12} {'baseline':>12}"
+    )
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<15} {result['min_s'] * 1000:10.3f}ms {'-':>12}")
+            continue
+        regressions = [
+            metric
+            for metric in ("min_s", "peak_bytes")
+            if result[metric] > base[metric] * (1 + threshold)
+        ]
+        ok = ok and not regressions
+        print(
+            f"{name:<15} {result['min_s'] * 1000:10.3f}ms {base['min_s'] * 1000:10.3f}ms"
+            f" {result['peak_bytes'] / 1024:10.1f}KiB {base['peak_bytes'] / 1024:10.1f}KiB"
+            + (f"  REGRESSION: {', '.join(regressions)}" if regressions else "")
+        )
+    return ok
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--width", type=int, default=8)
+    parser.add_argument("--files", type=int, default=12)
+    parser.add_argument("--formats", nargs="+", default=list(FORMATS))
+    parser.add_argument(
+        "--placeholders", type=float, default=0.2, help="Fraction of string values"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=15)
+    parser.add_argument("--only", nargs="+", help="Benchmarks to run")
+    parser.add_argument("--save", type=Path, help="Write the results as a baseline")
+    parser.add_argument("--baseline", type=Path, help="Compare against a baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="Allowed relative regression"
+    )
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = run_benchmarks(Path(directory), args)
+
+    parameters = {
+        key: getattr(args, key)
+        for key in ("depth", "width", "files", "formats", "placeholders", "seed")
+    }
+    if args.save:
+        args.save.write_text(
+            json.dumps({"parameters": parameters, "results": results}, indent=2)
+        )
+
+    baseline = {}
+    if args.baseline:
+        stored = json.loads(args.baseline.read_text())
+        if stored["parameters"] != parameters:
+            print("Baseline was recorded with different parameters", file=sys.stderr)
+            return 2
+        baseline = stored["results"]
+    return 0 if compare(results, baseline, args.threshold) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""
+Generate synthetic configuration sets for benchmarks.
+Trees have a controllable depth and width, files are spread over a mix of formats,
+and a fraction of the string values are ${VAR} placeholders.
+"""
+
+import json
+import random
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import yaml
+
+FORMATS = (".yaml", ".toml", ".json")
+
+
+def make_tree(
+    depth: int, width: int, placeholder_density: float, rng: random.Random
+) -> dict:
+    """
+    Build a tree with width keys per table: half nested tables until depth is reached, half leaves.
+    """
+    tree = {}
+    for i in range(width):
+        if depth > 1 and i % 2 == 0:
+            tree[f"section_{i}"] = make_tree(depth - 1, width, placeholder_density, rng)
+            continue
+        kind = i % 5
+        if kind == 0:
+            value = rng.randint(0, 65535)
+        elif kind == 1:
+            value = round(rng.random() * 100, 3)
+        elif kind == 2:
+            value = rng.random() < 0.5
+        elif kind == 3:
+            value = [rng.randint(0, 100) for _ in range(4)]
+        elif rng.random() < placeholder_density:
+            value = f"${{SECRET_{rng.randint(0, 99)}}}"
+        else:
+            value = f"host-{rng.randint(0, 999)}.example.com"
+        tree[f"key_{i}"] = value
+    return tree
+
+
+def overlay(tree: dict, rng: random.Random, fraction: float = 0.3) -> dict:
+    """
+    Return a tree overriding a fraction of the leaves of tree, as a user file overrides its defaults.
+    """
+    result = {}
+    for key, value in tree.items():
+        if isinstance(value, dict):
+            nested = overlay(value, rng, fraction)
+            if nested:
+                result[key] = nested
+        elif rng.random() < fraction:
+            result[key] = value
+    return result
+
+
+def to_toml(config: dict, prefix: str = "") -> str:
+    """
+    Write a configuration of nested tables, scalars and flat lists as TOML.
+    """
+    lines, tables = [], []
+    for key, value in config.items():
+        if isinstance(value, dict):
+            tables.append((key, value))
+        else:
+            lines.append(f"{key} = {json.dumps(value)}")
+    text = (f"[{prefix}]\n" if prefix and lines else "") + "\n".join(lines) + "\n"
+    for key, value in tables:
+        text += "\n" + to_toml(value, f"{prefix}.{key}" if prefix else key)
+    return text
+
+
+def dump(config: dict, suffix: str) -> str:
+    if suffix == ".json":
+        return json.dumps(config, indent=2)
+    if suffix == ".toml":
+        return to_toml(config)
+    return yaml.safe_dump(config, sort_keys=False)
+
+
+def generate_config_set(
+    directory: Path,
+    depth: int = 3,
+    width: int = 8,
+    files: int = 10,
+    formats: Sequence[str] = FORMATS,
+    placeholder_density: float = 0.2,
+    seed: int = 0,
+) -> Tuple[List[Path], Path, Dict[str, str]]:
+    """
+    Write the user files and their defaults under directory.
+    Returns the user filepaths, the default directory and the environment the placeholders refer to.
+    """
+    rng = random.Random(seed)
+    default_directory = directory / "default"
+    default_directory.mkdir(parents=True, exist_ok=True)
+    filepaths = []
+    for i in range(files):
+        suffix = formats[i % len(formats)]
+        defaults = make_tree(depth, width, placeholder_density, rng)
+        filepath = directory / f"service_{i}{suffix}"
+        filepath.write_text(dump(overlay(defaults, rng), suffix))
+        (default_directory / f"service_{i}-default{suffix}").write_text(
+            dump(defaults, suffix)
+        )
+        filepaths.append(filepath)
+    environ = {f"SECRET_{i}": f"value-{i}" for i in range(100)}
+    return filepaths, default_directory, environ
@@ -5,13 +5,12 @@
 # Created Date: 2024-01-01
 # version ='0.0.1'
 # ---------------------------------------------------------------------------
-"""a_short_project_description"""
+"""Run the config-loader command line interface, e.g. python main.py validate config/"""
 # ---------------------------------------------------------------------------
 
+import sys
 
-def main():
-    pass
-
+from config_loader.cli import main
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -1,4 +1,16 @@
 __version__ = "0.0.3"
 
-from .config_loader import ConfigLoader, load_configs
-from .secrets_loader import load_secrets
+from .config_loader import ConfigLoader, load_configs, load_configs_async
+from .binding import BoundConfig, bind
+from .cache import ParsedFileCache
+from .flat import FlatConfig
+from .includes import IncludeCycleError, IncludeError
+from .intern import InternPool
+from .lazy import LazyConfigs
+from .overrides import OverrideError
+from .references import ConfigReferenceError, ReferenceCycleError
+from .schema import ConfigValidationError, compile_schema
+from .secrets_loader import SecretsProvider, load_secrets
+from .shared import SharedConfig
+from .stats import LoadStats
+from .watcher import ConfigWatcher
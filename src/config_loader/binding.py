@@ -0,0 +1,351 @@
+"""
+Bind merged configurations to compact, typed, read-only objects.
+The type model is a set of dataclasses. For each one, a class with __slots__ is generated, so a bound
+configuration holds its values in fixed slots instead of dictionaries, takes a fraction of their memory
+and is read by attribute. Values are coerced to the declared types while binding, e.g. "8080" to 8080,
+and lists become tuples.
+"""
+
+import dataclasses
+import datetime
+import threading
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+
+from .coerce import (
+    MISSING,
+    SCALARS,
+    UNION_TYPES,
+    InvalidValue,
+    to_none,
+    type_name,
+)
+from .merge import Provenance
+from .schema import ConfigValidationError, KeyPath, SchemaViolation
+
+Coercer = Callable[[Any, KeyPath, List[SchemaViolation]], Any]
+
+
+class BoundConfig:
+    """
+    The base of the classes generated for dataclass models. Instances are read-only.
+    """
+
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+    _model: Optional[type] = None
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self._fields)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"{type(self).__name__}({values})"
+
+    def __reduce__(self):
+        # The generated class cannot be imported, so an instance is pickled as its model and values
+        return bind, (self.to_dict(), self._model)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return the values as nested dictionaries and lists.
+        """
+        return {name: _unbind(getattr(self, name)) for name in self._fields}
+
+
+def _unbind(value: Any) -> Any:
+    if isinstance(value, BoundConfig):
+        return value.to_dict()
+    # A default instance of a nested dataclass
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return _unbind(dataclasses.asdict(value))
+    if type(value) is tuple:
+        return [_unbind(item) for item in value]
+    if type(value) is dict:
+        return {key: _unbind(item) for key, item in value.items()}
+    return value
+
+
+_classes: Dict[type, type] = {}
+# The coercers of models being planned as well, and of the models that are ready, which are read without locking
+_coercers: Dict[type, Coercer] = {}
+_ready: Dict[type, Coercer] = {}
+_lock = threading.RLock()
+
+
+def bound_class(model: type) -> type:
+    """
+    Return the __slots__ class generated for a dataclass model, with the same name and fields.
+    """
+    _model_coercer(model)
+    return _classes[model]
+
+
+def bind(
+    config: Any,
+    model: type,
+    provenance: Optional[Provenance] = None,
+    stem: Optional[str] = None,
+) -> BoundConfig:
+    """
+    Bind a configuration to an instance of the class generated for a dataclass model.
+    Values are coerced to the type of their field: numbers and booleans from strings, ints from whole floats,
+    floats from ints, lists to tuples, nested dictionaries to nested models, and other classes, e.g. datetime.date
+    or an Enum, from their ISO format or by calling the class. Missing fields take their default as it is, without coercion.
+    Raise a ConfigValidationError listing every missing, unexpected or unconvertible value. With the Provenance
+    of a merged configuration, each violation names the layer its value came from, and the error names the stem.
+    """
+    violations: List[SchemaViolation] = []
+    try:
+        bound = _model_coercer(model)(config, (), violations)
+    except InvalidValue as error:
+        violations.append(SchemaViolation((), str(error)))
+    if violations:
+        if provenance is not None:
+            for violation in violations:
+                violation.source = provenance.source(violation.path)
+        raise ConfigValidationError(violations, stem)
+    return bound
+
+
+def bind_models(
+    model: Union[type, Dict[str, type]], stems: Sequence[str]
+) -> Dict[str, type]:
+    """
+    Return the model for each stem, from a model for every configuration or a dictionary of models per stem.
+    """
+    if isinstance(model, dict):
+        return dict(model)
+    return {stem: model for stem in stems}
+
+
+def _model_coercer(model: type) -> Coercer:
+    coercer = _ready.get(model)
+    if coercer is not None:
+        return coercer
+    with _lock:
+        coercer = _coercers.get(model)
+        if coercer is not None:
+            return coercer
+        if not (isinstance(model, type) and dataclasses.is_dataclass(model)):
+            raise TypeError(f"Expected a dataclass, got {model!r}")
+
+        fields = dataclasses.fields(model)
+        cls = type(
+            model.__name__,
+            (BoundConfig,),
+            {
+                "__slots__": tuple(field.name for field in fields),
+                "__qualname__": model.__qualname__,
+                "__module__": model.__module__,
+                "__doc__": model.__doc__,
+                "_fields": tuple(field.name for field in fields),
+                "_model": model,
+            },
+        )
+        # Binding fills the slots through their descriptors, bypassing the read-only __setattr__
+        plan: List[Tuple[str, Callable[[Any, Any], None], Coercer, Any, Any]] = []
+        names = frozenset(field.name for field in fields)
+
+        def coerce(value: Any, path: KeyPath, violations: List[SchemaViolation]) -> Any:
+            if not isinstance(value, dict):
+                raise InvalidValue(f"expected object, got {type_name(value)}")
+            bound = object.__new__(cls)
+            for name, set_slot, coerce_field, default, default_factory in plan:
+                item = value.get(name, MISSING)
+                if item is MISSING:
+                    # Defaults have the declared type already, e.g. an instance of a nested dataclass
+                    if default is not dataclasses.MISSING:
+                        set_slot(bound, default)
+                    elif default_factory is not dataclasses.MISSING:
+                        set_slot(bound, default_factory())
+                    else:
+                        violations.append(
+                            SchemaViolation(path + (name,), "required key is missing")
+                        )
+                    continue
+                try:
+                    set_slot(bound, coerce_field(item, path + (name,), violations))
+                except InvalidValue as error:
+                    violations.append(SchemaViolation(path + (name,), str(error)))
+            if not names.issuperset(value):
+                for key in value:
+                    if key not in names:
+                        violations.append(
+                            SchemaViolation(path + (key,), "unexpected key")
+                        )
+            return bound
+
+        # Registered before the fields are planned, so that a model can refer to itself
+        _classes[model] = cls
+        _coercers[model] = coerce
+        try:
+            hints = get_type_hints(model)
+            for field in fields:
+                plan.append(
+                    (
+                        field.name,
+                        cls.__dict__[field.name].__set__,
+                        _coercer(hints[field.name]),
+                        field.default,
+                        field.default_factory,
+                    )
+                )
+        except Exception:
+            del _classes[model], _coercers[model]
+            raise
+        _ready[model] = coerce
+        return coerce
+
+
+def _coercer(annotation: Any) -> Coercer:
+    """
+    Return the function that coerces a value to a type annotation.
+    """
+    if annotation is Any:
+        return lambda value, path, violations: value
+    if annotation is None or annotation is type(None):
+        return _scalar(to_none)
+    if dataclasses.is_dataclass(annotation):
+        # Looked up when called, since the model may still be being planned
+        return lambda value, path, violations: _model_coercer(annotation)(
+            value, path, violations
+        )
+    if annotation in SCALARS:
+        return _scalar(SCALARS[annotation])
+
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+    if origin in UNION_TYPES:
+        return _union_coercer(args)
+    if origin is Literal:
+        options = args
+
+        def coerce_literal(
+            value: Any, path: KeyPath, violations: List[SchemaViolation]
+        ) -> Any:
+            for option in options:
+                if value == option and type(value) is type(option):
+                    return option
+            raise InvalidValue(f"must be one of {list(options)!r}")
+
+        return coerce_literal
+    if origin in (list, tuple) or annotation in (list, tuple):
+        if origin is tuple and len(args) == 2 and args[1] is Ellipsis:
+            args = args[:1]
+        elif origin is tuple and args:
+            raise TypeError(f"Unsupported field type: {annotation}")
+        coerce_item = _coercer(args[0]) if args else _coercer(Any)
+
+        def coerce_list(
+            value: Any, path: KeyPath, violations: List[SchemaViolation]
+        ) -> Any:
+            if not isinstance(value, (list, tuple)):
+                raise InvalidValue(f"expected array, got {type_name(value)}")
+            items = []
+            for index, item in enumerate(value):
+                try:
+                    items.append(coerce_item(item, path + (index,), violations))
+                except InvalidValue as error:
+                    violations.append(SchemaViolation(path + (index,), str(error)))
+            return tuple(items)
+
+        return coerce_list
+    if origin is dict or annotation is dict:
+        coerce_value = _coercer(args[1]) if args else _coercer(Any)
+
+        def coerce_dict(
+            value: Any, path: KeyPath, violations: List[SchemaViolation]
+        ) -> Any:
+            if not isinstance(value, dict):
+                raise InvalidValue(f"expected object, got {type_name(value)}")
+            items = {}
+            for key, item in value.items():
+                try:
+                    items[key] = coerce_value(item, path + (key,), violations)
+                except InvalidValue as error:
+                    violations.append(SchemaViolation(path + (key,), str(error)))
+            return items
+
+        return coerce_dict
+    if isinstance(annotation, type):
+        return _scalar(_instance_converter(annotation))
+    raise TypeError(f"Unsupported field type: {annotation}")
+
+
+def _scalar(convert: Callable[[Any], Any]) -> Coercer:
+    return lambda value, path, violations: convert(value)
+
+
+def _union_coercer(members: Tuple[Any, ...]) -> Coercer:
+    # A value that already has one of the member types is kept, otherwise the members are tried in order
+    exact = tuple(
+        member for member in members if member in SCALARS or member is type(None)
+    )
+    coercers = [_coercer(member) for member in members]
+    names = " or ".join(getattr(member, "__name__", str(member)) for member in members)
+
+    def coerce_union(
+        value: Any, path: KeyPath, violations: List[SchemaViolation]
+    ) -> Any:
+        if type(value) in exact:
+            return value
+        for coerce in coercers:
+            attempt: List[SchemaViolation] = []
+            try:
+                result = coerce(value, path, attempt)
+            except InvalidValue:
+                continue
+            if not attempt:
+                return result
+        raise InvalidValue(f"expected {names}, got {type_name(value)}")
+
+    return coerce_union
+
+
+def _instance_converter(cls: type) -> Callable[[Any], Any]:
+    from_iso = (
+        getattr(cls, "fromisoformat", None)
+        if issubclass(cls, (datetime.date, datetime.time))
+        else None
+    )
+
+    def convert(value: Any) -> Any:
+        if isinstance(value, cls):
+            return value
+        # Dates parsed from YAML or TOML are dates already; from JSON they are strings
+        if from_iso is not None and type(value) is str:
+            try:
+                return from_iso(value)
+            except ValueError:
+                raise InvalidValue(
+                    f"cannot convert {value!r} to {cls.__name__}"
+                ) from None
+        try:
+            return cls(value)
+        except (TypeError, ValueError):
+            raise InvalidValue(f"cannot convert {value!r} to {cls.__name__}") from None
+
+    return convert
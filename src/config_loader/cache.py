@@ -0,0 +1,113 @@
+"""
+A process-wide cache of parsed configuration documents.
+Entries are validated against the inode, modification time and size of the file on disk,
+so an unchanged file is parsed once and every later load returns a copy of the cached document.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple, Union
+
+
+def copy_tree(value: Any) -> Any:
+    """
+    Copy the dictionaries and lists of a parsed document. Scalars are immutable and shared.
+    """
+    if isinstance(value, dict):
+        return {k: copy_tree(v) for k, v in value.items()}
+    elif isinstance(value, list):
+        return [copy_tree(item) for item in value]
+    return value
+
+
+class ParsedFileCache:
+    """
+    A thread-safe LRU cache of parsed configuration files.
+    The cache is bounded by a number of entries and by the total size of the cached files in bytes.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, int, int], Any]]" = (
+            OrderedDict()
+        )
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Total size on disk of the files currently held in the cache.
+        """
+        return self._bytes
+
+    def get(self, filepath: Path, parse: Callable[[Path], Any]) -> Any:
+        """
+        Return a copy of the parsed document for filepath.
+        The file is only parsed with parse() if it is not cached or has changed on disk since it was cached.
+        """
+        key = os.path.abspath(filepath)
+        stat = os.stat(key)
+        signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy_tree(entry[1])
+            self.misses += 1
+
+        document = parse(filepath)
+        self._store(key, signature, document)
+        return copy_tree(document)
+
+    def invalidate(self, filepath: Union[str, Path, None] = None) -> None:
+        """
+        Drop filepath from the cache, or every entry if no filepath is given.
+        """
+        with self._lock:
+            if filepath is None:
+                self._entries.clear()
+                self._bytes = 0
+                return
+            entry = self._entries.pop(os.path.abspath(filepath), None)
+            if entry is not None:
+                self._bytes -= entry[0][2]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the hit and miss counters along with the current size of the cache.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def _store(self, key: str, signature: Tuple[int, int, int], document: Any):
+        size = signature[2]
+        if size > self.max_bytes or self.max_entries <= 0:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[0][2]
+            self._entries[key] = (signature, document)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted[2]
+
+
+# Shared by every ConfigLoader in the process unless a loader is given its own cache
+file_cache = ParsedFileCache()
@@ -0,0 +1,282 @@
+"""
+Validate every configuration set under a directory tree, e.g. in CI before a deploy.
+A configuration set is a directory of configuration files, with its defaults in a 'default' subdirectory and,
+optionally, its secrets in a '.env' file. Sets are loaded and merged with ConfigLoader on a process pool,
+so validating a large tree scales with the number of cores. The result is a JSON report.
+
+    config-loader validate deploy/configs --jobs 16 --output report.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from .config_loader import ConfigLoader
+from .parsers import get_parser
+from .secrets_loader import compile_secrets, get_secrets_provider
+
+ERROR = "error"
+WARNING = "warning"
+
+
+@dataclass
+class ConfigSet:
+    """
+    The configuration files of one directory and the directory of their defaults.
+    """
+
+    directory: Path
+    filepaths: List[Path]
+    default_directory: Path
+    secrets_filepath: Optional[Path] = None
+
+
+@dataclass
+class Issue:
+    """
+    A problem found in a configuration set.
+    """
+
+    kind: str
+    severity: str
+    message: str
+    file: Optional[str] = None
+    details: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        issue = {
+            "kind": self.kind,
+            "severity": self.severity,
+            "file": self.file,
+            "message": self.message,
+        }
+        issue.update(self.details)
+        return issue
+
+
+def discover_config_sets(
+    root: Union[str, Path], default_name: str = "default"
+) -> List[ConfigSet]:
+    """
+    Find every directory under root that holds configuration files, in sorted order.
+    Default directories and hidden directories are not configuration sets themselves.
+    """
+    config_sets = []
+    stack = [Path(root)]
+    while stack:
+        directory = stack.pop()
+        filepaths = []
+        subdirectories = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir():
+                    if entry.name != default_name:
+                        subdirectories.append(directory / entry.name)
+                elif get_parser(os.path.splitext(entry.name)[1]) is not None:
+                    filepaths.append(directory / entry.name)
+        if filepaths:
+            secrets_filepath = directory / ".env"
+            config_sets.append(
+                ConfigSet(
+                    directory,
+                    sorted(filepaths),
+                    directory / default_name,
+                    secrets_filepath if secrets_filepath.is_file() else None,
+                )
+            )
+        stack.extend(sorted(subdirectories, reverse=True))
+    config_sets.sort(key=lambda config_set: config_set.directory)
+    return config_sets
+
+
+def validate_config_set(
+    config_set: ConfigSet, secrets_filepath: Union[str, Path, None] = None
+) -> Dict[str, Any]:
+    """
+    Load and merge every file of a configuration set and report its issues:
+    files without defaults, files sharing a stem, placeholders for variables that are not set,
+    and files that cannot be loaded.
+    The secrets are read from secrets_filepath if given, else from the set's own '.env' file, over os.environ.
+    A set without either is checked against os.environ alone.
+    """
+    issues: List[Issue] = []
+    loader = ConfigLoader(
+        config_set.filepaths, config_set.default_directory, cache=False
+    )
+    secrets_filepath = secrets_filepath or config_set.secrets_filepath
+    # Without a .env file for the set, a '.env' in the working directory must not hide unset variables
+    environ = (
+        get_secrets_provider(secrets_filepath).environ()
+        if secrets_filepath is not None
+        else os.environ
+    )
+
+    stems: Dict[str, Path] = {}
+    for filepath in config_set.filepaths:
+        stem = filepath.stem
+        if stem in stems:
+            issues.append(
+                Issue(
+                    "duplicate_stem",
+                    ERROR,
+                    f"'{filepath.name}' has the same stem as '{stems[stem].name}'",
+                    str(filepath),
+                    {"stem": stem},
+                )
+            )
+            continue
+        stems[stem] = filepath
+
+        if loader._find_default(filepath) is None:
+            issues.append(
+                Issue(
+                    "missing_default",
+                    WARNING,
+                    f"No default for '{filepath.name}' in {config_set.default_directory}",
+                    str(filepath),
+                )
+            )
+        try:
+            config = loader._load_config(filepath)
+        except Exception as error:
+            issues.append(
+                Issue(
+                    "load_error",
+                    ERROR,
+                    f"{type(error).__name__}: {error}",
+                    str(filepath),
+                )
+            )
+            continue
+
+        provenance = loader.provenance[stem]
+        plan = compile_secrets(config)
+        for variable, paths in plan.index.items():
+            if variable in environ:
+                continue
+            for path in paths:
+                issues.append(
+                    Issue(
+                        "unresolved_variable",
+                        ERROR,
+                        f"Environment variable '{variable}' is not set",
+                        provenance.source(path),
+                        {"variable": variable, "path": ".".join(map(str, path))},
+                    )
+                )
+
+    return {
+        "directory": str(config_set.directory),
+        "files": [str(filepath) for filepath in config_set.filepaths],
+        "issues": [issue.to_dict() for issue in issues],
+    }
+
+
+def validate_tree(
+    root: Union[str, Path],
+    jobs: Optional[int] = None,
+    secrets_filepath: Union[str, Path, None] = None,
+    default_name: str = "default",
+) -> Dict[str, Any]:
+    """
+    Validate every configuration set under root on a pool of jobs processes, one per core by default.
+    Returns the report of every set, in sorted order, and a summary.
+    """
+    start = time.perf_counter()
+    config_sets = discover_config_sets(root, default_name)
+    jobs = jobs or os.cpu_count() or 1
+    arguments = [secrets_filepath] * len(config_sets)
+    if jobs == 1 or len(config_sets) <= 1:
+        results = list(map(validate_config_set, config_sets, arguments))
+    else:
+        # Chunks amortize the cost of sending work to the processes, while leaving enough of them to balance the load
+        chunksize = max(1, len(config_sets) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(
+                executor.map(
+                    validate_config_set, config_sets, arguments, chunksize=chunksize
+                )
+            )
+
+    severities = [issue["severity"] for result in results for issue in result["issues"]]
+    return {
+        "root": str(root),
+        "sets": results,
+        "summary": {
+            "sets": len(results),
+            "files": sum(len(result["files"]) for result in results),
+            "errors": severities.count(ERROR),
+            "warnings": severities.count(WARNING),
+            "seconds": round(time.perf_counter() - start, 3),
+        },
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Run the command line interface. Returns the exit status: 1 if any errors were found, or with --strict
+    any warnings, and 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(
+        prog="config-loader", description="Tools for configuration files."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    validate = commands.add_parser(
+        "validate", help="Validate every configuration set under a directory tree."
+    )
+    validate.add_argument("root", type=Path, help="The directory to search.")
+    validate.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="The number of processes to use. Defaults to the number of cores.",
+    )
+    validate.add_argument(
+        "--secrets",
+        type=Path,
+        default=None,
+        help="A .env file to read secrets from, instead of the '.env' file of each set.",
+    )
+    validate.add_argument(
+        "--default-name",
+        default="default",
+        help="The name of the default directory of each set. Defaults to 'default'.",
+    )
+    validate.add_argument(
+        "-o", "--output", type=Path, default=None, help="Write the report to a file."
+    )
+    validate.add_argument(
+        "--strict", action="store_true", help="Fail on warnings as well as errors."
+    )
+    args = parser.parse_args(argv)
+
+    if not args.root.is_dir():
+        parser.error(f"Not a directory: {args.root}")
+    report = validate_tree(args.root, args.jobs, args.secrets, args.default_name)
+    output = json.dumps(report, indent=2)
+    if args.output is not None:
+        args.output.write_text(output + "\n")
+    else:
+        print(output)
+
+    summary = report["summary"]
+    print(
+        f"{summary['sets']} sets, {summary['files']} files: "
+        f"{summary['errors']} errors, {summary['warnings']} warnings",
+        file=sys.stderr,
+    )
+    failed = summary["errors"] or (args.strict and summary["warnings"])
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Sentinels, type names and value converters shared by schema validation, binding and environment overrides.
+A converter returns its value converted to one type, e.g. "8080" to 8080 for an int, or raises InvalidValue
+with the reason it cannot.
+"""
+
+import types
+from typing import Any, Union
+
+# A missing key, where None is a valid value
+MISSING = object()
+
+# typing.Union, and the X | Y unions of Python 3.10 and later
+UNION_TYPES = (Union, getattr(types, "UnionType", Union))
+
+# The JSON names of the types of parsed values
+TYPE_NAMES = {
+    dict: "object",
+    list: "array",
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean",
+    type(None): "null",
+}
+
+
+class InvalidValue(Exception):
+    """
+    Raised by a converter for a value that cannot be converted, with the reason.
+    """
+
+
+def type_name(value: Any) -> str:
+    """
+    Return the JSON name of the type of a value, or the name of its class.
+    """
+    value_type = type(value)
+    return TYPE_NAMES.get(value_type, value_type.__name__)
+
+
+def to_none(value: Any) -> None:
+    if value is not None:
+        raise InvalidValue(f"expected null, got {type_name(value)}")
+    return None
+
+
+def to_int(value: Any) -> int:
+    value_type = type(value)
+    if value_type is int:
+        return value
+    if value_type is float and value.is_integer():
+        return int(value)
+    if value_type is str:
+        try:
+            return int(value.strip())
+        except ValueError:
+            raise InvalidValue(f"cannot convert {value!r} to integer") from None
+    raise InvalidValue(f"expected integer, got {type_name(value)}")
+
+
+def to_float(value: Any) -> float:
+    value_type = type(value)
+    if value_type is float:
+        return value
+    if value_type is int:
+        return float(value)
+    if value_type is str:
+        try:
+            return float(value.strip())
+        except ValueError:
+            raise InvalidValue(f"cannot convert {value!r} to number") from None
+    raise InvalidValue(f"expected number, got {type_name(value)}")
+
+
+def to_str(value: Any) -> str:
+    value_type = type(value)
+    if value_type is str:
+        return value
+    if value_type is int or value_type is float:
+        return str(value)
+    raise InvalidValue(f"expected string, got {type_name(value)}")
+
+
+_TRUE = {"true", "yes", "on", "1"}
+_FALSE = {"false", "no", "off", "0"}
+
+
+def to_bool(value: Any) -> bool:
+    value_type = type(value)
+    if value_type is bool:
+        return value
+    if value_type is str:
+        lowered = value.strip().lower()
+        if lowered in _TRUE:
+            return True
+        if lowered in _FALSE:
+            return False
+        raise InvalidValue(f"cannot convert {value!r} to boolean")
+    if value_type is int and value in (0, 1):
+        return bool(value)
+    raise InvalidValue(f"expected boolean, got {type_name(value)}")
+
+
+# The converter for each scalar type
+SCALARS = {int: to_int, float: to_float, str: to_str, bool: to_bool}
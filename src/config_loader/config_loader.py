@@ -11,14 +11,47 @@ Default configurations can be provided to merge with user configurations.
 """
 # ---------------------------------------------------------------------------
 
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import partial
 from pathlib import Path
-from typing import Union, List, Dict, Any
+from time import perf_counter
+from typing import (
+    Union,
+    List,
+    Dict,
+    Any,
+    Optional,
+    Sequence,
+    Tuple,
+    Callable,
+    ContextManager,
+)
+import asyncio
 import logging
 
-from .secrets_loader import load_secrets, parse_secrets
+from .binding import BoundConfig, bind, bind_models
+from .cache import ParsedFileCache, file_cache
+from .defaults import get_default_index
+from .flat import FlatConfig
+from .includes import IncludeError, IncludeResolver
+from .intern import InternPool, intern_pool
+from .lazy import LazyConfigs
+from .merge import Provenance, merge_configs, merge_layers
+from .overrides import EnvOverrides
+from .parsers import get_parser
+from .references import resolve_references
+from .schema import CompiledSchema, compile_schemas
+from .secrets_loader import get_secrets_provider
+from .snapshot import ConfigSnapshot
+from .stats import LoadStats, count_nodes
+from .streaming import Selection, compile_selection, load_selected, select_tree
 
 logger = logging.getLogger(__name__)
 
+# The context of a phase when no stats are collected
+_UNTIMED = nullcontext()
+
 
 class DuplicateConfigKeyError(Exception):
     """
@@ -32,16 +65,105 @@ def load_configs(
     filepaths: Union[str, Path, List[Union[str, Path]]],
     default_directory: Union[str, Path, None] = None,
     secrets_filepath: Union[str, Path, None] = None,
-) -> Union[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    max_workers: Optional[int] = None,
+    lazy: bool = False,
+    stats: Optional[LoadStats] = None,
+    select: Optional[List[str]] = None,
+    flat: bool = False,
+    schema: Union[Dict[str, Any], type, None] = None,
+    model: Union[type, Dict[str, type], None] = None,
+    includes: bool = False,
+    intern: Union[InternPool, bool] = False,
+    env_prefix: Optional[str] = None,
+    references: bool = False,
+    schemas: Optional[Dict[str, Union[Dict[str, Any], type]]] = None,
+) -> Union[
+    Dict[str, Any], Dict[str, Dict[str, Any]], LazyConfigs, FlatConfig, BoundConfig
+]:
     """
     Load and merge configurations for the filepaths.
     If only one filepath is passed, return the merged config for that file.
     If multiple filepaths are passed, return a dictionary with file stems as keys and merged configs as values.
     Raise an error if multiple filepaths have the same stem.
+    If max_workers is greater than one, files are loaded concurrently on a thread pool of that size.
+    If lazy is True, return a read-only mapping of file stems to configs that are loaded, merged and
+    have their secrets parsed on first access.
+    An optional LoadStats collects the time spent in each phase of loading each file.
+    If select lists dotted key paths, only those subtrees of each configuration are loaded (see ConfigLoader.load).
+    If flat is True, return a FlatConfig of the result, indexed after secrets are parsed.
+    An optional schema validates each merged configuration, and schemas the configurations of their stems
+    (see ConfigLoader).
+    An optional dataclass model, or a dictionary of models per stem, binds each configuration after its secrets
+    are parsed to a read-only object with __slots__, coercing its values to the declared types (see binding.bind).
+    If includes is True, "$include" and "$ref" directives are replaced by the fragments they name (see ConfigLoader).
+    If intern is True or an InternPool, the keys and values of the merged configurations are interned (see ConfigLoader).
+    If env_prefix is given, e.g. "APP", variables like APP__DATABASE__POOL__SIZE override values (see ConfigLoader).
+    If references is True, references to other values like ${database.host} are resolved (see ConfigLoader).
+    """
+    loader = ConfigLoader(
+        filepaths,
+        default_directory,
+        max_workers=max_workers,
+        stats=stats,
+        schema=schema,
+        includes=includes,
+        intern=intern,
+        env_prefix=env_prefix,
+        references=references,
+        schemas=schemas,
+    )
+    if lazy and flat:
+        raise ValueError("lazy and flat cannot be combined")
+    if flat and model is not None:
+        raise ValueError("flat and model cannot be combined")
+    models = (
+        bind_models(model, [path.stem for path in loader.filepaths]) if model else {}
+    )
+    if lazy:
+        selection = compile_selection(select) if select else None
+        resolver = loader._resolver()
+        return loader._load_lazy(
+            lambda filepath: loader._bind(
+                loader._parse_secrets(
+                    loader._load_config(filepath, selection, resolver),
+                    secrets_filepath,
+                    filepath,
+                ),
+                models,
+                filepath,
+            )
+        )
+    configs = loader.load(select=select)
+    loader._parse_secrets(configs, secrets_filepath)
+    if flat:
+        return loader._flatten(configs)
+    if models:
+        if len(loader.filepaths) == 1:
+            return loader._bind(configs, models, loader.filepaths[0])
+        return {
+            stem: loader._bind(config, models, filepath)
+            for (stem, config), filepath in zip(configs.items(), loader.filepaths)
+        }
+    return configs
+
+
+async def load_configs_async(
+    filepaths: Union[str, Path, List[Union[str, Path]]],
+    default_directory: Union[str, Path, None] = None,
+    secrets_filepath: Union[str, Path, None] = None,
+    max_workers: Optional[int] = None,
+    stats: Optional[LoadStats] = None,
+) -> Union[Dict[str, Any], Dict[str, Dict[str, Any]]]:
     """
-    loader = ConfigLoader(filepaths, default_directory)
-    configs = loader.load()
-    loader.parse_secrets(configs, secrets_filepath)
+    Load and merge configurations for the filepaths without blocking the event loop.
+    Returns the same result as load_configs().
+    """
+    loader = ConfigLoader(
+        filepaths, default_directory, max_workers=max_workers, stats=stats
+    )
+    configs = await loader.aload()
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, loader._parse_secrets, configs, secrets_filepath)
     return configs
 
 
@@ -54,10 +176,48 @@ class ConfigLoader:
         self,
         filepaths: Union[str, Path, List[Union[str, Path]]],
         default_directory: Union[str, Path, None] = None,
+        cache: Union[ParsedFileCache, bool] = True,
+        snapshot: Union[str, Path, bool, None] = None,
+        max_workers: Optional[int] = None,
+        stats: Optional[LoadStats] = None,
+        layers: Union[
+            Sequence[Union[str, Path]], Dict[str, Sequence[Union[str, Path]]], None
+        ] = None,
+        schema: Union[Dict[str, Any], type, None] = None,
+        includes: bool = False,
+        intern: Union[InternPool, bool] = False,
+        env_prefix: Optional[str] = None,
+        references: bool = False,
+        schemas: Optional[Dict[str, Union[Dict[str, Any], type]]] = None,
     ):
         """
         Initialize with a list of file paths or a single file path.
         An optional default path to a directory can be provided. If not, defaults to 'config/default/'.
+        Parsed files are cached process-wide by default. Pass a ParsedFileCache to use a private cache,
+        or False to parse every file on each load.
+        An optional snapshot path stores the merged configurations between runs. If True, the snapshot
+        is written to '.config-snapshot.pickle' in the parent of the default directory.
+        If max_workers is greater than one, files are loaded concurrently on a thread pool of that size.
+        An optional LoadStats collects the time spent in each phase of loading each file.
+        Optional layers are merged between the default and the user file, in order. Pass a list of directories,
+        each searched for '<stem>.<ext>' like the default directory, or a dictionary of layer files per stem.
+        An optional schema, a JSON Schema subset or a dataclass, validates every merged configuration. Optional
+        schemas, a dictionary of schemas per stem, validate the configurations of their stems instead. Schemas are
+        compiled once, and a configuration that does not match raises a ConfigValidationError.
+        If includes is True, a mapping with an "$include" or "$ref" key, or a YAML "!include" tag, is replaced by
+        the fragment file it names, relative to the including file, e.g. {"$ref": "shared/db.yaml#/primary"}.
+        Other keys of the mapping are merged over the fragment. Each fragment is parsed once per load, fragments
+        are loaded in parallel, and fragments that include each other raise an IncludeCycleError.
+        If intern is True, the keys, strings and small immutable values of every merged configuration are replaced
+        by canonical instances from a process-wide InternPool, so that configurations loaded by any loader share
+        them. Pass an InternPool to use a private pool.
+        If env_prefix is given, e.g. "APP", environment variables like APP__DATABASE__POOL__SIZE=50 override the
+        values at their key paths in every merged configuration, coerced to the type of the value they replace.
+        With multiple filepaths, the first segment is the file stem, e.g. APP__DB__HOST. The environment is
+        indexed once per load, and the overrides are applied after merging, before validation.
+        If references is True, strings referencing other values of the same configuration by a dotted key path,
+        e.g. "postgres://${database.host}:${database.port}", are resolved after the overrides. Each string is
+        evaluated once in dependency order, and values referencing each other raise a ReferenceCycleError.
         """
         if isinstance(filepaths, (str, Path)):
             self.filepaths = [Path(filepaths)]
@@ -72,62 +232,443 @@ class ConfigLoader:
             Path(default_directory) if default_directory else Path("config/default")
         )
 
-    def load(self) -> Union[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        if cache is True:
+            cache = file_cache
+        self.cache = None if cache is False else cache
+
+        if snapshot is True:
+            snapshot = self.default_directory.parent / ".config-snapshot.pickle"
+        self.snapshot = ConfigSnapshot(snapshot) if snapshot else None
+
+        if intern is True:
+            intern = intern_pool
+        self.intern_pool = None if intern is False else intern
+
+        self.env_prefix = env_prefix
+        self._overrides: Optional[EnvOverrides] = None
+
+        self.references = references
+
+        self.max_workers = max_workers
+        self.stats = stats
+
+        self._defaults = get_default_index(self.default_directory)
+
+        # Layer directories apply to every stem, a dictionary lists the layer files of each stem
+        self.layers: List[Path] = []
+        self._layer_files: Optional[Dict[str, List[Path]]] = None
+        if isinstance(layers, dict):
+            self._layer_files = {
+                stem: [Path(layer) for layer in stem_layers]
+                for stem, stem_layers in layers.items()
+            }
+        elif layers:
+            self.layers = [Path(layer) for layer in layers]
+        self._layer_indexes = [get_default_index(layer, "") for layer in self.layers]
+
+        # The layer each value of the last merged configuration of every stem came from
+        self.provenance: Dict[str, Provenance] = {}
+
+        self.includes = includes
+        # The fragments included by the last merged configuration of every stem
+        self.fragments: Dict[str, List[Path]] = {}
+
+        self._schemas: Dict[str, CompiledSchema] = compile_schemas(
+            schema, schemas, [filepath.stem for filepath in self.filepaths]
+        )
+
+    def load(
+        self,
+        lazy: bool = False,
+        select: Optional[List[str]] = None,
+        flat: bool = False,
+    ) -> Union[Dict[str, Any], Dict[str, Dict[str, Any]], LazyConfigs, FlatConfig]:
         """
         Load and merge configurations for the filepaths.
         If only one filepath is passed, return the merged config for that file.
         If multiple filepaths are passed, return a dictionary with file stems as keys and merged configs as values.
         Raise an error if multiple filepaths have the same stem.
+        If a snapshot is configured and none of the sources have changed, the snapshot is returned instead,
+        without being validated again.
+        If lazy is True, the filepaths are checked but not loaded. A read-only mapping of file stems to configs
+        is returned instead, which loads and merges each config on first access. Snapshots are not used.
+        If select lists dotted key paths, e.g. ["routing.eu-west"], only those subtrees of each configuration
+        and of its defaults and layers are loaded, nested under their paths. JSON files are memory-mapped and only
+        the selected values are parsed; other formats are parsed whole. The cache and snapshot are not used.
+        If flat is True, a read-only FlatConfig of the result is returned, which indexes every dotted key path.
+        With multiple filepaths, the paths start with the file stem.
         """
-        configs = {}
+        if lazy and flat:
+            raise ValueError("lazy and flat cannot be combined")
+        selection = compile_selection(select) if select else None
+        if lazy:
+            return self._load_lazy(
+                partial(
+                    self._load_config, selection=selection, resolver=self._resolver()
+                )
+            )
+        if flat:
+            return self._flatten(self._load_merged(selection))
+        return self._load_merged(selection)
+
+    def _load_merged(
+        self, selection: Optional[Selection] = None
+    ) -> Union[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        if self.snapshot is None or selection is not None:
+            return self._load(selection)
+
+        with self._timed("snapshot", None):
+            sources = self._sources()
+            configs = self.snapshot.read(sources, self._environment(), self._options())
+        if configs is None:
+            configs = self._load()
+            self.snapshot.write(
+                sources,
+                configs,
+                self._fragment_files(),
+                self._environment(),
+                self._options(),
+            )
+        elif self.intern_pool is not None:
+            configs = self._intern(None, configs)
+        return configs
+
+    async def aload(self) -> Union[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        """
+        Load and merge configurations for the filepaths without blocking the event loop.
+        File access, parsing and merging run in the default executor, one task per filepath.
+        The result is the same as that of load().
+        """
+        loop = asyncio.get_running_loop()
+        sources = None
+        if self.snapshot is not None:
+            sources = await loop.run_in_executor(None, self._sources)
+            configs = await loop.run_in_executor(
+                None,
+                self.snapshot.read,
+                sources,
+                self._environment(),
+                self._options(),
+            )
+            if configs is not None:
+                if self.intern_pool is not None:
+                    configs = await loop.run_in_executor(
+                        None, self._intern, None, configs
+                    )
+                return configs
+
+        stems = await loop.run_in_executor(None, self._check_filepaths)
+        semaphore = asyncio.Semaphore(self.max_workers or len(self.filepaths) or 1)
+        load = partial(self._load_config, resolver=self._resolver())
+
+        async def load_config(filepath: Path) -> dict:
+            async with semaphore:
+                return await loop.run_in_executor(None, load, filepath)
+
+        merged_configs = await asyncio.gather(
+            *(load_config(filepath) for filepath in self.filepaths)
+        )
+        configs = self._collect(stems, merged_configs)
+        if self.snapshot is not None:
+            await loop.run_in_executor(
+                None,
+                self.snapshot.write,
+                sources,
+                configs,
+                self._fragment_files(),
+                self._environment(),
+                self._options(),
+            )
+        return configs
+
+    def _load(
+        self, selection: Optional[Selection] = None
+    ) -> Union[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        stems = self._check_filepaths()
+        load_config = partial(
+            self._load_config, selection=selection, resolver=self._resolver()
+        )
+        if self.max_workers and self.max_workers > 1 and len(self.filepaths) > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                merged_configs = list(executor.map(load_config, self.filepaths))
+        else:
+            merged_configs = [load_config(filepath) for filepath in self.filepaths]
+        return self._collect(stems, merged_configs)
+
+    def _load_lazy(self, load: Callable[[Path], Any]) -> LazyConfigs:
+        stems = self._check_filepaths()
+        return LazyConfigs(dict(zip(stems, self.filepaths)), load)
+
+    def _timed(self, phase: str, filepath: Optional[Path]) -> ContextManager[None]:
+        """
+        Return a context that records the time of its block as a phase of loading filepath, if stats are collected.
+        """
+        if self.stats is None:
+            return _UNTIMED
+        return self.stats.measure(phase, filepath)
+
+    def _check_filepaths(self) -> List[str]:
+        """
+        Check that every filepath, or its default, exists and that no two filepaths share a stem.
+        Returns the stems in the order of the filepaths.
+        """
+        self._refresh()
+        stems = []
         # Check if all filepaths exist and raise an error if not
         for filepath in self.filepaths:
-            default_filepath = self._get_default_filepath(filepath)
-            if not filepath.exists() and not default_filepath.exists():
-                raise FileNotFoundError(
-                    f"File not found: {filepath}, also no defaults found in {self.default_directory}"
-                )
-            if not filepath.exists() and default_filepath.exists():
+            with self._timed("check", filepath):
+                exists = filepath.exists()
+            if not exists:
+                default_filepath = self._defaults.get(filepath.stem, filepath.suffix)
+                if default_filepath is None:
+                    raise FileNotFoundError(
+                        f"File not found: {filepath}, also no defaults found in {self.default_directory}"
+                    )
                 logger.warning(
                     f"File not found: {filepath}, but using defaults from {default_filepath}"
                 )
             stem = filepath.stem
-            if stem in configs:
+            if stem in stems:
                 raise DuplicateConfigKeyError(
                     f"Duplicate configuration key detected: '{stem}' from file '{filepath}' conflicts with an existing file."
                 )
+            stems.append(stem)
+        return stems
 
-            # Load the default configuration if it exists
-            default_config = self._load_defaults(filepath)
-            # Load the main configuration file
-            user_config = self._load_file(filepath)
-            # Merge the two configurations (default and main)
-            merged_config = self._merge_configs(default_config, user_config)
-            # Store the merged config with the filename stem (as a string) as the key
-            configs[stem] = merged_config
+    def _load_config(
+        self,
+        filepath: Path,
+        selection: Optional[Selection] = None,
+        resolver: Optional[IncludeResolver] = None,
+    ) -> dict:
+        """
+        Load a single configuration file and merge it over its layers and its default configuration.
+        If a selection is given, only the selected subtrees of each file are loaded.
+        Include directives are resolved with the resolver of the load, if given, or else a new one if enabled.
+        """
+        if resolver is None:
+            resolver = self._resolver()
+        trees = []
+        names = []
+        # Load the default configuration if it exists
+        default_path = self._find_default(filepath)
+        if default_path is not None:
+            trees.append(self._load_default(filepath, default_path, selection))
+            names.append(str(default_path))
+        # Load the layers, from the bottom up
+        for layer_path in self._find_layers(filepath):
+            trees.append(self._load_file(layer_path, selection))
+            names.append(str(layer_path))
+        # Load the main configuration file
+        trees.append(self._load_file(filepath, selection))
+        names.append(str(filepath))
+        if resolver is not None:
+            trees = self._include(resolver, filepath, trees, names)
+        # Merge the stack, bottom layer first
+        with self._timed("merge", filepath):
+            merged_config, self.provenance[filepath.stem] = merge_layers(trees, names)
+        if self.env_prefix is not None:
+            merged_config = self._override(filepath, merged_config, selection)
+        if self.references:
+            merged_config = self._resolve_references(filepath, merged_config)
+        if self.intern_pool is not None:
+            merged_config = self._intern(filepath, merged_config)
+            # Keep only the keys of the layers, interned, rather than a second copy of every parsed value
+            provenance = self.provenance[filepath.stem].outline()
+            self.provenance[filepath.stem] = Provenance(
+                [
+                    (self._intern(filepath, tree), name)
+                    for tree, name in provenance.layers
+                ]
+            )
+        # A selection is only part of the configuration, so it is not validated
+        if selection is None and filepath.stem in self._schemas:
+            self._validate(filepath, merged_config)
+        return merged_config
 
+    def _resolver(self) -> Optional[IncludeResolver]:
+        """
+        Return a new resolver for the include directives of one load, or None if includes are disabled.
+        """
+        if not self.includes:
+            return None
+        return IncludeResolver(self._load_fragment, self.max_workers)
+
+    def _include(
+        self,
+        resolver: IncludeResolver,
+        filepath: Path,
+        trees: List[dict],
+        names: List[str],
+    ) -> List[dict]:
+        """
+        Resolve the include directives of the default, layer and user files of a configuration.
+        """
+        resolved = []
+        fragments: Dict[Path, None] = {}
+        with self._timed("include", filepath):
+            for tree, name in zip(trees, names):
+                tree, tree_fragments = resolver.resolve(tree, Path(name))
+                if not isinstance(tree, dict):
+                    raise IncludeError(f"{name} does not resolve to a mapping")
+                resolved.append(tree)
+                fragments.update(dict.fromkeys(tree_fragments))
+        self.fragments[filepath.stem] = list(fragments)
+        return resolved
+
+    def _environment(self) -> Dict[str, str]:
+        """
+        Return the overriding environment variables, which a snapshot is only valid for.
+        """
+        return dict(self._overrides.variables) if self._overrides is not None else {}
+
+    def _options(self) -> Dict[str, Any]:
+        """
+        Return the options of the loader that change the merged configurations, which a snapshot is only valid for.
+        """
+        if self._layer_files is not None:
+            layers: Any = {
+                stem: [str(layer) for layer in stem_layers]
+                for stem, stem_layers in self._layer_files.items()
+            }
+        else:
+            layers = [str(layer) for layer in self.layers]
+        return {
+            "layers": layers,
+            "includes": self.includes,
+            "env_prefix": self.env_prefix,
+            "references": self.references,
+            "intern": self.intern_pool is not None,
+            "schemas": {stem: schema.digest for stem, schema in self._schemas.items()},
+        }
+
+    def _fragment_files(self) -> List[Path]:
+        return list(
+            dict.fromkeys(
+                fragment
+                for fragments in self.fragments.values()
+                for fragment in fragments
+            )
+        )
+
+    def _override(
+        self, filepath: Path, config: dict, selection: Optional[Selection] = None
+    ) -> dict:
+        """
+        Apply the environment overrides of a configuration, keeping only the selected subtrees of a selection.
+        """
+        with self._timed("override", filepath):
+            if self._overrides is None:
+                self._overrides = EnvOverrides(self.env_prefix)
+            stem = filepath.stem if len(self.filepaths) > 1 else None
+            overridden = self._overrides.apply(config, stem)
+            if selection is not None and overridden is not config:
+                overridden = select_tree(overridden, selection)
+        return overridden
+
+    def _resolve_references(self, filepath: Path, config: dict) -> dict:
+        with self._timed("reference", filepath):
+            return resolve_references(config)
+
+    def _intern(self, filepath: Optional[Path], config: Any) -> Any:
+        with self._timed("intern", filepath):
+            return self.intern_pool.intern(config)
+
+    def _validate(self, filepath: Path, config: dict):
+        stem = filepath.stem
+        with self._timed("validate", filepath):
+            self._schemas[stem].check(config, self.provenance[stem], stem)
+
+    def _collect(
+        self, stems: List[str], merged_configs: List[dict]
+    ) -> Union[Dict[str, Any], Dict[str, Dict[str, Any]]]:
         # Return single config if only one filepath was provided
         if len(self.filepaths) == 1:
-            return configs[self.filepaths[0].stem]
+            return merged_configs[0]
+        # Store the merged configs with the filename stems (as strings) as the keys
+        return dict(zip(stems, merged_configs))
 
-        return configs
-
-    def _load_file(self, filepath: Path) -> dict:
+    def _load_file(self, filepath: Path, selection: Optional[Selection] = None) -> dict:
         """
         Load a single configuration file based on the file extension.
         Returns an empty dictionary if the file does not exist.
         """
-        if not filepath.exists():
+        try:
+            if selection is not None:
+                return self._select_file(filepath, selection)
+            return self._read_file(filepath)
+        except FileNotFoundError:
             return {}
-        file_extension = filepath.suffix
-        if file_extension == ".json":
-            return self._load_json(filepath)
-        elif file_extension == ".yaml":
-            return self._load_yaml(filepath)
-        elif file_extension == ".toml":
-            return self._load_toml(filepath)
-        else:
+
+    def _read_file(self, filepath: Path) -> Any:
+        """
+        Parse a single configuration file, through the cache if enabled.
+        Raises FileNotFoundError if the file does not exist.
+        """
+        if self.cache is None:
+            return self._parse_file(filepath)
+        if self.stats is None:
+            return self.cache.get(filepath, self._parse_file)
+        # Record the time of a cache hit, a miss is recorded by _parse_file
+        parsed = []
+        start = perf_counter()
+        config = self.cache.get(
+            filepath, lambda path: parsed.append(path) or self._parse_file(path)
+        )
+        if not parsed:
+            self.stats.record("cache", filepath, perf_counter() - start)
+        return config
+
+    def _load_fragment(self, filepath: Path) -> Any:
+        """
+        Parse an included file. Unlike a configuration file, a fragment must exist and have a supported format.
+        """
+        if get_parser(filepath.suffix) is None:
+            raise IncludeError(f"Unsupported format of included file: {filepath}")
+        try:
+            return self._read_file(filepath)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Included file not found: {filepath}") from None
+
+    def _parse_file(self, filepath: Path) -> dict:
+        """
+        Parse a single configuration file with the parser registered for its extension.
+        Returns an empty dictionary if no parser supports the extension.
+        """
+        backend = get_parser(filepath.suffix)
+        if backend is None:
             return {}
+        if self.stats is None:
+            with open(filepath, "rb") as file:
+                return backend.loads(file.read())
+
+        start = perf_counter()
+        with open(filepath, "rb") as file:
+            data = file.read()
+        read = perf_counter()
+        config = backend.loads(data)
+        parsed = perf_counter()
+        self.stats.record("read", filepath, read - start, nbytes=len(data))
+        self.stats.record("parse", filepath, parsed - read, nodes=count_nodes(config))
+        return config
+
+    def _select_file(self, filepath: Path, selection: Selection) -> dict:
+        """
+        Load the selected subtrees of a single configuration file, bypassing the cache.
+        """
+        backend = get_parser(filepath.suffix)
+        if backend is None:
+            return {}
+        if self.stats is None:
+            return load_selected(filepath, selection, backend.loads)[0]
+        # Also records the bytes read and the nodes parsed
+        start = perf_counter()
+        config, nbytes = load_selected(filepath, selection, backend.loads)
+        seconds = perf_counter() - start
+        self.stats.record(
+            "parse", filepath, seconds, nbytes=nbytes, nodes=count_nodes(config)
+        )
+        return config
 
     def _get_default_filepath(self, filepath: Path) -> dict:
         """
@@ -139,74 +680,102 @@ class ConfigLoader:
         )
 
     def _load_defaults(self, filepath: Path) -> dict:
-        # If the default configuration file has the same extension as the main configuration file, load it
-        # If the default configuration file does not exists, then walk directory for a default configuration file with a different extension in default directory
-        # If found, warn the user and load it
-        default_path = self._get_default_filepath(filepath)
-        if default_path.suffix == filepath.suffix and default_path.exists():
-            return self._load_file(default_path)
-        elif not default_path.exists():
-            for file in self.default_directory.iterdir():
-                if (
-                    file.stem == filepath.stem + "-default"
-                    and file.suffix != filepath.suffix
-                ):
-                    logger.warning(
-                        f"Default configuration file with different extension found: {file}. Loading this file instead."
-                    )
-                    return self._load_file(file)
-        return {}
+        default_path = self._find_default(filepath)
+        if default_path is None:
+            return {}
+        return self._load_default(filepath, default_path)
 
-    def _merge_configs(self, base_config: dict, new_config: dict) -> dict:
+    def _load_default(
+        self, filepath: Path, default_path: Path, selection: Optional[Selection] = None
+    ) -> dict:
+        if default_path.suffix != filepath.suffix:
+            logger.warning(
+                f"Default configuration file with different extension found: {default_path}. Loading this file instead."
+            )
+        return self._load_file(default_path, selection)
+
+    def _find_default(self, filepath: Path) -> Optional[Path]:
+        # If the default configuration file has the same extension as the main configuration file, use it
+        # If not, use a default configuration file with a different extension in the default directory
+        with self._timed("defaults", filepath):
+            return self._defaults.lookup(filepath.stem, filepath.suffix)
+
+    def _find_layers(self, filepath: Path) -> List[Path]:
         """
-        Recursively merge two dictionaries. Values from new_config overwrite base_config.
+        Return the layer files of a configuration, from the bottom up.
         """
-        for key, value in new_config.items():
-            if (
-                isinstance(value, dict)
-                and key in base_config
-                and isinstance(base_config[key], dict)
-            ):
-                base_config[key] = self._merge_configs(base_config[key], value)
-            else:
-                base_config[key] = value
-        return base_config
+        if self._layer_files is not None:
+            return self._layer_files.get(filepath.stem, [])
+        layer_paths = []
+        for index in self._layer_indexes:
+            layer_path = index.lookup(filepath.stem, filepath.suffix)
+            if layer_path is not None:
+                layer_paths.append(layer_path)
+        return layer_paths
 
-    def _load_json(self, filepath: Path) -> dict:
+    def _refresh(self):
         """
-        Load JSON configuration file.
+        Scan the default and layer directories again if they changed, and the environment for overrides.
         """
-        import json
+        self._defaults.refresh()
+        for index in self._layer_indexes:
+            index.refresh()
+        # Indexed once per load, so a variable set since the last load is picked up
+        if self.env_prefix is not None:
+            self._overrides = EnvOverrides(self.env_prefix)
 
-        with open(filepath, "r") as file:
-            return json.load(file)
+    def _sources(self) -> List[Tuple[Optional[Path], ...]]:
+        """
+        Return the user file, the default file, if any, and the layer files that contribute to each configuration.
+        """
+        self._refresh()
+        return [
+            (filepath, self._find_default(filepath), *self._find_layers(filepath))
+            for filepath in self.filepaths
+        ]
 
-    def _load_yaml(self, filepath: Path) -> dict:
+    def _merge_configs(self, base_config: dict, new_config: dict) -> dict:
         """
-        Load YAML configuration file.
+        Merge two dictionaries into a new dictionary. Values from new_config overwrite base_config.
+        Neither input is modified; subtrees found in only one of them are shared with the result,
+        unless interning is enabled, in which case the result is an interned copy.
         """
-        import yaml
+        if self.intern_pool is not None:
+            return self.intern_pool.intern(merge_configs(base_config, new_config))
+        return merge_configs(base_config, new_config)
+
+    def _flatten(self, configs: Dict[str, Any]) -> FlatConfig:
+        with self._timed("index", None):
+            return FlatConfig(configs)
 
-        with open(filepath, "r") as file:
-            return yaml.safe_load(file)
+    def _parse_secrets(
+        self,
+        configs: Any,
+        secrets_filepath: Union[str, Path, None] = None,
+        filepath: Optional[Path] = None,
+    ) -> Any:
+        with self._timed("secrets", filepath):
+            return self.parse_secrets(configs, secrets_filepath)
 
-    def _load_toml(self, filepath: Path) -> dict:
+    def _bind(
+        self, config: dict, models: Dict[str, type], filepath: Path
+    ) -> Union[dict, BoundConfig]:
         """
-        Load TOML configuration file.
+        Bind a configuration to the model of its stem, if it has one.
         """
-        try:
-            import tomllib  # Python 3.11+
-        except ImportError:
-            import tomli as tomllib  # Fallback for older versions
-        with open(filepath, "rb") as file:
-            return tomllib.load(file)
+        model = models.get(filepath.stem)
+        if model is None:
+            return config
+        provenance = self.provenance.get(filepath.stem)
+        with self._timed("bind", filepath):
+            return bind(config, model, provenance, filepath.stem)
 
     @classmethod
     def parse_secrets(cls, configs: dict[str, str], secrets_filepath=None) -> dict:
         """
         Parse secrets with environment variables.
+        Values from the secrets file take precedence over the environment. The secrets file is parsed once
+        and cached until it changes, and os.environ is not modified.
         """
-        # Load environment variables from secrets file
-        load_secrets(filepath=secrets_filepath)
         # Replace environment variables in the configs
-        return parse_secrets(configs)
+        return get_secrets_provider(secrets_filepath).parse(configs)
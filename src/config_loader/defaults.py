@@ -0,0 +1,109 @@
+"""
+An index of the default configuration files in a default directory.
+The directory is scanned once into a map from configuration stem to the default files for each extension,
+and scanned again only when the modification time of the directory changes.
+Layer directories are indexed the same way, with plain '<stem>.<ext>' file names.
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+DEFAULT_SUFFIX = "-default"
+
+# Directory timestamps can be coarse. A directory modified this recently may change again
+# without its modification time changing, so its index is not trusted until it settles.
+_RACY_INTERVAL_NS = 2_000_000_000
+
+
+class DefaultIndex:
+    """
+    Map configuration stems to the default files found in a directory, keyed by extension.
+    Files are indexed when their stem ends with suffix, which is removed. An empty suffix indexes every file.
+    """
+
+    def __init__(self, directory: Union[str, Path], suffix: str = DEFAULT_SUFFIX):
+        self.directory = Path(directory)
+        self.suffix = suffix
+        self._index: Dict[str, Dict[str, Path]] = {}
+        self._signature: Optional[Tuple[int, int]] = None
+        self._scanned = False
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """
+        Scan the directory again if it changed since the last scan.
+        """
+        try:
+            stat = os.stat(self.directory)
+            signature = (stat.st_ino, stat.st_mtime_ns)
+        except (FileNotFoundError, NotADirectoryError):
+            signature = None
+
+        with self._lock:
+            if signature is not None and signature == self._signature:
+                return
+            self._index = self._scan() if signature is not None else {}
+            self._scanned = True
+            racy = (
+                signature is not None
+                and time.time_ns() - signature[1] < _RACY_INTERVAL_NS
+            )
+            self._signature = None if racy else signature
+
+    def lookup(self, stem: str, suffix: str) -> Optional[Path]:
+        """
+        Return the default file for stem, preferring the given extension.
+        If there is none with that extension, the first default for the stem with any other extension is returned.
+        """
+        if not self._scanned:
+            self.refresh()
+        candidates = self._index.get(stem)
+        if not candidates:
+            return None
+        if suffix in candidates:
+            return candidates[suffix]
+        return next(iter(candidates.values()))
+
+    def get(self, stem: str, suffix: str) -> Optional[Path]:
+        """
+        Return the default file for stem with exactly the given extension, if there is one.
+        """
+        if not self._scanned:
+            self.refresh()
+        return self._index.get(stem, {}).get(suffix)
+
+    def _scan(self) -> Dict[str, Dict[str, Path]]:
+        index: Dict[str, Dict[str, Path]] = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    continue
+                filepath = self.directory / entry.name
+                stem = filepath.stem
+                if stem.endswith(self.suffix):
+                    if self.suffix:
+                        stem = stem[: -len(self.suffix)]
+                    index.setdefault(stem, {}).setdefault(filepath.suffix, filepath)
+        return index
+
+
+_indexes: Dict[Tuple[str, str, str], DefaultIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_default_index(
+    directory: Union[str, Path], suffix: str = DEFAULT_SUFFIX
+) -> DefaultIndex:
+    """
+    Return the index of a default or layer directory, shared by every loader in the process.
+    """
+    # Keyed on the spelling of the directory as well, so the indexed paths match the ones the loader was given
+    key = (os.path.abspath(directory), str(directory), suffix)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = DefaultIndex(directory, suffix)
+        return index
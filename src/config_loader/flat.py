@@ -0,0 +1,93 @@
+"""
+A read-only view of a merged configuration with an index of dotted key paths.
+Every value, and every section, is indexed by its dotted key path when the view is built, so a lookup such as
+get("database.pool.size") is a single dictionary lookup instead of a chain of them.
+"""
+
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+class FlatConfig(Mapping):
+    """
+    Map the dotted key paths of a configuration to its values.
+    As a mapping, it holds the leaf values: everything that is not a non-empty dictionary. get() also returns
+    sections, as read-only views of the nested dictionaries. Keys that contain a '.' cannot be told apart
+    from nested keys, and lists are indexed as single values.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        self._config = config
+        # Leaves are listed in document order, so the leaves of every section form one contiguous span
+        self._leaves: List[str] = []
+        self._values: Dict[str, Any] = {}
+        self._sections: Dict[str, Tuple[int, int]] = {}
+
+        leaves = self._leaves
+        values = self._values
+        sections = self._sections
+        sections[""] = (0, 0)
+        stack = [("", "", iter(config.items()), 0)]
+        while stack:
+            section, prefix, items, start = stack[-1]
+            for key, value in items:
+                path = prefix + str(key)
+                if isinstance(value, dict) and value:
+                    values[path] = MappingProxyType(value)
+                    # Listed now so that sections are in document order, the span is set when it is complete
+                    sections[path] = (len(leaves), len(leaves))
+                    stack.append((path, path + ".", iter(value.items()), len(leaves)))
+                    break
+                values[path] = value
+                leaves.append(path)
+            else:
+                stack.pop()
+                sections[section] = (start, len(leaves))
+
+    def __getitem__(self, path: str) -> Any:
+        if path in self._sections:
+            raise KeyError(path)
+        return self._values[path]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._leaves)
+
+    def __len__(self) -> int:
+        return len(self._leaves)
+
+    def __contains__(self, path: object) -> bool:
+        return path in self._values and path not in self._sections
+
+    def __repr__(self) -> str:
+        return f"FlatConfig({len(self._leaves)} values, {len(self._sections)} sections)"
+
+    def get(self, path: str, default: Any = None) -> Any:
+        """
+        Return the value or section at a dotted key path, or default if there is none.
+        """
+        return self._values.get(path, default)
+
+    def leaves(self, prefix: str = "") -> Iterator[Tuple[str, Any]]:
+        """
+        Iterate over the dotted key paths and values in the section at prefix, in document order.
+        Yields nothing if there is no such section.
+        """
+        span = self._sections.get(prefix)
+        if span is None:
+            return
+        values = self._values
+        for path in self._leaves[span[0] : span[1]]:
+            yield path, values[path]
+
+    def sections(self) -> List[str]:
+        """
+        Return the dotted key paths of every non-empty section, the top level being ''.
+        """
+        return list(self._sections)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return the nested configuration the view was built from. It is not copied, so do not modify it.
+        """
+        return self._config
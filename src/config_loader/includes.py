@@ -0,0 +1,300 @@
+"""
+Resolve include directives, which split configurations into shared fragments.
+A mapping with an "$include" or "$ref" key is replaced by the fragment it names, a path relative to the including
+file, optionally followed by a JSON pointer to a part of it, e.g. {"$ref": "shared/db.yaml#/primary"}.
+"$include" can also list several fragments, which are merged in order. Other keys of the mapping are merged over
+the fragment. In YAML, "!include shared/db.yaml" is the same as {"$include": "shared/db.yaml"}.
+
+The files of a load and their fragments form a dependency graph. It is discovered breadth first, loading the
+fragments of each level in parallel, checked for cycles, and resolved in topological order. Every fragment is
+parsed and resolved once per load, however many files include it.
+"""
+
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .cache import copy_tree
+from .merge import merge_configs
+
+DIRECTIVES = ("$include", "$ref")
+
+KeyPath = Tuple[Any, ...]
+# A file and the JSON pointer of the included part of it, if any
+Target = Tuple[str, Optional[str]]
+
+
+class IncludeError(ValueError):
+    """
+    Raised for an invalid include directive or a JSON pointer that does not match its fragment.
+    """
+
+
+class IncludeCycleError(IncludeError):
+    """
+    Raised when fragments include each other. The cycle lists the files, starting and ending with the same one.
+    """
+
+    def __init__(self, cycle: Sequence[str]):
+        self.cycle = list(cycle)
+        super().__init__(f"Include cycle: {' -> '.join(self.cycle)}")
+
+
+class _Directive:
+    """
+    An include directive found in a document: its key path and the fragments it includes.
+    """
+
+    __slots__ = ("path", "targets")
+
+    def __init__(self, path: KeyPath, targets: List[Target]):
+        self.path = path
+        self.targets = targets
+
+
+def find_directives(document: Any, filepath: str) -> List[_Directive]:
+    """
+    Find the include directives of a document, with their targets resolved against the directory of filepath.
+    Directives nested inside others come first, so that replacing them in order never invalidates a later path.
+    """
+    directory = os.path.dirname(filepath)
+    directives = []
+    stack: List[Tuple[KeyPath, Any]] = [((), document)]
+    while stack:
+        path, value = stack.pop()
+        if isinstance(value, dict):
+            keys = [key for key in DIRECTIVES if key in value]
+            if keys:
+                directives.append(
+                    _Directive(path, _targets(value, keys, path, directory, filepath))
+                )
+            stack.extend(
+                (path + (key,), item) for key, item in value.items() if key not in keys
+            )
+        elif isinstance(value, list):
+            stack.extend((path + (index,), item) for index, item in enumerate(value))
+    directives.reverse()
+    return directives
+
+
+def _targets(
+    value: dict, keys: List[str], path: KeyPath, directory: str, filepath: str
+) -> List[Target]:
+    location = ".".join(map(str, path)) or "the top level"
+    if len(keys) > 1:
+        raise IncludeError(
+            f"Both {keys[0]!r} and {keys[1]!r} at {location} in {filepath}"
+        )
+    references = value[keys[0]]
+    if isinstance(references, str):
+        references = [references]
+    if (
+        not isinstance(references, list)
+        or not references
+        or not all(isinstance(reference, str) and reference for reference in references)
+    ):
+        raise IncludeError(
+            f"{keys[0]!r} at {location} in {filepath} must be a path or a list of paths"
+        )
+    targets = []
+    for reference in references:
+        target, _, pointer = reference.partition("#")
+        if not target:
+            raise IncludeError(
+                f"{reference!r} at {location} in {filepath} does not name a file"
+            )
+        targets.append(
+            (os.path.realpath(os.path.join(directory, target)), pointer or None)
+        )
+    return targets
+
+
+def _follow_pointer(value: Any, pointer: str, filepath: str) -> Any:
+    """
+    Return the part of a document a JSON pointer refers to, e.g. "/servers/0/host".
+    """
+    if not pointer.startswith("/"):
+        raise IncludeError(f"Invalid JSON pointer {pointer!r} into {filepath}")
+    for token in pointer[1:].split("/"):
+        token = token.replace("~1", "/").replace("~0", "~")
+        if isinstance(value, dict) and token in value:
+            value = value[token]
+        elif isinstance(value, list) and token.isdigit() and int(token) < len(value):
+            value = value[int(token)]
+        else:
+            raise IncludeError(f"{pointer!r} not found in {filepath}")
+    return value
+
+
+class IncludeResolver:
+    """
+    Resolve the include directives of the files of one load, sharing their fragments.
+    Fragments are read with load, e.g. through the parsed file cache, on up to max_workers threads.
+    Resolved fragments are kept for the lifetime of the resolver and never modified; every file that includes one
+    gets its own copy. A resolver is thread-safe, so the files of a load can be resolved concurrently.
+    """
+
+    def __init__(self, load: Callable[[Path], Any], max_workers: Optional[int] = None):
+        self._load = load
+        self._max_workers = max_workers
+        # The parsed document and directives of every fragment, set once it is loaded
+        self._documents: Dict[str, Future] = {}
+        self._resolved: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, document: Any, filepath: Path) -> Tuple[Any, List[Path]]:
+        """
+        Replace the include directives of a document loaded from filepath, in place where possible.
+        Returns the resolved document and every fragment it includes, directly or not, dependencies first.
+        """
+        key = os.path.realpath(filepath)
+        directives = find_directives(document, key)
+        if not directives:
+            return document, []
+        self._fetch(
+            target for directive in directives for target, _ in directive.targets
+        )
+        with self._lock:
+            order = self._order(key, directives)
+            for fragment in order:
+                if fragment not in self._resolved:
+                    fragment_document, fragment_directives = self._documents[
+                        fragment
+                    ].result()
+                    self._resolved[fragment] = self._substitute(
+                        fragment_document, fragment_directives, fragment, copy=False
+                    )
+            document = self._substitute(document, directives, key, copy=True)
+        return document, [Path(fragment) for fragment in order]
+
+    def _fetch(self, keys):
+        """
+        Load the fragments and everything they include, one level of the graph at a time.
+        """
+        pending = list(dict.fromkeys(keys))
+        seen = set(pending)
+        executor = None
+        try:
+            while pending:
+                claimed = []
+                futures = []
+                with self._lock:
+                    for key in pending:
+                        future = self._documents.get(key)
+                        if future is None:
+                            future = self._documents[key] = Future()
+                            claimed.append((key, future))
+                        futures.append(future)
+                # Fragments claimed by another thread are loaded by it, and waited for below
+                workers = self._max_workers or min(len(claimed), os.cpu_count() or 1)
+                if len(claimed) > 1 and workers > 1:
+                    if executor is None:
+                        executor = ThreadPoolExecutor(max_workers=workers)
+                    list(executor.map(self._read, claimed))
+                else:
+                    for item in claimed:
+                        self._read(item)
+
+                pending = []
+                for future in futures:
+                    _, directives = future.result()
+                    for directive in directives:
+                        for target, _ in directive.targets:
+                            if target not in seen:
+                                seen.add(target)
+                                pending.append(target)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def _read(self, item: Tuple[str, Future]):
+        key, future = item
+        try:
+            document = self._load(Path(key))
+            future.set_result((document, find_directives(document, key)))
+        except BaseException as error:
+            future.set_exception(error)
+
+    def _order(self, root: str, directives: List[_Directive]) -> List[str]:
+        """
+        Return the fragments reachable from root, each after the fragments it includes.
+        Raise an IncludeCycleError if a fragment includes itself, directly or not.
+        """
+        order = []
+        done = set()
+        path = [root]
+        on_path = {root}
+        stack = [iter(self._dependencies(directives))]
+        while stack:
+            for child in stack[-1]:
+                if child in on_path:
+                    raise IncludeCycleError(path[path.index(child) :] + [child])
+                if child not in done:
+                    done.add(child)
+                    path.append(child)
+                    on_path.add(child)
+                    stack.append(
+                        iter(self._dependencies(self._documents[child].result()[1]))
+                    )
+                    break
+            else:
+                stack.pop()
+                key = path.pop()
+                on_path.discard(key)
+                if stack:
+                    order.append(key)
+        return order
+
+    @staticmethod
+    def _dependencies(directives: List[_Directive]) -> List[str]:
+        return list(
+            dict.fromkeys(
+                target for directive in directives for target, _ in directive.targets
+            )
+        )
+
+    def _substitute(
+        self, document: Any, directives: List[_Directive], filepath: str, copy: bool
+    ) -> Any:
+        for directive in directives:
+            container = None
+            node = document
+            for key in directive.path:
+                container = node
+                node = node[key]
+            value = self._include(directive.targets, copy)
+            siblings = {
+                key: item for key, item in node.items() if key not in DIRECTIVES
+            }
+            if siblings:
+                if not isinstance(value, dict):
+                    location = ".".join(map(str, directive.path)) or "the top level"
+                    raise IncludeError(
+                        f"Cannot merge keys over a fragment that is not a mapping at {location} in {filepath}"
+                    )
+                value = merge_configs(value, siblings)
+            if container is None:
+                document = value
+            else:
+                container[directive.path[-1]] = value
+        return document
+
+    def _include(self, targets: List[Target], copy: bool) -> Any:
+        values = []
+        for target, pointer in targets:
+            value = self._resolved[target]
+            if pointer is not None:
+                value = _follow_pointer(value, pointer, target)
+            values.append(copy_tree(value) if copy else value)
+        if len(values) == 1:
+            return values[0]
+        if not all(isinstance(value, dict) for value in values):
+            raise IncludeError(
+                f"Only mappings can be merged, in {[target for target, _ in targets]}"
+            )
+        merged = values[0]
+        for value in values[1:]:
+            merged = merge_configs(merged, value)
+        return merged
@@ -0,0 +1,130 @@
+"""
+A pool of canonical keys and values shared by every configuration loaded through it.
+Every parse allocates new objects for the same keys and values, so many configurations with the same structure,
+e.g. one per tenant, hold many equal copies of them. Interning replaces each copy with one canonical instance,
+so that only one is kept in memory, without changing the dictionaries and lists of the configurations.
+"""
+
+import datetime
+import sys
+import threading
+from typing import Any, Dict, List, Tuple
+
+# Immutable values worth sharing. Booleans, None and small integers are singletons already
+_VALUE_TYPES = frozenset(
+    {
+        int,
+        float,
+        bytes,
+        datetime.date,
+        datetime.datetime,
+        datetime.time,
+        datetime.timedelta,
+    }
+)
+
+
+class InternPool:
+    """
+    A thread-safe pool of the keys, strings and small immutable values of configurations.
+    Strings longer than max_length are not interned, since they are rarely repeated.
+    The pool keeps every value it has seen until it is cleared.
+    """
+
+    def __init__(self, max_length: int = 256):
+        self.max_length = max_length
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self._strings: Dict[str, str] = {}
+        # Keyed by type as well, so that equal values of different types, e.g. 1 and 1.0, are kept apart
+        self._values: Dict[Tuple[type, Any], Any] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._strings) + len(self._values)
+
+    def intern(self, config: Any) -> Any:
+        """
+        Return a copy of config whose keys and values are the canonical instances of the pool.
+        Dictionaries and lists are copied; config itself is not modified.
+        """
+        strings = self._strings
+        values = self._values
+        max_length = self.max_length
+        # The copies replaced by a canonical instance, by identity, since a parser may reuse one object for a key
+        duplicates: Dict[int, Any] = {}
+
+        def intern_value(value: Any) -> Any:
+            value_type = type(value)
+            if value_type is str:
+                if len(value) > max_length:
+                    return value
+                canonical = strings.setdefault(value, value)
+            elif value_type in _VALUE_TYPES:
+                # NaN is not equal to itself, so it would never be found again
+                if value != value:
+                    return value
+                canonical = values.setdefault((value_type, value), value)
+            else:
+                return value
+            if canonical is not value:
+                duplicates[id(value)] = value
+            return canonical
+
+        # The dictionaries and lists still to be filled, with their copies, so deep nesting is not limited by recursion
+        stack: List[Tuple[Any, Any]] = []
+
+        def copy(value: Any) -> Any:
+            value_type = type(value)
+            if value_type is dict:
+                copied: Any = {}
+            elif value_type is list:
+                copied = []
+            else:
+                return intern_value(value)
+            stack.append((value, copied))
+            return copied
+
+        with self._lock:
+            entries = len(self)
+            config = copy(config)
+            while stack:
+                source, target = stack.pop()
+                if type(source) is dict:
+                    for key, item in source.items():
+                        target[intern_value(key)] = copy(item)
+                else:
+                    # Extending by a whole list allocates no spare capacity
+                    target.extend([copy(item) for item in source])
+            self.hits += len(duplicates)
+            self.misses += len(self) - entries
+            self.bytes_saved += sum(map(sys.getsizeof, duplicates.values()))
+        return config
+
+    def clear(self):
+        """
+        Drop every value from the pool and reset its counters.
+        """
+        with self._lock:
+            self._strings.clear()
+            self._values.clear()
+            self.hits = self.misses = self.bytes_saved = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the number of values in the pool, the number of duplicates replaced by their canonical instance
+        (hits) and of values added to the pool (misses), and an estimate of the bytes saved: the size of every
+        duplicate replaced.
+        """
+        with self._lock:
+            return {
+                "entries": len(self),
+                "hits": self.hits,
+                "misses": self.misses,
+                "bytes_saved": self.bytes_saved,
+            }
+
+
+# Shared by every ConfigLoader in the process that enables interning without its own pool
+intern_pool = InternPool()
@@ -0,0 +1,50 @@
+"""
+A read-only mapping of configurations that are loaded the first time they are accessed.
+"""
+
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List
+
+
+class LazyConfigs(Mapping):
+    """
+    Map file stems to configurations, loading and merging each configuration on first access.
+    Loaded configurations are kept, so every file is loaded at most once.
+    """
+
+    def __init__(self, filepaths: Dict[str, Path], load: Callable[[Path], Any]):
+        self._filepaths = filepaths
+        self._load = load
+        self._configs: Dict[str, Any] = {}
+        self._locks = {stem: threading.Lock() for stem in filepaths}
+
+    def __getitem__(self, stem: str) -> Any:
+        try:
+            return self._configs[stem]
+        except KeyError:
+            pass
+        filepath = self._filepaths[stem]
+        with self._locks[stem]:
+            if stem not in self._configs:
+                self._configs[stem] = self._load(filepath)
+        return self._configs[stem]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._filepaths)
+
+    def __len__(self) -> int:
+        return len(self._filepaths)
+
+    def __contains__(self, stem: object) -> bool:
+        return stem in self._filepaths
+
+    def __repr__(self) -> str:
+        return f"LazyConfigs({list(self._filepaths)}, loaded={self.loaded()})"
+
+    def loaded(self) -> List[str]:
+        """
+        Return the stems of the configurations loaded so far.
+        """
+        return [stem for stem in self._filepaths if stem in self._configs]
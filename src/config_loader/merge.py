@@ -0,0 +1,123 @@
+"""
+Merge configuration trees without modifying them.
+Only the dictionaries that exist in both trees are copied; every other subtree is shared with the inputs,
+so the cost of a merge is proportional to the overlay rather than to the base configuration.
+A stack of layers is merged with merge_layers, which copies each merged dictionary only once
+and can tell which layer each value came from.
+"""
+
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+
+def merge_configs(base_config: Dict[str, Any], new_config: Dict[str, Any]) -> dict:
+    """
+    Merge two dictionaries into a new dictionary. Values from new_config overwrite base_config.
+    Neither input is modified, but the result shares subtrees with both, so treat the inputs as read-only
+    for as long as the result is in use. The trees are walked iteratively, so deep nesting is not limited by recursion.
+    """
+    merged = dict(base_config)
+    stack = [(merged, base_config, new_config)]
+    while stack:
+        target, base, new = stack.pop()
+        for key, value in new.items():
+            if isinstance(value, dict):
+                base_value = base.get(key)
+                if isinstance(base_value, dict):
+                    merged_value = dict(base_value)
+                    target[key] = merged_value
+                    stack.append((merged_value, base_value, value))
+                    continue
+            target[key] = value
+    return merged
+
+
+class Provenance:
+    """
+    The layers of a merged configuration, to find which layer each value came from.
+    Nothing is recorded while merging; a lookup follows the merge rules along one key path through the layers.
+    """
+
+    def __init__(self, layers: Sequence[Tuple[Dict[str, Any], str]]):
+        self.layers = list(layers)
+
+    def source(self, path: Union[str, Sequence[str]]) -> Optional[str]:
+        """
+        Return the name of the layer a value came from, given its key path as a tuple or a dotted string.
+        A merged dictionary is attributed to the last layer that sets it, and a missing key to its nearest parent.
+        """
+        if isinstance(path, str):
+            path = tuple(path.split(".")) if path else ()
+        name = self.layers[-1][1] if self.layers else None
+        nodes = self.layers
+        for key in path:
+            values = [(node[key], name) for node, name in nodes if key in node]
+            if not values:
+                break
+            name = values[-1][1]
+            # Only the dictionaries set since the last other value are merged below this key
+            nodes = []
+            for value, value_name in reversed(values):
+                if not isinstance(value, dict):
+                    break
+                nodes.append((value, value_name))
+            if not nodes:
+                break
+            nodes.reverse()
+        return name
+
+    def outline(self) -> "Provenance":
+        """
+        Return a Provenance over copies of the layers that keep only their keys, with None for every value
+        that is not a dictionary. It finds the same sources without holding the parsed values of every layer.
+        """
+        layers = []
+        for tree, name in self.layers:
+            outline: Dict[str, Any] = {}
+            stack = [(outline, tree)]
+            while stack:
+                target, node = stack.pop()
+                for key, value in node.items():
+                    if isinstance(value, dict):
+                        target[key] = {}
+                        stack.append((target[key], value))
+                    else:
+                        target[key] = None
+            layers.append((outline, name))
+        return Provenance(layers)
+
+    def __repr__(self) -> str:
+        return f"Provenance({[name for _, name in self.layers]!r})"
+
+
+def merge_layers(
+    trees: Sequence[Dict[str, Any]], names: Sequence[str]
+) -> Tuple[dict, Provenance]:
+    """
+    Merge an ordered stack of dictionaries. Values from later trees overwrite earlier ones, so the result equals
+    folding merge_configs over the trees, and it shares subtrees with them in the same way. Unlike a fold,
+    each merged dictionary is copied once and then updated in place by the layers above it.
+    Returns the merged dictionary and the Provenance of its values, named after the corresponding tree.
+    """
+    layers = [(tree, name) for tree, name in zip(trees, names) if tree]
+    if len(layers) == 2:
+        # Every merged dictionary is copied once anyway, without tracking which ones
+        return merge_configs(layers[0][0], layers[1][0]), Provenance(layers)
+
+    merged = dict(layers[0][0]) if layers else {}
+    # The dictionaries created by this merge, which may be modified. Any other is shared with an input
+    owned = {id(merged)}
+    for tree, _ in layers[1:]:
+        stack = [(merged, tree)]
+        while stack:
+            target, new = stack.pop()
+            for key, value in new.items():
+                if isinstance(value, dict):
+                    base_value = target.get(key)
+                    if isinstance(base_value, dict):
+                        if id(base_value) not in owned:
+                            base_value = target[key] = dict(base_value)
+                            owned.add(id(base_value))
+                        stack.append((base_value, value))
+                        continue
+                target[key] = value
+    return merged, Provenance(layers)
@@ -0,0 +1,200 @@
+"""
+Override configuration values with environment variables, 12-factor style.
+With the prefix "APP", APP__DATABASE__POOL__SIZE=50 sets database.pool.size to 50. Each segment after the prefix
+is a key, matched case-insensitively with "-" and "." read as "_", or a list index. The value is coerced to the type
+of the value it replaces, e.g. to an int for a port or parsed as JSON for a list.
+
+The environment is scanned once into a trie of key path segments. Applying the overrides then follows the trie
+through the configuration, so it costs the same however large the configuration and the environment are,
+and touches only the dictionaries and lists on the paths of the overrides.
+"""
+
+import datetime
+import json
+import logging
+import os
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from .coerce import MISSING, InvalidValue, to_bool, to_float, to_int
+
+logger = logging.getLogger(__name__)
+
+SEPARATOR = "__"
+
+KeyPath = Tuple[Any, ...]
+
+
+class OverrideError(ValueError):
+    """
+    Raised when an environment variable cannot override the value at its key path.
+    """
+
+
+class _Node:
+    """
+    A segment of the trie: the variable that sets the value at its key path, if any, and the segments below it.
+    """
+
+    __slots__ = ("variable", "value", "children")
+
+    def __init__(self):
+        self.variable: Optional[str] = None
+        self.value: Optional[str] = None
+        self.children: Dict[str, "_Node"] = {}
+
+
+def normalize_key(key: Any) -> str:
+    """
+    Return the form of a configuration key that environment variable segments are matched against.
+    """
+    return str(key).upper().replace("-", "_").replace(".", "_")
+
+
+class EnvOverrides:
+    """
+    The environment variables starting with prefix and the separator, indexed by their key paths.
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        environ: Optional[Mapping[str, str]] = None,
+        separator: str = SEPARATOR,
+    ):
+        if not prefix:
+            raise ValueError("An environment variable prefix is required")
+        self.prefix = prefix
+        self.separator = separator
+        # The overriding variables and their values, e.g. to fingerprint them
+        self.variables: Dict[str, str] = {}
+        self._root = _Node()
+
+        start = prefix + separator
+        environ = os.environ if environ is None else environ
+        for variable, value in environ.items():
+            if not variable.startswith(start):
+                continue
+            segments = variable[len(start) :].split(separator)
+            if not all(segments):
+                logger.warning(
+                    f"Ignoring environment variable with an empty key: {variable}"
+                )
+                continue
+            node = self._root
+            for segment in segments:
+                segment = segment.upper()
+                child = node.children.get(segment)
+                if child is None:
+                    child = node.children[segment] = _Node()
+                node = child
+            node.variable = variable
+            node.value = value
+            self.variables[variable] = value
+
+    def __len__(self) -> int:
+        return len(self.variables)
+
+    def __repr__(self) -> str:
+        return f"EnvOverrides({self.prefix!r}, {sorted(self.variables)!r})"
+
+    def apply(self, config: Any, stem: Optional[str] = None) -> Any:
+        """
+        Return config with the overrides applied. The dictionaries and lists on the path of an override are copied,
+        so config itself is not modified. Keys that do not exist are added, with their segment in lower case.
+        If stem is given, only the overrides below it apply, e.g. APP__DB__HOST to the configuration 'db'.
+        """
+        node = self._root
+        if stem is not None:
+            node = node.children.get(normalize_key(stem))
+            if node is None:
+                return config
+        if not node.children:
+            return config
+        if not isinstance(config, (dict, list)):
+            raise OverrideError(f"Cannot override keys of {type(config).__name__}")
+        return self._apply(config, node, ())
+
+    def _apply(self, container: Any, node: _Node, path: KeyPath) -> Any:
+        container = dict(container) if isinstance(container, dict) else list(container)
+        for segment, child in node.children.items():
+            key, existing = self._find(container, segment, child)
+            value = existing
+            if child.variable is not None:
+                value = coerce(child.value, existing, child.variable)
+            if child.children:
+                if value is MISSING:
+                    value = {}
+                elif not isinstance(value, (dict, list)):
+                    raise OverrideError(
+                        f"Cannot override keys below {'.'.join(map(str, path + (key,)))}, "
+                        f"which is a {type(value).__name__}"
+                    )
+                value = self._apply(value, child, path + (key,))
+            container[key] = value
+        return container
+
+    @staticmethod
+    def _find(container: Any, segment: str, node: _Node) -> Tuple[Any, Any]:
+        """
+        Return the key of a container that a segment names, and its value, or MISSING for a new key.
+        """
+        if isinstance(container, list):
+            if segment.isdigit() and int(segment) < len(container):
+                return int(segment), container[int(segment)]
+            raise OverrideError(
+                f"No list index {segment} for {_variables(node)}, the list has {len(container)} items"
+            )
+        # Most keys are lower case, so try that before comparing every key
+        key = segment.lower()
+        if key in container:
+            return key, container[key]
+        for candidate in container:
+            if normalize_key(candidate) == segment:
+                return candidate, container[candidate]
+        return key, MISSING
+
+
+def _variables(node: _Node) -> str:
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node.variable is not None:
+            return node.variable
+        stack.extend(node.children.values())
+    return ""
+
+
+def coerce(value: str, existing: Any, variable: str) -> Any:
+    """
+    Convert the value of an environment variable to the type of the value it overrides.
+    New keys and null values take the string as it is.
+    """
+    try:
+        if existing is MISSING or existing is None or isinstance(existing, str):
+            return value
+        if isinstance(existing, bool):
+            return to_bool(value)
+        if isinstance(existing, int):
+            return to_int(value)
+        if isinstance(existing, float):
+            return to_float(value)
+        if isinstance(existing, (dict, list)):
+            try:
+                parsed = json.loads(value)
+            except ValueError:
+                raise InvalidValue(f"cannot parse {value!r} as JSON") from None
+            if type(parsed) is not type(existing):
+                raise InvalidValue(
+                    f"expected a JSON {'object' if isinstance(existing, dict) else 'array'}"
+                )
+            return parsed
+        if isinstance(existing, (datetime.date, datetime.time)):
+            try:
+                return type(existing).fromisoformat(value)
+            except ValueError:
+                raise InvalidValue(
+                    f"cannot convert {value!r} to {type(existing).__name__}"
+                ) from None
+    except InvalidValue as error:
+        raise OverrideError(f"{variable}: {error}") from None
+    return value
@@ -0,0 +1,274 @@
+"""
+A registry of parser backends for configuration file formats.
+Each file extension can have several backends. The fastest available backend is used,
+and every backend must produce exactly the same output as the reference backend for its format.
+"""
+
+import datetime
+import importlib.util
+import threading
+import timeit
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+
+class ParserBackend:
+    """
+    A parser for one or more file extensions.
+    Backends with a lower priority are preferred. The reference backend defines the expected output for its format.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        suffixes: Sequence[str],
+        loads: Callable[[bytes], Any],
+        priority: int = 100,
+        requires: Union[str, Callable[[], bool], None] = None,
+        reference: bool = False,
+    ):
+        self.name = name
+        self.suffixes = tuple(suffixes)
+        self.loads = loads
+        self.priority = priority
+        self.requires = requires
+        self.reference = reference
+        self._available: Optional[bool] = None
+
+    def available(self) -> bool:
+        """
+        Check whether the backend can be used, without importing its module.
+        """
+        if self._available is None:
+            if self.requires is None:
+                self._available = True
+            elif callable(self.requires):
+                self._available = bool(self.requires())
+            else:
+                self._available = importlib.util.find_spec(self.requires) is not None
+        return self._available
+
+    def __repr__(self) -> str:
+        return f"ParserBackend({self.name!r}, priority={self.priority})"
+
+
+_backends: Dict[str, List[ParserBackend]] = {}
+_selected: Dict[str, ParserBackend] = {}
+_lock = threading.Lock()
+
+
+def register_parser(backend: ParserBackend) -> ParserBackend:
+    """
+    Register a parser backend for each of its file extensions.
+    """
+    with _lock:
+        for suffix in backend.suffixes:
+            backends = _backends.setdefault(suffix, [])
+            backends.append(backend)
+            backends.sort(key=lambda b: b.priority)
+            _selected.pop(suffix, None)
+    return backend
+
+
+def available_parsers(suffix: str) -> List[ParserBackend]:
+    """
+    Return the available backends for a file extension, fastest first.
+    """
+    return [backend for backend in _backends.get(suffix, []) if backend.available()]
+
+
+def get_parser(suffix: str) -> Optional[ParserBackend]:
+    """
+    Return the backend used for a file extension, or None if the extension is not supported.
+    """
+    backend = _selected.get(suffix)
+    if backend is None:
+        backends = available_parsers(suffix)
+        if not backends:
+            return None
+        backend = _selected[suffix] = backends[0]
+    return backend
+
+
+def select_fastest(suffix: str, sample: bytes, number: int = 5) -> Optional[str]:
+    """
+    Time every available backend for a file extension on a sample document and use the fastest one.
+    Backends whose output differs from the reference backend are skipped. Returns the name of the selected backend.
+    """
+    backends = available_parsers(suffix)
+    references = [backend for backend in backends if backend.reference]
+    if not references:
+        return None
+    expected = references[0].loads(sample)
+
+    timings = []
+    for backend in backends:
+        try:
+            if not _identical(backend.loads(sample), expected):
+                continue
+        except Exception:
+            continue
+        seconds = min(
+            timeit.repeat(lambda: backend.loads(sample), number=number, repeat=3)
+        )
+        timings.append((seconds, backend.priority, backend))
+
+    _, _, fastest = min(timings, key=lambda timing: timing[:2])
+    with _lock:
+        _selected[suffix] = fastest
+    return fastest.name
+
+
+def _identical(value: Any, expected: Any) -> bool:
+    """
+    Compare parsed documents, including the types of their values, so that 1 and 1.0 or True and 1 differ.
+    """
+    if type(value) is not type(expected):
+        return False
+    if isinstance(value, dict):
+        return list(value) == list(expected) and all(
+            _identical(value[key], expected[key]) for key in value
+        )
+    if isinstance(value, list):
+        return len(value) == len(expected) and all(
+            _identical(item, other) for item, other in zip(value, expected)
+        )
+    if isinstance(value, (datetime.datetime, datetime.time)):
+        return value == expected and type(value.tzinfo) is type(expected.tzinfo)
+    if isinstance(value, float) and value != value:
+        return expected != expected
+    return value == expected
+
+
+def _json_loads(data: bytes) -> Any:
+    import json
+
+    return json.loads(data)
+
+
+# orjson parses integers outside the range of 64-bit integers, which have 19 or more digits, as floats.
+# Mapping every digit to "0" and everything else to a space finds a run of 19 digits much faster than a regex
+_DIGITS = bytes(ord("0") if byte in b"0123456789" else ord(" ") for byte in range(256))
+_LONG_DIGITS = b"0" * 19
+
+
+def _orjson_loads(data: bytes) -> Any:
+    import orjson
+
+    # A long run of digits may be such an integer, which the json module keeps exact
+    if _LONG_DIGITS in data.translate(_DIGITS):
+        return _json_loads(data)
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        # orjson rejects NaN and Infinity, and numbers beyond the range of a float, which the json module accepts
+        return _json_loads(data)
+
+
+def _libyaml_available() -> bool:
+    if importlib.util.find_spec("yaml") is None:
+        return False
+    import yaml
+
+    return getattr(yaml, "__with_libyaml__", False)
+
+
+def _yaml_loads(data: bytes) -> Any:
+    import yaml
+
+    return yaml.load(data, Loader=_include_loader(yaml.SafeLoader))
+
+
+def _libyaml_loads(data: bytes) -> Any:
+    import yaml
+
+    return yaml.load(data, Loader=_include_loader(yaml.CSafeLoader))
+
+
+_include_loaders: Dict[type, type] = {}
+
+
+def _include_loader(base: type) -> type:
+    """
+    Return a subclass of a safe YAML loader that reads "!include path" as {"$include": path}, see includes.py.
+    """
+    loader = _include_loaders.get(base)
+    if loader is None:
+        loader = _include_loaders[base] = type(base.__name__, (base,), {})
+        loader.add_constructor("!include", _construct_include)
+    return loader
+
+
+def _construct_include(loader: Any, node: Any) -> Dict[str, Any]:
+    import yaml
+
+    if isinstance(node, yaml.SequenceNode):
+        return {"$include": loader.construct_sequence(node)}
+    return {"$include": loader.construct_scalar(node)}
+
+
+def _tomllib_loads(data: bytes) -> Any:
+    try:
+        import tomllib  # Python 3.11+
+    except ImportError:
+        import tomli as tomllib  # Fallback for older versions
+    return tomllib.loads(data.decode())
+
+
+def _tomllib_available() -> bool:
+    return (
+        importlib.util.find_spec("tomllib") is not None
+        or importlib.util.find_spec("tomli") is not None
+    )
+
+
+def _rtoml_loads(data: bytes) -> Any:
+    import rtoml
+
+    return _standard_timezones(rtoml.loads(data.decode()))
+
+
+def _standard_timezones(value: Any) -> Any:
+    """
+    Replace the timezones of rtoml's datetimes with datetime.timezone, as returned by tomllib.
+    """
+    if isinstance(value, dict):
+        for key, item in value.items():
+            value[key] = _standard_timezones(item)
+    elif isinstance(value, list):
+        for i, item in enumerate(value):
+            value[i] = _standard_timezones(item)
+    elif isinstance(value, datetime.datetime) and value.tzinfo is not None:
+        return value.replace(tzinfo=datetime.timezone(value.utcoffset()))
+    return value
+
+
+register_parser(ParserBackend("json", [".json"], _json_loads, reference=True))
+register_parser(
+    ParserBackend("orjson", [".json"], _orjson_loads, priority=10, requires="orjson")
+)
+register_parser(
+    ParserBackend(
+        "yaml", [".yaml", ".yml"], _yaml_loads, requires="yaml", reference=True
+    )
+)
+register_parser(
+    ParserBackend(
+        "libyaml",
+        [".yaml", ".yml"],
+        _libyaml_loads,
+        priority=10,
+        requires=_libyaml_available,
+    )
+)
+register_parser(
+    ParserBackend(
+        "tomllib",
+        [".toml"],
+        _tomllib_loads,
+        requires=_tomllib_available,
+        reference=True,
+    )
+)
+register_parser(
+    ParserBackend("rtoml", [".toml"], _rtoml_loads, priority=10, requires="rtoml")
+)
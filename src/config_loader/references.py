@@ -0,0 +1,213 @@
+"""
+Resolve references to other values of the same configuration, e.g. "postgres://${database.host}:${database.port}".
+A reference is a dotted key path of at least two keys, where a key may be a list index, e.g. ${servers.0.host}.
+A single name, e.g. ${DB_PASSWORD}, is an environment variable and is left to secrets parsing.
+
+The strings holding references form a dependency graph: a string depends on the strings it references, and on
+those inside a referenced dictionary or list. Each string is evaluated once, after everything it depends on,
+in a single topological pass, so resolution is linear in the number of references. A string that is exactly
+one reference takes the referenced value itself, keeping its type.
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .cache import copy_tree
+
+REFERENCE_PATTERN = re.compile(r"\$\{([\w-]+(?:\.[\w-]+)+)\}")
+
+KeyPath = Tuple[Any, ...]
+
+
+class ConfigReferenceError(ValueError):
+    """
+    Raised for a reference to a key path that does not exist, or that cannot be inserted into a string.
+    """
+
+
+class ReferenceCycleError(ConfigReferenceError):
+    """
+    Raised when values reference each other. The cycle lists their key paths, starting and ending with the same one.
+    """
+
+    def __init__(self, cycle: Sequence[KeyPath]):
+        self.cycle = list(cycle)
+        names = " -> ".join(".".join(map(str, path)) for path in self.cycle)
+        super().__init__(f"Reference cycle: {names}")
+
+
+def _dotted(path: KeyPath) -> str:
+    return ".".join(map(str, path))
+
+
+def find_references(config: Any) -> Dict[KeyPath, str]:
+    """
+    Return the key path of every string in config that holds a reference.
+    """
+    return {path: template for path, (_, _, template) in _scan(config).items()}
+
+
+def _scan(config: Any) -> Dict[KeyPath, Tuple[Any, Any, str]]:
+    """
+    Return the container, key and value of every string in config that holds a reference, by key path.
+    """
+    templates = {}
+    stack: List[Tuple[KeyPath, Any]] = [((), config)]
+    while stack:
+        path, node = stack.pop()
+        items = node.items() if type(node) is dict else enumerate(node)
+        # Key paths are only built for containers and matching strings, not for every value
+        for key, value in items:
+            value_type = type(value)
+            if value_type is str:
+                if "${" in value and REFERENCE_PATTERN.search(value):
+                    templates[path + (key,)] = (node, key, value)
+            elif value_type is dict or value_type is list:
+                stack.append((path + (key,), value))
+    return templates
+
+
+def _lookup(config: Any, name: str, template_path: KeyPath) -> Tuple[KeyPath, Any]:
+    """
+    Return the key path a dotted reference names, with the keys of lists as integers, and its value.
+    """
+    path: KeyPath = ()
+    value = config
+    for key in name.split("."):
+        if isinstance(value, dict):
+            # YAML keys may be integers
+            if key not in value and key.isdigit() and int(key) in value:
+                key = int(key)
+            found = key in value
+        elif isinstance(value, list):
+            found = key.isdigit() and int(key) < len(value)
+            if found:
+                key = int(key)
+        else:
+            found = False
+        if not found:
+            raise ConfigReferenceError(
+                f"${{{name}}} in {_dotted(template_path)} does not exist"
+            )
+        path += (key,)
+        value = value[key]
+    return path, value
+
+
+# How the value of a reference is read when a string is evaluated
+_STATIC = 0  # The value found when the references were looked up
+_STRING = 1  # The evaluated string at the key path
+_CONTAINER = 2  # The container at the key path, once the strings in it are evaluated
+
+
+def resolve_references(config: Any) -> Any:
+    """
+    Replace the references in config with the values they name, in place, and return config.
+    Raise a ReferenceCycleError if values reference each other, and a ConfigReferenceError for a missing key path
+    or a dictionary or list referenced inside a longer string.
+    """
+    templates = _scan(config)
+    if not templates:
+        return config
+
+    # Each dotted name is looked up once, however many strings reference it
+    targets: Dict[str, Tuple[int, KeyPath, Any]] = {}
+    # The strings below each key path, only needed if a container is referenced
+    below: Optional[Dict[KeyPath, List[KeyPath]]] = None
+    plans: Dict[KeyPath, Tuple[List[str], List[str]]] = {}
+    dependencies: Dict[KeyPath, List[KeyPath]] = {}
+    for path, (_, _, template) in templates.items():
+        # Literal text and names alternate, starting and ending with text
+        parts = REFERENCE_PATTERN.split(template)
+        names = parts[1::2]
+        depends = []
+        for name in names:
+            target = targets.get(name)
+            if target is None:
+                target_path, value = _lookup(config, name, path)
+                if target_path in templates:
+                    target = (_STRING, target_path, None)
+                elif isinstance(value, (dict, list)):
+                    target = (_CONTAINER, target_path, value)
+                else:
+                    target = (_STATIC, target_path, value)
+                targets[name] = target
+            kind, target_path, _ = target
+            if kind == _STRING:
+                depends.append(target_path)
+            elif kind == _CONTAINER:
+                if below is None:
+                    below = {}
+                    for template_path in templates:
+                        for length in range(1, len(template_path)):
+                            below.setdefault(template_path[:length], []).append(
+                                template_path
+                            )
+                depends.extend(below.get(target_path, ()))
+        plans[path] = (parts, names)
+        dependencies[path] = depends
+
+    resolved: Dict[KeyPath, Any] = {}
+    for path in _topological_order(templates, dependencies):
+        parts, names = plans[path]
+        values = []
+        for name in names:
+            kind, target_path, value = targets[name]
+            values.append(resolved[target_path] if kind == _STRING else value)
+        if len(parts) == 3 and not parts[0] and not parts[2]:
+            # A whole reference keeps the type of the value, and a container is copied so that it is not shared
+            result = copy_tree(values[0])
+        else:
+            pieces = parts[:]
+            for index, (name, value) in enumerate(zip(names, values)):
+                pieces[2 * index + 1] = _insert(name, value, path)
+            result = "".join(pieces)
+        resolved[path] = result
+        container, key, _ = templates[path]
+        container[key] = result
+    return config
+
+
+def _insert(name: str, value: Any, path: KeyPath) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (dict, list)):
+        raise ConfigReferenceError(
+            f"Cannot insert the {type(value).__name__} ${{{name}}} into {_dotted(path)}"
+        )
+    if isinstance(value, bool) or value is None:
+        return json.dumps(value)
+    return str(value)
+
+
+def _topological_order(
+    templates: Dict[KeyPath, Any], dependencies: Dict[KeyPath, List[KeyPath]]
+) -> List[KeyPath]:
+    """
+    Return the key paths of the templates, each after the templates it depends on.
+    """
+    order = []
+    done = set()
+    for root in templates:
+        if root in done:
+            continue
+        done.add(root)
+        trail = [root]
+        on_trail = {root}
+        stack = [iter(dependencies[root])]
+        while stack:
+            for child in stack[-1]:
+                if child in on_trail:
+                    raise ReferenceCycleError(trail[trail.index(child) :] + [child])
+                if child not in done:
+                    done.add(child)
+                    trail.append(child)
+                    on_trail.add(child)
+                    stack.append(iter(dependencies[child]))
+                    break
+            else:
+                stack.pop()
+                on_trail.discard(trail[-1])
+                order.append(trail.pop())
+    return order
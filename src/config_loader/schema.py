@@ -0,0 +1,494 @@
+"""
+Validate merged configurations against a schema compiled once into Python code.
+A schema is a subset of JSON Schema, or a dataclass whose fields describe the configuration. Compiling it
+generates a function per object and per array of the schema, which checks each key with straight-line code,
+so validating a configuration interprets no schema at all: every keyword was resolved when it was compiled.
+"""
+
+import dataclasses
+import hashlib
+import json
+import re
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+
+from .coerce import MISSING, TYPE_NAMES, UNION_TYPES, type_name
+from .merge import Provenance
+
+KeyPath = Tuple[Any, ...]
+
+_TYPES = {
+    "object": (dict,),
+    "array": (list,),
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "null": (type(None),),
+}
+
+# Keywords that only annotate a schema
+_ANNOTATIONS = {"$schema", "$id", "title", "description", "default", "examples"}
+_KEYWORDS = {
+    "type",
+    "properties",
+    "required",
+    "additionalProperties",
+    "items",
+    "enum",
+    "const",
+    "minimum",
+    "maximum",
+    "exclusiveMinimum",
+    "exclusiveMaximum",
+    "minLength",
+    "maxLength",
+    "pattern",
+    "minItems",
+    "maxItems",
+}
+
+
+@dataclasses.dataclass
+class SchemaViolation:
+    """
+    A value that does not match the schema, at its key path.
+    The source is the file or layer the value came from, when it is known.
+    """
+
+    path: KeyPath
+    message: str
+    source: Optional[str] = None
+
+    def __str__(self) -> str:
+        location = ".".join(map(str, self.path)) or "<root>"
+        if self.source is None:
+            return f"{location}: {self.message}"
+        return f"{location}: {self.message} (from {self.source})"
+
+
+class ConfigValidationError(ValueError):
+    """
+    Raised when a configuration does not match its schema. Lists every violation found.
+    """
+
+    def __init__(self, violations: List[SchemaViolation], stem: Optional[str] = None):
+        self.violations = violations
+        self.stem = stem
+        name = f" '{stem}'" if stem is not None else ""
+        lines = "".join(f"\n  {violation}" for violation in violations)
+        super().__init__(f"Invalid configuration{name}:{lines}")
+
+
+class CompiledSchema:
+    """
+    A schema compiled into a validating function. Build one with compile_schema().
+    """
+
+    def __init__(self, validate: Callable[[Any, KeyPath, list], None], source: str):
+        self._validate = validate
+        # The generated code, for debugging
+        self.source = source
+        # A content hash of the schema, set by compile_schema, e.g. to tell whether a snapshot was validated by it
+        self.digest: Optional[str] = None
+
+    def validate(self, config: Any) -> List[SchemaViolation]:
+        """
+        Return every violation of the schema in config, in document order of the schema.
+        """
+        violations: List[SchemaViolation] = []
+        self._validate(config, (), violations)
+        return violations
+
+    def check(
+        self,
+        config: Any,
+        provenance: Optional[Provenance] = None,
+        stem: Optional[str] = None,
+    ):
+        """
+        Raise a ConfigValidationError if config does not match the schema.
+        With the Provenance of a merged configuration, each violation names the layer its value came from.
+        """
+        violations = self.validate(config)
+        if not violations:
+            return
+        if provenance is not None:
+            for violation in violations:
+                violation.source = provenance.source(violation.path)
+        raise ConfigValidationError(violations, stem)
+
+
+def _is_type(value: Any, types_: Tuple[type, ...]) -> bool:
+    # A subclass of an accepted type, except bool, which is not an integer in a configuration
+    return type(value) is not bool and isinstance(value, types_)
+
+
+class _Generator:
+    """
+    Generate the source of a validating function for a schema.
+    Each object and each array gets its own function, which checks its keys or items with straight-line code.
+    Values the code refers to, such as types and bounds, are passed in as constants.
+    A path is only built for a nested object or array, or when reporting a violation.
+    """
+
+    def __init__(self):
+        self.namespace: Dict[str, Any] = {
+            "_MISSING": MISSING,
+            "_NUMBERS": _NUMBERS,
+            "_is_type": _is_type,
+            "_type_name": type_name,
+            "SchemaViolation": SchemaViolation,
+        }
+        self.functions: List[str] = []
+        # Equal constants and identical functions, e.g. for repeated sections, are only defined once
+        self._constants: Dict[Any, str] = {}
+        self._bodies: Dict[str, str] = {}
+
+    def constant(self, value: Any) -> str:
+        # Keyed on the representation, since e.g. (1,) == (True,)
+        key = (type(value), repr(value))
+        name = self._constants.get(key)
+        if name is None:
+            name = self._constants[key] = f"_c{len(self.namespace)}"
+            self.namespace[name] = value
+        return name
+
+    def function(self, kind: str, lines: List[str]) -> str:
+        """
+        Define a function with the body lines, unless an identical one exists, and return its name.
+        """
+        body = "\n".join(lines) if lines else "    pass"
+        name = self._bodies.get(body)
+        if name is None:
+            name = self._bodies[body] = f"_{kind}{len(self._bodies)}"
+            self.functions.append(f"def {name}(value, path, violations):\n{body}")
+        return name
+
+    def generate(self, schema: Dict[str, Any]) -> CompiledSchema:
+        lines: List[str] = []
+        self.value(lines, schema, "value", "path", 1)
+        name = self.function("validate", lines)
+        source = "\n\n".join(self.functions)
+        exec(compile(source, "<schema>", "exec"), self.namespace)
+        return CompiledSchema(self.namespace[name], source)
+
+    def value(self, lines: List[str], schema: Any, var: str, path: str, depth: int):
+        """
+        Append the statements that check the value in var, whose path is the expression path.
+        """
+        if not isinstance(schema, dict):
+            raise TypeError(f"Invalid schema: {schema!r}")
+        unsupported = schema.keys() - _KEYWORDS - _ANNOTATIONS
+        if unsupported:
+            raise ValueError(f"Unsupported schema keywords: {sorted(unsupported)}")
+
+        indent = "    " * depth
+        types_, type_name = _compile_type(schema.get("type"))
+        body: List[str] = []
+        if types_ is not None:
+            # Only the rest of the checks apply to a value of the right type
+            types_name = self.constant(types_)
+            message = self.constant(f"expected {type_name}, got ")
+            lines.append(
+                f"{indent}if type({var}) not in {types_name} and not _is_type({var}, {types_name}):"
+            )
+            lines.append(
+                f"{indent}    violations.append(SchemaViolation({path}, {message} + _type_name({var})))"
+            )
+            body_indent = indent + "    "
+        else:
+            body_indent = indent
+
+        if (
+            "properties" in schema
+            or "required" in schema
+            or schema.get("additionalProperties", True) is not True
+        ):
+            function = self.object_function(schema)
+            body.append(f"{body_indent}if isinstance({var}, dict):")
+            body.append(f"{body_indent}    {function}({var}, {path}, violations)")
+        if "items" in schema:
+            function = self.items_function(schema["items"])
+            body.append(f"{body_indent}if isinstance({var}, list):")
+            body.append(f"{body_indent}    {function}({var}, {path}, violations)")
+        for condition, message in self.checks(schema, var):
+            body.append(f"{body_indent}if {condition}:")
+            body.append(
+                f"{body_indent}    violations.append(SchemaViolation({path}, {self.constant(message)}))"
+            )
+
+        if body and types_ is not None:
+            lines.append(f"{indent}else:")
+        lines.extend(body)
+
+    def object_function(self, schema: Dict[str, Any]) -> str:
+        lines: List[str] = []
+
+        required = list(schema.get("required", ()))
+        if required:
+            lines.append(f"    for key in {self.constant(tuple(required))}:")
+            lines.append("        if key not in value:")
+            lines.append(
+                "            violations.append(SchemaViolation(path + (key,), 'required key is missing'))"
+            )
+
+        properties = schema.get("properties", {})
+        additional = schema.get("additionalProperties", True)
+        if additional is not True:
+            allowed = self.constant(frozenset(properties))
+            lines.append(f"    if not {allowed}.issuperset(value):")
+            lines.append("        for key, item in value.items():")
+            lines.append(f"            if key not in {allowed}:")
+            if additional is False:
+                lines.append(
+                    "                violations.append(SchemaViolation(path + (key,), 'unexpected key'))"
+                )
+            else:
+                extra_lines: List[str] = []
+                self.value(extra_lines, additional, "item", "path + (key,)", 4)
+                lines.extend(extra_lines or ["                pass"])
+
+        for key, child in properties.items():
+            child_lines: List[str] = []
+            key_name = repr(key) if type(key) is str else self.constant(key)
+            self.value(child_lines, child, "item", f"path + ({key_name},)", 2)
+            if child_lines:
+                lines.append(f"    item = value.get({key_name}, _MISSING)")
+                lines.append("    if item is not _MISSING:")
+                lines.extend(child_lines)
+
+        return self.function("object", lines)
+
+    def items_function(self, schema: Dict[str, Any]) -> str:
+        lines: List[str] = []
+        item_lines: List[str] = []
+        self.value(item_lines, schema, "item", "path + (index,)", 2)
+        if item_lines:
+            lines.append("    for index, item in enumerate(value):")
+            lines.extend(item_lines)
+        return self.function("items", lines)
+
+    def checks(self, schema: Dict[str, Any], var: str) -> List[Tuple[str, str]]:
+        """
+        Return the condition under which each remaining keyword is violated, and its message.
+        Numeric bounds apply to ints and floats, length bounds to strings and to lists.
+        """
+        checks = []
+        if "enum" in schema:
+            options = list(schema["enum"])
+            checks.append(
+                (
+                    f"not any(_same({var}, option) for option in {self.constant(options)})",
+                    f"must be one of {options!r}",
+                )
+            )
+            self.namespace["_same"] = _same
+        if "const" in schema:
+            const = schema["const"]
+            checks.append(
+                (f"not _same({var}, {self.constant(const)})", f"must be {const!r}")
+            )
+            self.namespace["_same"] = _same
+        for keyword, operator, message in _BOUNDS:
+            if keyword in schema:
+                bound = schema[keyword]
+                checks.append(
+                    (
+                        f"type({var}) in _NUMBERS and not {var} {operator} {self.constant(bound)}",
+                        message.format(bound),
+                    )
+                )
+        for keyword, kind, operator, message in _LENGTHS:
+            if keyword in schema:
+                length = schema[keyword]
+                checks.append(
+                    (
+                        f"type({var}) is {kind} and not len({var}) {operator} {self.constant(length)}",
+                        message.format(length),
+                    )
+                )
+        if "pattern" in schema:
+            search = self.constant(re.compile(schema["pattern"]).search)
+            checks.append(
+                (
+                    f"type({var}) is str and {search}({var}) is None",
+                    f"must match {schema['pattern']!r}",
+                )
+            )
+        return checks
+
+
+def _compile_type(type_: Any) -> Tuple[Optional[Tuple[type, ...]], str]:
+    """
+    Return the Python types for a JSON Schema type, a list of them or a Python class, and their name.
+    """
+    if type_ is None:
+        return None, ""
+    if isinstance(type_, (str, type)):
+        type_ = [type_]
+    types_: List[type] = []
+    names = []
+    for name in type_:
+        if isinstance(name, type):
+            types_.append(name)
+            names.append(TYPE_NAMES.get(name, name.__name__))
+        elif name in _TYPES:
+            types_.extend(_TYPES[name])
+            names.append(name)
+        else:
+            raise ValueError(f"Unknown schema type: {name!r}")
+    return tuple(dict.fromkeys(types_)), " or ".join(names)
+
+
+_NUMBERS = (int, float)
+_BOUNDS = [
+    ("minimum", ">=", "must be at least {}"),
+    ("maximum", "<=", "must be at most {}"),
+    ("exclusiveMinimum", ">", "must be greater than {}"),
+    ("exclusiveMaximum", "<", "must be less than {}"),
+]
+_LENGTHS = [
+    ("minLength", "str", ">=", "must be at least {} characters long"),
+    ("maxLength", "str", "<=", "must be at most {} characters long"),
+    ("minItems", "list", ">=", "must have at least {} items"),
+    ("maxItems", "list", "<=", "must have at most {} items"),
+]
+
+
+def _same(value: Any, expected: Any) -> bool:
+    # True == 1 in Python, but not in a schema
+    return value == expected and isinstance(value, bool) == isinstance(expected, bool)
+
+
+def dataclass_schema(cls: type) -> Dict[str, Any]:
+    """
+    Translate a dataclass into the JSON Schema subset. Fields without a default are required and keys without
+    a field are not allowed. Field types may be int, float, str, bool, None, Any, other classes, Optional and
+    Unions of these, Literal, list and List[...], dict and Dict[str, ...], and nested dataclasses.
+    """
+    hints = get_type_hints(cls)
+    properties = {}
+    required = []
+    for field in dataclasses.fields(cls):
+        properties[field.name] = _annotation_schema(hints[field.name])
+        if (
+            field.default is dataclasses.MISSING
+            and field.default_factory is dataclasses.MISSING
+        ):
+            required.append(field.name)
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": required,
+        "additionalProperties": False,
+    }
+
+
+def _annotation_schema(annotation: Any) -> Dict[str, Any]:
+    if annotation is Any:
+        return {}
+    if annotation is None or annotation is type(None):
+        return {"type": "null"}
+    if dataclasses.is_dataclass(annotation):
+        return dataclass_schema(annotation)
+    if annotation in TYPE_NAMES:
+        return {"type": TYPE_NAMES[annotation]}
+
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+    if origin in UNION_TYPES:
+        members = [_annotation_schema(arg) for arg in args]
+        if any(not member for member in members):
+            return {}
+        complex_members = [member for member in members if member.keys() != {"type"}]
+        if len(complex_members) > 1:
+            raise TypeError(f"Unsupported union type: {annotation}")
+        member_types: List[Any] = []
+        for member in members:
+            member_type = member["type"]
+            member_types.extend(
+                member_type if isinstance(member_type, list) else [member_type]
+            )
+        schema = dict(complex_members[0]) if complex_members else {}
+        schema["type"] = member_types
+        return schema
+    if origin is Literal:
+        return {"enum": list(args)}
+    if origin is list:
+        if args:
+            return {"type": "array", "items": _annotation_schema(args[0])}
+        return {"type": "array"}
+    if origin is dict:
+        if args:
+            return {
+                "type": "object",
+                "additionalProperties": _annotation_schema(args[1]),
+            }
+        return {"type": "object"}
+    if isinstance(annotation, type):
+        return {"type": annotation}
+    raise TypeError(f"Unsupported field type: {annotation}")
+
+
+def compile_schema(schema: Union[Dict[str, Any], type]) -> CompiledSchema:
+    """
+    Compile a JSON Schema subset or a dataclass into a CompiledSchema.
+    Compile a schema once and keep the result: the compiled form does not follow later changes to the schema.
+    Supported keywords: type, properties, required, additionalProperties, items, enum, const, minimum,
+    maximum, exclusiveMinimum, exclusiveMaximum, minLength, maxLength, pattern, minItems and maxItems.
+    A type may also be a Python class, e.g. datetime.date, which values must be instances of.
+    """
+    if isinstance(schema, type) and dataclasses.is_dataclass(schema):
+        schema = dataclass_schema(schema)
+    elif not isinstance(schema, dict):
+        raise TypeError(f"Expected a JSON schema or a dataclass, got {schema!r}")
+    compiled = _Generator().generate(schema)
+    compiled.digest = schema_digest(schema)
+    return compiled
+
+
+def schema_digest(schema: Dict[str, Any]) -> str:
+    """
+    Return a hash of the content of a JSON schema. Python classes used as types are named by their module and name.
+    """
+
+    def name(value: Any) -> str:
+        if isinstance(value, type):
+            return f"{value.__module__}.{value.__qualname__}"
+        return repr(value)
+
+    data = json.dumps(schema, sort_keys=True, default=name)
+    return hashlib.blake2b(data.encode(), digest_size=16).hexdigest()
+
+
+def compile_schemas(
+    schema: Union[Dict[str, Any], type, None],
+    schemas: Optional[Dict[str, Union[Dict[str, Any], type]]],
+    stems: Sequence[str],
+) -> Dict[str, CompiledSchema]:
+    """
+    Return the compiled schema for each stem: its own schema from schemas, if any, or else the schema for every
+    configuration. Each schema is compiled once.
+    """
+    compiled = {
+        stem: compile_schema(stem_schema)
+        for stem, stem_schema in (schemas or {}).items()
+    }
+    if schema is not None:
+        shared = compile_schema(schema)
+        for stem in stems:
+            compiled.setdefault(stem, shared)
+    return compiled
@@ -1,12 +1,18 @@
 import os
 import re
+import threading
+from collections import ChainMap
 from pathlib import Path
-from typing import Union
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
 
-from dotenv import load_dotenv
+from dotenv import dotenv_values, load_dotenv
 
 FILEPATH_SECRETS_DEFAULT = Path("./.env")
 
+ENV_VAR_PATTERN = re.compile(r"\$\{(\w+)\}")
+
+KeyPath = Tuple[Any, ...]
+
 
 def load_secrets(filepath: Union[str, Path] = None) -> dict:
     """Load secrets from environment or a specified .env file"""
@@ -34,33 +40,146 @@ def get_secrets(secrets: list[str] = None) -> dict:
     return secrets
 
 
-def parse_secrets(configs: dict) -> dict:
-    """Parse secrets in configs, recursively replacing environment variables."""
-    env_var_pattern = re.compile(r"\$\{(\w+)\}")
-
-    def replace_env_var(match):
-        var_name = match.group(1)
-        if var_name in os.environ:
-            return os.environ[var_name]
-        else:
-            raise ValueError(f"Environment variable '{var_name}' not found")
-
-    def parse_value(value):
-        """Recursively parse a value to replace environment variables."""
+class SecretsPlan:
+    """The leaves of a config containing ${VAR} placeholders, indexed by the variables they use.
+
+    Resolving the plan only touches those leaves, and after a secret changes only the leaves
+    using it need to be resolved again.
+    """
+
+    def __init__(self, templates: Dict[KeyPath, str]):
+        self.templates = templates
+        self.index: Dict[str, List[KeyPath]] = {}
+        for path, template in templates.items():
+            for var_name in dict.fromkeys(ENV_VAR_PATTERN.findall(template)):
+                self.index.setdefault(var_name, []).append(path)
+
+    def __len__(self) -> int:
+        return len(self.templates)
+
+    @property
+    def variables(self) -> List[str]:
+        """Names of the variables used in the config"""
+        return list(self.index)
+
+    def resolve(self, configs: Any, environ: Optional[Mapping[str, str]] = None) -> Any:
+        """Replace placeholders in configs, in place, with values from environ or os.environ"""
+        return self._apply(configs, self.templates, environ)
+
+    def refresh(
+        self,
+        configs: Any,
+        variables: Iterable[str],
+        environ: Optional[Mapping[str, str]] = None,
+    ) -> Any:
+        """Resolve again only the leaves using the given variables, e.g. after a secret rotation"""
+        paths = {}
+        for var_name in variables:
+            for path in self.index.get(var_name, ()):
+                paths[path] = self.templates[path]
+        return self._apply(configs, paths, environ)
+
+    def _apply(
+        self,
+        configs: Any,
+        templates: Dict[KeyPath, str],
+        environ: Optional[Mapping[str, str]],
+    ) -> Any:
+        environ = os.environ if environ is None else environ
+
+        def replace_env_var(match):
+            var_name = match.group(1)
+            if var_name in environ:
+                return environ[var_name]
+            else:
+                raise ValueError(f"Environment variable '{var_name}' not found")
+
+        for path, template in templates.items():
+            value = ENV_VAR_PATTERN.sub(replace_env_var, template)
+            if not path:
+                return value
+            container = configs
+            for key in path[:-1]:
+                container = container[key]
+            container[path[-1]] = value
+        return configs
+
+
+def compile_secrets(configs: Any) -> SecretsPlan:
+    """Scan configs once, recording the path of every string with a ${VAR} placeholder"""
+    templates = {}
+    stack = [((), configs)]
+    while stack:
+        path, value = stack.pop()
         if isinstance(value, dict):
-            # Recursively process dictionaries
-            for k, v in value.items():
-                value[k] = parse_value(v)
-            return value
+            items = value.items()
         elif isinstance(value, list):
-            # Recursively process lists
-            return [parse_value(item) for item in value]
-        elif isinstance(value, str):
-            # Apply the regex substitution to strings
-            return env_var_pattern.sub(replace_env_var, value)
+            items = enumerate(value)
         else:
-            # Return the value unchanged if it's not a string, dict, or list
-            return value
+            if isinstance(value, str) and "${" in value:
+                if ENV_VAR_PATTERN.search(value):
+                    templates[path] = value
+            continue
+        # Push in reverse so the leaves are recorded in document order
+        stack.extend((path + (key,), item) for key, item in reversed(list(items)))
+    return SecretsPlan(templates)
 
-    # Modify the original configs in place
-    return parse_value(configs)
+
+def parse_secrets(configs: dict) -> dict:
+    """Parse secrets in configs, replacing environment variables in place."""
+    return compile_secrets(configs).resolve(configs)
+
+
+class SecretsProvider:
+    """Secrets from a .env file layered over os.environ, without modifying os.environ.
+
+    The file is parsed once and parsed again only when its modification time or size changes.
+    """
+
+    def __init__(self, filepath: Union[str, Path] = None):
+        filepath = Path(filepath or FILEPATH_SECRETS_DEFAULT)
+        # Only the default file may be missing, also when given as an absolute path
+        default = os.path.abspath(filepath) == os.path.abspath(FILEPATH_SECRETS_DEFAULT)
+        if not filepath.exists() and not default:
+            raise FileNotFoundError(f"File not found: {filepath}")
+        self.filepath = filepath
+        self._values: Dict[str, str] = {}
+        self._signature: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+
+    def values(self) -> Dict[str, str]:
+        """Return the secrets defined in the .env file"""
+        try:
+            stat = os.stat(self.filepath)
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            signature = None
+        with self._lock:
+            if signature != self._signature:
+                values = dotenv_values(self.filepath) if signature is not None else {}
+                self._values = {k: v for k, v in values.items() if v is not None}
+                self._signature = signature
+            return self._values
+
+    def environ(self) -> Mapping[str, str]:
+        """Return the secrets from the .env file, falling back to os.environ"""
+        return ChainMap(self.values(), os.environ)
+
+    def parse(self, configs: Any) -> Any:
+        """Parse secrets in configs, replacing placeholders in place"""
+        return compile_secrets(configs).resolve(configs, self.environ())
+
+
+_providers: Dict[Path, SecretsProvider] = {}
+_providers_lock = threading.Lock()
+
+
+def get_secrets_provider(filepath: Union[str, Path] = None) -> SecretsProvider:
+    """Return the shared SecretsProvider for a .env file"""
+    key = Path(os.path.abspath(filepath or FILEPATH_SECRETS_DEFAULT))
+    with _providers_lock:
+        provider = _providers.get(key)
+        if provider is None:
+            # Built with the absolute path, so that it keeps reading the same file after a change of directory
+            provider = _providers[key] = SecretsProvider(key)
+        return provider
@@ -0,0 +1,390 @@
+"""
+Share a merged configuration between processes without copying it.
+The configuration is encoded once into a compact read-only binary format and placed in shared memory or in a
+memory-mapped file. Other processes attach to it and read values on access: dictionaries and lists are views
+into the shared buffer, and only the scalars that are read are decoded. No process holds a copy of the tree,
+and since the buffer is never written after it is published, its pages stay shared between workers.
+"""
+
+import mmap
+import os
+import pickle
+import struct
+from collections.abc import Mapping, Sequence
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+MAGIC = b"CFGSHM\x00\x01"
+
+# The header holds the magic, the offset of the root value and the total size
+_HEADER = struct.Struct("<8sQQ")
+_OFFSET = struct.Struct("<Q")
+_COUNT = struct.Struct("<I")
+_INT = struct.Struct("<q")
+_FLOAT = struct.Struct("<d")
+# A dictionary entry holds the offset and length of the encoded key, and the offset of the value
+_ENTRY = struct.Struct("<QIQ")
+_VALUE_SLOT = 12
+_INDEX = struct.Struct("<I")
+
+_NONE = b"N"
+_TRUE = b"T"
+_FALSE = b"F"
+_INT_TAG = b"i"
+_FLOAT_TAG = b"f"
+_STR = b"s"
+_BYTES = b"b"
+_DICT = b"d"
+_LIST = b"l"
+_PICKLE = b"p"
+
+
+def encode_config(config: Any) -> bytes:
+    """
+    Encode a configuration into the shared binary format.
+    Dictionaries keep their order and a sorted index of their keys for lookups. Equal scalars, such as keys
+    repeated in many sections, are stored once. Values of other types than those produced by the parsers,
+    e.g. datetimes, are pickled.
+    """
+    buffer = bytearray(_HEADER.size)
+    scalars: Dict[bytes, int] = {}
+
+    def write_scalar(encoded: bytes) -> int:
+        offset = scalars.get(encoded)
+        if offset is None:
+            offset = scalars[encoded] = len(buffer)
+            buffer.extend(encoded)
+        return offset
+
+    # Containers are written with empty value slots, which are filled in once their values are written
+    stack: List[Tuple[Any, int]] = [(config, -1)]
+    root = 0
+    while stack:
+        value, slot = stack.pop()
+        if isinstance(value, dict):
+            # Keys are written first, so that the entries of the dictionary are contiguous
+            encoded_keys = [_encode_scalar(key) for key in value]
+            key_offsets = [write_scalar(encoded_key) for encoded_key in encoded_keys]
+            offset = len(buffer)
+            buffer.extend(_DICT + _COUNT.pack(len(value)))
+            for item, encoded_key, key_offset in zip(
+                value.values(), encoded_keys, key_offsets
+            ):
+                stack.append((item, len(buffer) + _VALUE_SLOT))
+                buffer.extend(_ENTRY.pack(key_offset, len(encoded_key), 0))
+            order = sorted(range(len(encoded_keys)), key=encoded_keys.__getitem__)
+            buffer.extend(b"".join(_INDEX.pack(i) for i in order))
+        elif isinstance(value, list):
+            offset = len(buffer)
+            buffer.extend(_LIST + _COUNT.pack(len(value)))
+            for item in value:
+                stack.append((item, len(buffer)))
+                buffer.extend(_OFFSET.pack(0))
+        else:
+            offset = write_scalar(_encode_scalar(value))
+        if slot < 0:
+            root = offset
+        else:
+            _OFFSET.pack_into(buffer, slot, offset)
+
+    _HEADER.pack_into(buffer, 0, MAGIC, root, len(buffer))
+    return bytes(buffer)
+
+
+def _encode_scalar(value: Any) -> bytes:
+    if value is None:
+        return _NONE
+    if value is True:
+        return _TRUE
+    if value is False:
+        return _FALSE
+    value_type = type(value)
+    if value_type is str:
+        data = value.encode("utf-8", "surrogatepass")
+        return _STR + _COUNT.pack(len(data)) + data
+    if value_type is int and -(2**63) <= value < 2**63:
+        return _INT_TAG + _INT.pack(value)
+    if value_type is float:
+        return _FLOAT_TAG + _FLOAT.pack(value)
+    if value_type is bytes:
+        return _BYTES + _COUNT.pack(len(value)) + value
+    data = pickle.dumps(value, protocol=5)
+    return _PICKLE + _COUNT.pack(len(data)) + data
+
+
+def _decode(buffer: memoryview, offset: int) -> Any:
+    tag = buffer[offset : offset + 1]
+    if tag == _DICT:
+        return SharedDict(buffer, offset)
+    if tag == _LIST:
+        return SharedList(buffer, offset)
+    return _decode_scalar(buffer, offset)
+
+
+def _decode_scalar(buffer: memoryview, offset: int) -> Any:
+    tag = buffer[offset : offset + 1]
+    if tag == _STR:
+        (length,) = _COUNT.unpack_from(buffer, offset + 1)
+        return str(buffer[offset + 5 : offset + 5 + length], "utf-8", "surrogatepass")
+    if tag == _INT_TAG:
+        return _INT.unpack_from(buffer, offset + 1)[0]
+    if tag == _FLOAT_TAG:
+        return _FLOAT.unpack_from(buffer, offset + 1)[0]
+    if tag == _NONE:
+        return None
+    if tag == _TRUE:
+        return True
+    if tag == _FALSE:
+        return False
+    if tag == _BYTES:
+        (length,) = _COUNT.unpack_from(buffer, offset + 1)
+        return bytes(buffer[offset + 5 : offset + 5 + length])
+    if tag == _PICKLE:
+        (length,) = _COUNT.unpack_from(buffer, offset + 1)
+        return pickle.loads(buffer[offset + 5 : offset + 5 + length])
+    raise ValueError(f"Corrupt shared configuration: unknown tag {tag!r} at {offset}")
+
+
+class SharedDict(Mapping):
+    """
+    A read-only dictionary view into a shared configuration.
+    Keys are found by binary search over the sorted index, and values are decoded on access.
+    """
+
+    __slots__ = ("_buffer", "_offset", "_length")
+
+    def __init__(self, buffer: memoryview, offset: int):
+        self._buffer = buffer
+        self._offset = offset
+        (self._length,) = _COUNT.unpack_from(buffer, offset + 1)
+
+    def _entry(self, i: int) -> Tuple[int, int, int]:
+        return _ENTRY.unpack_from(self._buffer, self._offset + 5 + i * _ENTRY.size)
+
+    def __getitem__(self, key: Any) -> Any:
+        try:
+            encoded = _encode_scalar(key)
+        except Exception:
+            raise KeyError(key) from None
+        buffer = self._buffer
+        index_offset = self._offset + 5 + self._length * _ENTRY.size
+        low, high = 0, self._length
+        while low < high:
+            middle = (low + high) // 2
+            (i,) = _INDEX.unpack_from(buffer, index_offset + middle * _INDEX.size)
+            key_offset, key_length, value_offset = self._entry(i)
+            probe = buffer[key_offset : key_offset + key_length]
+            if probe == encoded:
+                return _decode(buffer, value_offset)
+            if probe.tobytes() < encoded:
+                low = middle + 1
+            else:
+                high = middle
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[Any]:
+        for i in range(self._length):
+            key_offset, _, _ = self._entry(i)
+            yield _decode_scalar(self._buffer, key_offset)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __repr__(self) -> str:
+        return f"SharedDict({len(self)} keys)"
+
+    def items(self):
+        buffer = self._buffer
+        return [
+            (_decode_scalar(buffer, key_offset), _decode(buffer, value_offset))
+            for key_offset, _, value_offset in (
+                self._entry(i) for i in range(self._length)
+            )
+        ]
+
+    def to_dict(self) -> dict:
+        """
+        Copy the dictionary and everything below it into ordinary dictionaries and lists.
+        """
+        return _materialize(self)
+
+
+class SharedList(Sequence):
+    """
+    A read-only list view into a shared configuration. Items are decoded on access.
+    """
+
+    __slots__ = ("_buffer", "_offset", "_length")
+
+    def __init__(self, buffer: memoryview, offset: int):
+        self._buffer = buffer
+        self._offset = offset
+        (self._length,) = _COUNT.unpack_from(buffer, offset + 1)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("SharedList index out of range")
+        (offset,) = _OFFSET.unpack_from(self._buffer, self._offset + 5 + index * 8)
+        return _decode(self._buffer, offset)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, SharedList)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"SharedList({len(self)} items)"
+
+    def to_list(self) -> list:
+        """
+        Copy the list and everything below it into ordinary lists and dictionaries.
+        """
+        return _materialize(self)
+
+
+def _materialize(view: Union[SharedDict, SharedList]) -> Any:
+    result = {} if isinstance(view, SharedDict) else []
+    stack = [(view, result)]
+    while stack:
+        source, target = stack.pop()
+        items = source.items() if isinstance(source, SharedDict) else enumerate(source)
+        for key, value in items:
+            if isinstance(value, (SharedDict, SharedList)):
+                copy = {} if isinstance(value, SharedDict) else []
+                stack.append((value, copy))
+                value = copy
+            if isinstance(target, dict):
+                target[key] = value
+            else:
+                target.append(value)
+    return result
+
+
+class SharedConfig:
+    """
+    A configuration published to shared memory or to a memory-mapped file.
+    The publishing process owns the segment or file and should unlink() it when the workers are done.
+    Attaching processes read the configuration through root without copying it.
+    """
+
+    def __init__(
+        self,
+        buffer: memoryview,
+        path: Optional[Path] = None,
+        name: Optional[str] = None,
+        shm: Optional[shared_memory.SharedMemory] = None,
+        mapping: Optional[mmap.mmap] = None,
+    ):
+        if len(buffer) < _HEADER.size:
+            raise ValueError("Not a shared configuration")
+        magic, root, size = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or size > len(buffer):
+            raise ValueError("Not a shared configuration")
+        self._base = buffer
+        # Shared memory segments may be rounded up to a whole number of pages
+        self._buffer = buffer[:size]
+        self.path = path
+        self.name = name
+        self._shm = shm
+        self._mmap = mapping
+        self.root = _decode(self._buffer, root)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._buffer)
+
+    @classmethod
+    def publish(
+        cls,
+        config: Any,
+        path: Union[str, Path, None] = None,
+        name: Optional[str] = None,
+    ) -> "SharedConfig":
+        """
+        Encode a configuration and publish it to a file at path, or else to a shared memory segment.
+        The segment gets the given name, or a generated one available as the name attribute.
+        """
+        data = encode_config(config)
+        if path is not None:
+            path = Path(path)
+            temporary_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            with open(temporary_path, "wb") as file:
+                file.write(data)
+            os.replace(temporary_path, path)
+            return cls.attach(path=path)
+
+        shm = shared_memory.SharedMemory(name=name, create=True, size=len(data))
+        shm.buf[: len(data)] = data
+        return cls(shm.buf, name=shm.name, shm=shm)
+
+    @classmethod
+    def attach(
+        cls, path: Union[str, Path, None] = None, name: Optional[str] = None
+    ) -> "SharedConfig":
+        """
+        Attach to a configuration published to the file at path or to the named shared memory segment.
+        """
+        if path is not None:
+            path = Path(path)
+            with open(path, "rb") as file:
+                mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            return cls(memoryview(mapping), path=path, mapping=mapping)
+        if name is None:
+            raise ValueError("Either path or name is required")
+        segment = _attach_shared_memory(name)
+        if isinstance(segment, mmap.mmap):
+            return cls(memoryview(segment), name=name, mapping=segment)
+        return cls(segment.buf, name=name, shm=segment)
+
+    def close(self):
+        """
+        Detach from the configuration. Views obtained from it must not be used afterwards.
+        """
+        self.root = None
+        self._buffer.release()
+        self._base.release()
+        if self._shm is not None:
+            self._shm.close()
+        if self._mmap is not None:
+            self._mmap.close()
+
+    def unlink(self):
+        """
+        Remove the shared memory segment or file, once no process needs to attach to it any more.
+        A shared memory segment can only be removed by the SharedConfig that published it.
+        """
+        if self._shm is not None:
+            self._shm.unlink()
+        elif self.path is not None:
+            self.path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "SharedConfig":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _attach_shared_memory(name: str) -> Union[mmap.mmap, shared_memory.SharedMemory]:
+    """
+    Map a shared memory segment read-only. On POSIX systems, SharedMemory would register the segment with the
+    resource tracker, which unlinks it when the attaching process exits even though the publisher owns it,
+    so the segment is opened directly.
+    """
+    if os.name != "posix":
+        return shared_memory.SharedMemory(name=name)
+    import _posixshmem
+
+    fd = _posixshmem.shm_open("/" + name.lstrip("/"), os.O_RDONLY)
+    try:
+        return mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    finally:
+        os.close(fd)
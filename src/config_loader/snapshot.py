@@ -0,0 +1,139 @@
+"""
+Persistent snapshots of merged configurations.
+A snapshot stores the merged configurations together with a content hash of every file that contributed to them,
+including the fragments they include, a hash of the environment variables that override their values, and the
+loader options they were loaded with. While none of these change, later runs read the snapshot instead of
+importing the parsers and merging again.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+Sources = List[Tuple[Optional[Path], ...]]
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 6
+
+
+def hash_environment(environment: Optional[Dict[str, str]]) -> Optional[str]:
+    """
+    Return a hash of environment variables, so that their values, which may be secrets, are not stored.
+    """
+    if not environment:
+        return None
+    data = "\0".join(f"{name}={value}" for name, value in sorted(environment.items()))
+    return hashlib.blake2b(data.encode(), digest_size=16).hexdigest()
+
+
+def hash_file(filepath: Optional[Path]) -> Optional[str]:
+    """
+    Return the content hash of a file, or None if there is no such file.
+    """
+    if filepath is None:
+        return None
+    try:
+        with open(filepath, "rb") as file:
+            return hashlib.blake2b(file.read(), digest_size=16).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+class ConfigSnapshot:
+    """
+    A binary snapshot of merged configurations, keyed on the content of their source files.
+    The snapshot is a pickle file and must be kept in a location only trusted processes can write to.
+    """
+
+    def __init__(self, filepath: Union[str, Path]):
+        self.filepath = Path(filepath)
+
+    def fingerprint(
+        self, sources: Sources
+    ) -> List[Tuple[Tuple[Optional[str], Optional[str]], ...]]:
+        """
+        Return the paths and content hashes of each user file, its default file and its layer files.
+        """
+        return [
+            tuple(
+                (str(filepath) if filepath is not None else None, hash_file(filepath))
+                for filepath in source
+            )
+            for source in sources
+        ]
+
+    def read(
+        self,
+        sources: Sources,
+        environment: Optional[Dict[str, str]] = None,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Any]:
+        """
+        Return the snapshotted configurations, or None if the snapshot is missing or any source or fragment
+        has changed, or the overriding environment variables or the loader options differ.
+        """
+        try:
+            with open(self.filepath, "rb") as file:
+                snapshot = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception as error:
+            logger.warning(f"Ignoring unreadable snapshot {self.filepath}: {error}")
+            return None
+
+        if (
+            not isinstance(snapshot, dict)
+            or snapshot.get("format") != SNAPSHOT_FORMAT
+            or snapshot.get("sources") != self.fingerprint(sources)
+            or snapshot.get("environment") != hash_environment(environment)
+            or snapshot.get("options") != (options or {})
+        ):
+            return None
+        # Fragments are only known once the configurations are loaded, so they are listed in the snapshot itself
+        for filepath, digest in snapshot.get("fragments", ()):
+            if hash_file(Path(filepath)) != digest:
+                return None
+        return snapshot["configs"]
+
+    def write(
+        self,
+        sources: Sources,
+        configs: Any,
+        fragments: Sequence[Path] = (),
+        environment: Optional[Dict[str, str]] = None,
+        options: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Write the configurations and the fingerprint of their sources, included fragments, overriding
+        environment variables and loader options to the snapshot file.
+        """
+        snapshot = {
+            "format": SNAPSHOT_FORMAT,
+            "sources": self.fingerprint(sources),
+            "fragments": [
+                (str(filepath), hash_file(filepath)) for filepath in fragments
+            ],
+            "environment": hash_environment(environment),
+            "options": options or {},
+            "configs": configs,
+        }
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        temporary_filepath = self.filepath.with_name(
+            f"{self.filepath.name}.{os.getpid()}.tmp"
+        )
+        with open(temporary_filepath, "wb") as file:
+            pickle.dump(snapshot, file, protocol=5)
+        os.replace(temporary_filepath, self.filepath)
+
+    def invalidate(self):
+        """
+        Remove the snapshot file so the next load rebuilds it.
+        """
+        try:
+            self.filepath.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,153 @@
+"""
+Instrumentation for the load pipeline.
+A ConfigLoader given a stats object reports the wall time of every phase of loading each file,
+along with the bytes read and the number of nodes parsed. Without one, no timing is done at all.
+"""
+
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+PHASES = (
+    "check",
+    "snapshot",
+    "defaults",
+    "cache",
+    "read",
+    "parse",
+    "include",
+    "merge",
+    "override",
+    "reference",
+    "intern",
+    "validate",
+    "secrets",
+    "bind",
+    "index",
+)
+
+
+@dataclass
+class PhaseRecord:
+    """
+    The cost of one phase of loading one file.
+    """
+
+    phase: str
+    filepath: Optional[str]
+    seconds: float
+    nbytes: int = 0
+    nodes: int = 0
+
+
+def count_nodes(value: Any) -> int:
+    """
+    Count the dictionaries, lists and values in a parsed document.
+    """
+    count = 0
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        count += 1
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+    return count
+
+
+class LoadStats:
+    """
+    Collect PhaseRecords from one or more loads and summarize them.
+    Subclass and override record() to forward the measurements elsewhere, e.g. to a metrics client.
+    """
+
+    def __init__(self):
+        self.records: List[PhaseRecord] = []
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        phase: str,
+        filepath: Union[str, Path, None],
+        seconds: float,
+        nbytes: int = 0,
+        nodes: int = 0,
+    ):
+        """
+        Record the cost of one phase of loading a file.
+        """
+        record = PhaseRecord(
+            phase,
+            str(filepath) if filepath is not None else None,
+            seconds,
+            nbytes,
+            nodes,
+        )
+        with self._lock:
+            self.records.append(record)
+
+    @contextmanager
+    def measure(self, phase: str, filepath: Union[str, Path, None]) -> Iterator[None]:
+        """
+        Record the wall time of a block as one phase of loading a file, also if the block raises.
+        """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, filepath, perf_counter() - start)
+
+    def reset(self):
+        """
+        Discard all records.
+        """
+        with self._lock:
+            self.records.clear()
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Return the totals per phase and per file, and the overall total.
+        """
+        with self._lock:
+            records = list(self.records)
+
+        def totals() -> Dict[str, Any]:
+            return {"seconds": 0.0, "calls": 0, "bytes": 0, "nodes": 0}
+
+        phases: Dict[str, Dict[str, Any]] = {}
+        files: Dict[str, Dict[str, Any]] = {}
+        total = totals()
+        for record in records:
+            targets = [phases.setdefault(record.phase, totals()), total]
+            if record.filepath is not None:
+                targets.append(files.setdefault(record.filepath, totals()))
+            for target in targets:
+                target["seconds"] += record.seconds
+                target["calls"] += 1
+                target["bytes"] += record.nbytes
+                target["nodes"] += record.nodes
+        ordered = {phase: phases[phase] for phase in PHASES if phase in phases}
+        ordered.update(phases)
+        return {"phases": ordered, "files": files, "total": total}
+
+    def log(self, log: logging.Logger = logger, level: int = logging.INFO):
+        """
+        Log the summary as a single structured record, available as the 'config_load_stats' attribute.
+        """
+        summary = self.summary()
+        phases = ", ".join(
+            f"{phase}={totals['seconds'] * 1000:.2f}ms"
+            for phase, totals in summary["phases"].items()
+        )
+        log.log(
+            level,
+            f"Config load took {summary['total']['seconds'] * 1000:.2f}ms ({phases})",
+            extra={"config_load_stats": summary},
+        )
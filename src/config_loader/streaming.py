@@ -0,0 +1,234 @@
+"""
+Load only selected subtrees of a configuration file.
+JSON files are memory-mapped and scanned without being decoded. Every value outside the selection is skipped
+by matching its extent, and only the selected values are parsed, so memory use follows the size of the selection
+rather than the size of the file. Other formats are parsed in full and the selection is extracted afterwards.
+"""
+
+import mmap
+import re
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Tuple, Union
+
+KeyPath = Tuple[str, ...]
+
+# A tree of selected key paths. An empty node selects the whole value at its path
+Selection = Dict[str, "Selection"]
+
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_SCALAR = re.compile(rb"[^\s,\]}]+")
+# Everything up to the next bracket, with strings consumed whole so that brackets inside them are ignored
+_SKIP = re.compile(rb'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*', re.DOTALL)
+_OPENING = b"{["
+_CLOSING = b"}]"
+
+
+class _Malformed(ValueError):
+    pass
+
+
+def compile_selection(paths: Iterable[Union[str, KeyPath]]) -> Selection:
+    """
+    Build the selection tree for dotted key paths, or key paths given as tuples.
+    A path that is a prefix of another selects the whole subtree, so the longer path is dropped.
+    """
+    selection: Selection = {}
+    for path in paths:
+        if isinstance(path, str):
+            keys = tuple(path.split(".")) if path else ()
+        else:
+            keys = tuple(path)
+        if not keys:
+            raise ValueError("Cannot select an empty key path")
+        node = selection
+        for i, key in enumerate(keys):
+            if key in node and not node[key]:
+                break
+            if i == len(keys) - 1:
+                node[key] = {}
+            else:
+                node = node.setdefault(key, {})
+    return selection
+
+
+def select_tree(config: Any, selection: Selection) -> dict:
+    """
+    Return the selected subtrees of a parsed configuration, nested under their key paths.
+    Selected keys that are missing, or whose parent is not a dictionary, are left out.
+    """
+    if not isinstance(config, dict):
+        return {}
+    selected: dict = {}
+    created = []
+    stack = [(selected, config, selection)]
+    while stack:
+        target, source, node = stack.pop()
+        for key, children in node.items():
+            if key not in source:
+                continue
+            value = source[key]
+            if not children:
+                target[key] = value
+            elif isinstance(value, dict):
+                target[key] = {}
+                created.append((target, key))
+                stack.append((target[key], value, children))
+    # Drop the intermediate dictionaries under which nothing was found, innermost first
+    for target, key in reversed(created):
+        if not target[key]:
+            del target[key]
+    return selected
+
+
+def select_json(
+    data: Union[bytes, mmap.mmap], selection: Selection, loads: Callable[[bytes], Any]
+) -> dict:
+    """
+    Scan a JSON document and parse only the selected values with loads.
+    Intermediate objects on a selected path are rebuilt with just their selected keys.
+    """
+    pos = _WHITESPACE.match(data, 0).end()
+    if data[pos : pos + 1] != b"{":
+        return {}
+    selected: dict = {}
+    _select_object(data, pos, selection, selected, loads)
+    return selected
+
+
+def load_selected(
+    filepath: Path, selection: Selection, loads: Callable[[bytes], Any]
+) -> Tuple[dict, int]:
+    """
+    Load the selected subtrees of a file. JSON files are memory-mapped and scanned, other formats are parsed whole.
+    Returns the selected tree and the number of bytes parsed.
+    """
+    if filepath.suffix != ".json":
+        with open(filepath, "rb") as file:
+            data = file.read()
+        return select_tree(loads(data), selection), len(data)
+
+    with open(filepath, "rb") as file:
+        try:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # An empty file cannot be mapped
+            return {}, 0
+    with data:
+        parsed = _ParsedBytes(loads)
+        try:
+            selected = select_json(data, selection, parsed)
+        except _Malformed as error:
+            raise ValueError(f"Malformed JSON in {filepath}: {error}") from None
+    return selected, parsed.nbytes
+
+
+class _ParsedBytes:
+    """
+    Count the bytes passed to a parser.
+    """
+
+    def __init__(self, loads: Callable[[bytes], Any]):
+        self.loads = loads
+        self.nbytes = 0
+
+    def __call__(self, data: bytes) -> Any:
+        self.nbytes += len(data)
+        return self.loads(data)
+
+
+def _select_object(
+    data, pos: int, selection: Selection, target: dict, loads: Callable[[bytes], Any]
+) -> int:
+    """
+    Scan the object starting at pos into target and return the position after it.
+    Once every selected key has been found, the rest of the object is skipped, so if a selected key
+    occurs more than once, the first occurrence is used.
+    """
+    found = set()
+    pos = _WHITESPACE.match(data, pos + 1).end()
+    if data[pos : pos + 1] == b"}":
+        return pos + 1
+    while True:
+        match = _STRING.match(data, pos)
+        if match is None:
+            raise _Malformed(f"Expected a key at byte {pos}")
+        key = _decode_key(match.group(), loads)
+        pos = _WHITESPACE.match(data, match.end()).end()
+        if data[pos : pos + 1] != b":":
+            raise _Malformed(f"Expected ':' at byte {pos}")
+        pos = _WHITESPACE.match(data, pos + 1).end()
+
+        children = selection.get(key)
+        if children is None:
+            pos = _skip(data, pos)
+        else:
+            found.add(key)
+            if not children:
+                end = _skip(data, pos)
+                target[key] = loads(data[pos:end])
+                pos = end
+            elif data[pos : pos + 1] == b"{":
+                target[key] = {}
+                pos = _select_object(data, pos, children, target[key], loads)
+                if not target[key]:
+                    del target[key]
+            else:
+                pos = _skip(data, pos)
+
+        pos = _WHITESPACE.match(data, pos).end()
+        separator = data[pos : pos + 1]
+        if separator == b"}":
+            return pos + 1
+        if separator != b",":
+            raise _Malformed(f"Expected ',' or '}}' at byte {pos}")
+        if len(found) == len(selection):
+            return _skip_to_close(data, pos + 1, 1)
+        pos = _WHITESPACE.match(data, pos + 1).end()
+
+
+def _skip(data, pos: int) -> int:
+    """
+    Return the position after the value starting at pos, without decoding it.
+    """
+    first = data[pos : pos + 1]
+    if first == b'"':
+        match = _STRING.match(data, pos)
+        if match is None:
+            raise _Malformed(f"Unterminated string at byte {pos}")
+        return match.end()
+    if first not in (b"{", b"["):
+        match = _SCALAR.match(data, pos)
+        if match is None:
+            raise _Malformed(f"Expected a value at byte {pos}")
+        return match.end()
+
+    return _skip_to_close(data, pos + 1, 1)
+
+
+def _skip_to_close(data, pos: int, depth: int) -> int:
+    """
+    Return the position after the bracket that closes the innermost of depth open brackets, scanning from pos.
+    """
+    match = _SKIP.match
+    try:
+        while True:
+            pos = match(data, pos).end()
+            bracket = data[pos]
+            if bracket in _OPENING:
+                depth += 1
+            elif bracket in _CLOSING:
+                depth -= 1
+                if depth == 0:
+                    return pos + 1
+            else:
+                raise _Malformed(f"Unterminated string at byte {pos}")
+            pos += 1
+    except IndexError:
+        raise _Malformed("Unexpected end of JSON document") from None
+
+
+def _decode_key(key: bytes, loads: Callable[[bytes], Any]) -> str:
+    if b"\\" in key:
+        return loads(key)
+    return key[1:-1].decode()
@@ -0,0 +1,323 @@
+"""
+Watch configuration files for changes and reload only the configurations that changed.
+Subscribers are notified with the key paths that differ between the previous and the reloaded configuration.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import sys
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Iterable, List, Optional, Set, Tuple, Union
+
+from .config_loader import ConfigLoader
+
+logger = logging.getLogger(__name__)
+
+KeyPath = Tuple[Any, ...]
+Callback = Callable[[List[KeyPath], Any], None]
+
+
+def diff_configs(old: Any, new: Any) -> List[KeyPath]:
+    """
+    Return the key paths whose values differ between two configurations.
+    Nested dictionaries are compared key by key; any other value is compared as a whole.
+    """
+    changes = []
+    queue = deque([((), old, new)])
+    while queue:
+        path, old_value, new_value = queue.popleft()
+        if old_value is new_value:
+            continue
+        if isinstance(old_value, dict) and isinstance(new_value, dict):
+            for key, value in old_value.items():
+                if key not in new_value:
+                    changes.append(path + (key,))
+                else:
+                    queue.append((path + (key,), value, new_value[key]))
+            for key in new_value:
+                if key not in old_value:
+                    changes.append(path + (key,))
+        elif type(old_value) is not type(new_value) or old_value != new_value:
+            changes.append(path)
+    return changes
+
+
+def _signature(filepath: Optional[Path]) -> Optional[Tuple[int, int, int]]:
+    if filepath is None:
+        return None
+    try:
+        stat = os.stat(filepath)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+class _InotifyWaiter:
+    """
+    Block until a file changes in one of the watched directories, using inotify.
+    Directories can be added while watching, e.g. those of the fragments or layers of a reloaded configuration.
+    """
+
+    IN_MODIFY = 0x002
+    IN_ATTRIB = 0x004
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    MASK = (
+        IN_MODIFY
+        | IN_ATTRIB
+        | IN_CLOSE_WRITE
+        | IN_MOVED_FROM
+        | IN_MOVED_TO
+        | IN_CREATE
+        | IN_DELETE
+    )
+
+    def __init__(self, directories: Iterable[Path]):
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._directories: Set[Path] = set()
+        try:
+            self.watch(directories)
+        except OSError:
+            self.close()
+            raise
+
+    def watch(self, directories: Iterable[Path]):
+        """
+        Watch the directories not watched yet.
+        """
+        for directory in directories:
+            if directory in self._directories:
+                continue
+            path = os.fsencode(directory)
+            if self._libc.inotify_add_watch(self._fd, path, self.MASK) < 0:
+                error = ctypes.get_errno()
+                raise OSError(error, f"inotify_add_watch failed for {directory}")
+            self._directories.add(directory)
+
+    def wait(self, timeout: float) -> bool:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return False
+        # Drain the pending events, the watcher stats the files itself
+        try:
+            while os.read(self._fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class _PollingWaiter:
+    """
+    Sleep for the polling interval between checks.
+    """
+
+    def __init__(self, stopped: threading.Event):
+        self._stopped = stopped
+
+    def wait(self, timeout: float) -> bool:
+        self._stopped.wait(timeout)
+        return True
+
+    def watch(self, directories: Iterable[Path]):
+        pass
+
+    def close(self):
+        pass
+
+
+class ConfigWatcher:
+    """
+    Watch the files of a ConfigLoader, including their defaults and fragments, and reload configurations when they change.
+    Only the configurations whose files changed are reloaded, and subscribers are called with the changed key paths.
+    Key paths are relative to the value returned by ConfigLoader.load(), so they start with the file stem
+    when the loader was given multiple filepaths.
+    Secrets are parsed with the secrets file, as by load_configs, before configurations are compared.
+    """
+
+    def __init__(
+        self,
+        loader: ConfigLoader,
+        interval: float = 1.0,
+        use_inotify: bool = True,
+        secrets_filepath: Union[str, Path, None] = None,
+    ):
+        self.loader = loader
+        self.interval = interval
+        self.use_inotify = use_inotify
+        self.secrets_filepath = secrets_filepath
+        self._single = len(loader.filepaths) == 1
+        self._callbacks: List[Callback] = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # The waiter of the background thread, while it runs
+        self._active_waiter: Any = None
+
+        self.configs = loader._parse_secrets(loader.load(), secrets_filepath)
+        self._signatures = {
+            filepath: self._stat_sources(filepath) for filepath in loader.filepaths
+        }
+
+    def subscribe(self, callback: Callback) -> Callback:
+        """
+        Register callback(changed_paths, configs) to be called after a change is reloaded.
+        """
+        self._callbacks.append(callback)
+        return callback
+
+    def unsubscribe(self, callback: Callback):
+        self._callbacks.remove(callback)
+
+    def check(self) -> List[KeyPath]:
+        """
+        Reload the configurations whose files changed since the last check and notify subscribers.
+        Returns the changed key paths.
+        """
+        with self._lock:
+            self.loader._refresh()
+            changes = []
+            for filepath in self.loader.filepaths:
+                signature = self._stat_sources(filepath)
+                if signature != self._signatures[filepath]:
+                    changes.extend(self._reload(filepath, signature))
+            if changes and self._active_waiter is not None:
+                # A reload may include fragments or layers from directories that are not watched yet
+                try:
+                    self._active_waiter.watch(self._directories())
+                except OSError as error:
+                    logger.warning(f"Failed to watch new directories: {error}")
+
+        if changes:
+            for callback in list(self._callbacks):
+                try:
+                    callback(changes, self.configs)
+                except Exception:
+                    logger.exception(f"Config watcher callback {callback} failed")
+        return changes
+
+    def start(self) -> "ConfigWatcher":
+        """
+        Start watching in a background thread.
+        """
+        if self._thread is not None:
+            return self
+        self._stopped.clear()
+        # Set up the waiter before returning, so no change made after start() is missed
+        waiter = self._active_waiter = self._waiter()
+        self._thread = threading.Thread(
+            target=self._run, args=(waiter,), name="ConfigWatcher", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop the background thread.
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "ConfigWatcher":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _run(self, waiter):
+        try:
+            while not self._stopped.is_set():
+                changed = waiter.wait(self.interval)
+                if self._stopped.is_set():
+                    break
+                if not changed:
+                    continue
+                try:
+                    self.check()
+                except Exception:
+                    logger.exception("Config watcher check failed")
+        finally:
+            with self._lock:
+                self._active_waiter = None
+                waiter.close()
+
+    def _waiter(self):
+        if self.use_inotify and sys.platform.startswith("linux"):
+            try:
+                return _InotifyWaiter(self._directories())
+            except (OSError, AttributeError) as error:
+                logger.info(f"inotify unavailable, polling for changes: {error}")
+        return _PollingWaiter(self._stopped)
+
+    def _directories(self) -> List[Path]:
+        # The existing directories of every source, including the fragments included by the last load
+        directories = {filepath.parent for filepath in self.loader.filepaths}
+        directories.add(self.loader.default_directory)
+        directories.update(self.loader.layers)
+        for layer_paths in (self.loader._layer_files or {}).values():
+            directories.update(layer_path.parent for layer_path in layer_paths)
+        for fragments in self.loader.fragments.values():
+            directories.update(fragment.parent for fragment in fragments)
+        return [directory for directory in directories if directory.is_dir()]
+
+    def _stat_sources(self, filepath: Path) -> Tuple[Any, ...]:
+        # The default is looked up again so that a default created or removed later is picked up
+        default_filepath = self.loader._find_default(filepath)
+        layer_filepaths = self.loader._find_layers(filepath)
+        # The fragments included by the last load, so that a change to a fragment reloads every file including it
+        fragments = self.loader.fragments.get(filepath.stem, ())
+        return (
+            _signature(filepath),
+            default_filepath,
+            _signature(default_filepath),
+            *(
+                (layer_filepath, _signature(layer_filepath))
+                for layer_filepath in layer_filepaths
+            ),
+            *((fragment, _signature(fragment)) for fragment in fragments),
+        )
+
+    def _reload(self, filepath: Path, signature: Tuple[Any, ...]) -> List[KeyPath]:
+        if signature[0] is None and signature[2] is None:
+            logger.warning(
+                f"File not found: {filepath}, also no defaults found in {self.loader.default_directory}. "
+                "Keeping the previous configuration."
+            )
+            return []
+        try:
+            new_config = self.loader._parse_secrets(
+                self.loader._load_config(filepath), self.secrets_filepath, filepath
+            )
+        except Exception:
+            logger.exception(
+                f"Failed to reload {filepath}, keeping the previous configuration"
+            )
+            return []
+        self._signatures[filepath] = signature
+
+        if self._single:
+            changes = diff_configs(self.configs, new_config)
+            self.configs = new_config
+            return changes
+        stem = filepath.stem
+        changes = diff_configs(self.configs[stem], new_config)
+        self.configs[stem] = new_config
+        return [(stem,) + path for path in changes]
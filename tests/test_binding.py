@@ -0,0 +1,189 @@
+import datetime
+import enum
+import pickle
+from dataclasses import dataclass, field
+from typing import Dict, List, Literal, Optional, Tuple, Union
+
+import pytest
+
+from config_loader import (
+    BoundConfig,
+    ConfigValidationError,
+    LoadStats,
+    bind,
+    load_configs,
+)
+from config_loader.binding import bound_class
+
+
+class Level(enum.Enum):
+    DEBUG = "debug"
+    INFO = "info"
+
+
+@dataclass
+class Pool:
+    size: int
+    timeout: float = 10.0
+
+
+@dataclass
+class Database:
+    host: str
+    pool: Pool
+    replicas: List[str] = field(default_factory=list)
+    password: Optional[str] = None
+    since: Optional[datetime.date] = None
+
+
+@dataclass
+class App:
+    database: Database
+    mode: Literal["dev", "prod"] = "dev"
+    debug: bool = False
+    level: Level = Level.INFO
+    limits: Dict[str, int] = field(default_factory=dict)
+    port: Union[int, str] = 80
+
+
+@dataclass
+class Node:
+    name: str
+    children: List["Node"] = field(default_factory=list)
+
+
+CONFIG = {
+    "database": {
+        "host": "localhost",
+        "pool": {"size": "5", "timeout": 30},
+        "replicas": ["a", "b"],
+        "since": "2024-01-02",
+    },
+    "debug": "yes",
+    "level": "debug",
+    "limits": {"cpu": 2.0},
+}
+
+
+def test_bind_and_coerce():
+    app = bind(CONFIG, App)
+
+    assert app.database.pool.size == 5
+    assert app.database.pool.timeout == 30.0
+    assert isinstance(app.database.pool.timeout, float)
+    assert app.database.replicas == ("a", "b")
+    assert app.database.password is None
+    assert app.database.since == datetime.date(2024, 1, 2)
+    assert app.debug is True
+    assert app.level is Level.DEBUG
+    assert app.limits == {"cpu": 2}
+    assert app.mode == "dev"
+    assert app.port == 80
+
+
+def test_compact_and_read_only():
+    app = bind(CONFIG, App)
+    assert isinstance(app, BoundConfig)
+    assert type(app) is bound_class(App)
+    assert type(app).__name__ == "App"
+    assert not hasattr(app, "__dict__")
+    with pytest.raises(AttributeError):
+        app.debug = False
+    with pytest.raises(AttributeError):
+        app.database.extra = 1
+
+
+def test_round_trip():
+    app = bind(CONFIG, App)
+    assert bind(app.to_dict(), App) == app
+    assert pickle.loads(pickle.dumps(app)) == app
+    assert app.to_dict()["database"]["replicas"] == ["a", "b"]
+    assert repr(app.database.pool) == "Pool(size=5, timeout=30.0)"
+
+
+def test_violations():
+    with pytest.raises(ConfigValidationError) as error:
+        bind(
+            {
+                "database": {"pool": {"size": "many"}, "replicas": ["a", 1.5, None]},
+                "mode": "test",
+                "debug": "maybe",
+                "extra": True,
+            },
+            App,
+        )
+    assert [str(violation) for violation in error.value.violations] == [
+        "database.host: required key is missing",
+        "database.pool.size: cannot convert 'many' to integer",
+        "database.replicas.2: expected string, got null",
+        "mode: must be one of ['dev', 'prod']",
+        "debug: cannot convert 'maybe' to boolean",
+        "extra: unexpected key",
+    ]
+    with pytest.raises(ConfigValidationError):
+        bind(["not", "a", "dict"], App)
+    with pytest.raises(TypeError):
+        bind({}, dict)
+
+
+def test_recursive_model():
+    tree = bind(
+        {"name": "a", "children": [{"name": "b", "children": [{"name": "c"}]}]}, Node
+    )
+    assert tree.children[0].children[0].name == "c"
+
+
+@dataclass(frozen=True)
+class Replica:
+    host: str = "replica"
+    ports: Tuple[int, ...] = (5432,)
+
+
+@dataclass
+class Cluster:
+    name: str
+    pool: Pool = field(default_factory=lambda: Pool(size=5))
+    replica: Replica = Replica()
+
+
+def test_nested_defaults():
+    bound = bind({"name": "main"}, Cluster)
+    assert bound.pool == Pool(size=5, timeout=10.0)
+    assert bound.replica == Replica()
+    assert bound.to_dict() == {
+        "name": "main",
+        "pool": {"size": 5, "timeout": 10.0},
+        "replica": {"host": "replica", "ports": [5432]},
+    }
+    assert pickle.loads(pickle.dumps(bound)).to_dict() == bound.to_dict()
+
+
+def test_load_configs_with_model(tmp_path):
+    default_directory = tmp_path / "default"
+    default_directory.mkdir()
+    (default_directory / "app-default.yaml").write_text(
+        "database:\n  host: localhost\n  pool:\n    size: 5\n"
+    )
+    filepath = tmp_path / "app.yaml"
+    filepath.write_text(
+        "database:\n  password: ${DB_PASSWORD}\n  pool:\n    size: many\n"
+    )
+
+    with pytest.raises(ConfigValidationError) as error:
+        load_configs(filepath, default_directory, model=App)
+    assert error.value.stem == "app"
+    assert error.value.violations[0].source == str(filepath)
+
+    filepath.write_text(
+        "database:\n  password: ${DB_PASSWORD}\n  pool:\n    size: '10'\n"
+    )
+    stats = LoadStats()
+    app = load_configs(filepath, default_directory, model=App, stats=stats)
+    assert app.database.pool.size == 10
+    assert app.database.password == "secret_pass"
+    assert "bind" in stats.summary()["phases"]
+
+    lazy = load_configs(filepath, default_directory, model={"app": App}, lazy=True)
+    assert lazy["app"] == app
+    with pytest.raises(ValueError):
+        load_configs(filepath, default_directory, model=App, flat=True)
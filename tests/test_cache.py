@@ -0,0 +1,82 @@
+import os
+
+from config_loader import ConfigLoader, ParsedFileCache
+from conftest import config_file_mapping
+
+
+def test_cache_hit_skips_parsing():
+    cache = ParsedFileCache()
+    first = ConfigLoader(config_file_mapping["yaml"], cache=cache).load()
+    misses = cache.misses
+    second = ConfigLoader(config_file_mapping["yaml"], cache=cache).load()
+
+    assert first == second
+    assert cache.misses == misses
+    assert cache.hits >= 1
+
+
+def test_cache_returns_copies():
+    cache = ParsedFileCache()
+    config = ConfigLoader(config_file_mapping["json"], cache=cache).load()
+    config["settings"]["nested_dict"]["inner_list"].append(4)
+    config["name"] = "Changed"
+
+    config = ConfigLoader(config_file_mapping["json"], cache=cache).load()
+    assert config["name"] == "Example"
+    assert config["settings"]["nested_dict"]["inner_list"] == [1, 2, 3]
+
+
+def test_cache_detects_changed_file(tmp_path):
+    cache = ParsedFileCache()
+    filepath = tmp_path / "app.json"
+    filepath.write_text('{"value": 1}')
+    assert cache.get(filepath, ConfigLoader([])._parse_file) == {"value": 1}
+
+    filepath.write_text('{"value": 22}')
+    stat = filepath.stat()
+    os.utime(filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert cache.get(filepath, ConfigLoader([])._parse_file) == {"value": 22}
+    assert cache.misses == 2
+
+
+def test_cache_lru_eviction(tmp_path):
+    cache = ParsedFileCache(max_entries=2)
+    parse = ConfigLoader([])._parse_file
+    filepaths = []
+    for i in range(3):
+        filepath = tmp_path / f"file{i}.json"
+        filepath.write_text(f'{{"value": {i}}}')
+        filepaths.append(filepath)
+
+    cache.get(filepaths[0], parse)
+    cache.get(filepaths[1], parse)
+    cache.get(filepaths[0], parse)
+    cache.get(filepaths[2], parse)
+
+    assert len(cache) == 2
+    cache.get(filepaths[0], parse)
+    assert cache.hits == 2
+    cache.get(filepaths[1], parse)
+    assert cache.misses == 4
+
+
+def test_cache_byte_budget(tmp_path):
+    filepath = tmp_path / "large.json"
+    filepath.write_text('{"value": "' + "x" * 100 + '"}')
+    cache = ParsedFileCache(max_bytes=50)
+    cache.get(filepath, ConfigLoader([])._parse_file)
+    assert len(cache) == 0
+    assert cache.nbytes == 0
+
+
+def test_cache_invalidate():
+    cache = ParsedFileCache()
+    ConfigLoader(config_file_mapping["yaml"], cache=cache).load()
+    assert len(cache) > 0
+
+    cache.invalidate(config_file_mapping["yaml"])
+    assert os.path.abspath(config_file_mapping["yaml"]) not in cache._entries
+
+    cache.invalidate()
+    assert len(cache) == 0
+    assert cache.stats()["bytes"] == 0
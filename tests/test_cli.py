@@ -0,0 +1,117 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from config_loader.cli import discover_config_sets, main, validate_tree
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """
+    Three configuration sets: one valid, one with issues, and one nested in a tenant directory.
+    """
+    valid = tmp_path / "service-a"
+    (valid / "default").mkdir(parents=True)
+    (valid / "default" / "app-default.yaml").write_text("port: 80\nhost: ${HOST_A}\n")
+    (valid / "app.yaml").write_text("port: 8080\n")
+    (valid / ".env").write_text("HOST_A=localhost\n")
+
+    broken = tmp_path / "service-b"
+    (broken / "default").mkdir(parents=True)
+    (broken / "default" / "app-default.json").write_text('{"db": {"password": "x"}}')
+    (broken / "app.json").write_text('{"db": {"password": "${MISSING_PASSWORD}"}}')
+    (broken / "app.toml").write_text("port = 1\n")
+    (broken / "extra.yaml").write_text("key: value\n")
+    (broken / "invalid.json").write_text("{")
+
+    tenant = tmp_path / "tenants" / "t1"
+    tenant.mkdir(parents=True)
+    (tenant / "app.toml").write_text("port = 2\n")
+    return tmp_path
+
+
+def issues_by_kind(result):
+    kinds = {}
+    for issue in result["issues"]:
+        kinds.setdefault(issue["kind"], []).append(issue)
+    return kinds
+
+
+def test_discover_config_sets(tree):
+    config_sets = discover_config_sets(tree)
+
+    assert [config_set.directory for config_set in config_sets] == [
+        tree / "service-a",
+        tree / "service-b",
+        tree / "tenants" / "t1",
+    ]
+    assert config_sets[0].filepaths == [tree / "service-a" / "app.yaml"]
+    assert config_sets[0].default_directory == tree / "service-a" / "default"
+    assert config_sets[0].secrets_filepath == tree / "service-a" / ".env"
+    assert config_sets[1].secrets_filepath is None
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_validate_tree(tree, jobs, monkeypatch):
+    monkeypatch.delenv("MISSING_PASSWORD", raising=False)
+    report = validate_tree(tree, jobs=jobs)
+    valid, broken, tenant = report["sets"]
+
+    assert valid["issues"] == []
+    kinds = issues_by_kind(broken)
+    assert [issue["file"] for issue in kinds["duplicate_stem"]] == [
+        str(tree / "service-b" / "app.toml")
+    ]
+    assert [issue["file"] for issue in kinds["load_error"]] == [
+        str(tree / "service-b" / "invalid.json")
+    ]
+    assert kinds["unresolved_variable"] == [
+        {
+            "kind": "unresolved_variable",
+            "severity": "error",
+            "file": str(tree / "service-b" / "app.json"),
+            "message": "Environment variable 'MISSING_PASSWORD' is not set",
+            "variable": "MISSING_PASSWORD",
+            "path": "db.password",
+        }
+    ]
+    assert {issue["file"] for issue in kinds["missing_default"]} == {
+        str(tree / "service-b" / "extra.yaml"),
+        str(tree / "service-b" / "invalid.json"),
+    }
+    assert issues_by_kind(tenant).keys() == {"missing_default"}
+    assert report["summary"]["sets"] == 3
+    assert report["summary"]["files"] == 6
+    assert report["summary"]["errors"] == 3
+    assert report["summary"]["warnings"] == 3
+
+
+def test_secrets_file(tree, tmp_path_factory, monkeypatch):
+    monkeypatch.delenv("MISSING_PASSWORD", raising=False)
+    secrets = tmp_path_factory.mktemp("secrets") / "ci.env"
+    secrets.write_text("MISSING_PASSWORD=secret\nHOST_A=localhost\n")
+    report = validate_tree(tree, jobs=1, secrets_filepath=secrets)
+    assert "unresolved_variable" not in issues_by_kind(report["sets"][1])
+
+
+def test_ignores_working_directory_env(tree, tmp_path_factory, monkeypatch):
+    monkeypatch.delenv("MISSING_PASSWORD", raising=False)
+    # A .env file where the command runs does not resolve the variables of a set without one
+    monkeypatch.chdir(tmp_path_factory.mktemp("cwd"))
+    Path(".env").write_text("MISSING_PASSWORD=secret\n")
+    report = validate_tree(tree, jobs=1)
+    assert "unresolved_variable" in issues_by_kind(report["sets"][1])
+
+
+def test_main(tree, tmp_path_factory, capsys, monkeypatch):
+    monkeypatch.delenv("MISSING_PASSWORD", raising=False)
+    output = tmp_path_factory.mktemp("report") / "report.json"
+
+    assert main(["validate", str(tree / "service-a"), "--jobs", "1"]) == 0
+    assert json.loads(capsys.readouterr().out)["summary"]["errors"] == 0
+    assert main(["validate", str(tree / "tenants"), "-j", "1", "--strict"]) == 1
+    assert main(["validate", str(tree), "-j", "1", "-o", str(output)]) == 1
+    assert json.loads(output.read_text())["summary"]["errors"] == 3
+    with pytest.raises(SystemExit):
+        main(["validate", str(tree / "missing")])
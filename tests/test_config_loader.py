@@ -1,6 +1,7 @@
+import asyncio
 import pytest
 from pathlib import Path
-from config_loader import ConfigLoader, load_configs
+from config_loader import ConfigLoader, load_configs, load_configs_async
 from config_loader.config_loader import DuplicateConfigKeyError
 from conftest import config_file_mapping
 
@@ -187,3 +188,38 @@ def test_configs_with_secrets():
 
     result = load_configs(filepaths="tests/config-test-secrets.yaml")
     assert result == expected_output
+
+
+def test_concurrent_loading_matches_serial(multiple_configs):
+    serial = multiple_configs.load()
+    concurrent = ConfigLoader(
+        [config_file_mapping["yaml"], config_file_mapping["toml2"]], max_workers=4
+    ).load()
+    assert concurrent == serial
+    assert list(concurrent) == list(serial)
+
+
+def test_concurrent_duplicate_loading():
+    loader = ConfigLoader(
+        [config_file_mapping["yaml"], config_file_mapping["toml"]], max_workers=4
+    )
+    with pytest.raises(DuplicateConfigKeyError):
+        loader.load()
+
+
+def test_aload(multiple_configs):
+    configs = asyncio.run(multiple_configs.aload())
+    assert configs == multiple_configs.load()
+
+    duplicate = ConfigLoader([config_file_mapping["yaml"], config_file_mapping["toml"]])
+    with pytest.raises(DuplicateConfigKeyError):
+        asyncio.run(duplicate.aload())
+
+
+def test_load_configs_async():
+    result = asyncio.run(load_configs_async("tests/config-test-secrets.yaml"))
+    assert result == {
+        "database": "secret_pass",
+        "apikey": "12345",
+        "plain_secret": "my_secret",
+    }
@@ -0,0 +1,64 @@
+import os
+
+from config_loader import ConfigLoader
+from config_loader.defaults import DefaultIndex, get_default_index
+
+
+def age(directory, seconds=60):
+    # Make the directory old enough for its index to be trusted
+    stat = directory.stat()
+    mtime_ns = stat.st_mtime_ns - seconds * 1_000_000_000
+    os.utime(directory, ns=(stat.st_atime_ns, mtime_ns))
+
+
+def test_default_index_lookup(tmp_path):
+    (tmp_path / "app-default.yaml").write_text("a: 1")
+    (tmp_path / "app-default.toml").write_text("a = 1")
+    (tmp_path / "db-default.json").write_text("{}")
+    (tmp_path / "unrelated.yaml").write_text("a: 1")
+    index = DefaultIndex(tmp_path)
+
+    assert index.lookup("app", ".toml") == tmp_path / "app-default.toml"
+    assert index.lookup("db", ".yaml") == tmp_path / "db-default.json"
+    assert index.get("db", ".yaml") is None
+    assert index.lookup("unrelated", ".yaml") is None
+
+
+def test_layer_index_lookup(tmp_path):
+    (tmp_path / "app.yaml").write_text("a: 1")
+    (tmp_path / "app-default.yaml").write_text("a: 1")
+    (tmp_path / "nested").mkdir()
+    index = DefaultIndex(tmp_path, suffix="")
+
+    assert index.lookup("app", ".toml") == tmp_path / "app.yaml"
+    assert index.lookup("app-default", ".yaml") == tmp_path / "app-default.yaml"
+    assert index.lookup("nested", ".yaml") is None
+
+
+def test_default_index_rescans_only_when_directory_changes(tmp_path, monkeypatch):
+    (tmp_path / "app-default.yaml").write_text("a: 1")
+    age(tmp_path)
+    index = DefaultIndex(tmp_path)
+    scans = []
+    scan = index._scan
+    monkeypatch.setattr(index, "_scan", lambda: scans.append(1) or scan())
+
+    index.refresh()
+    index.refresh()
+    assert len(scans) == 1
+
+    (tmp_path / "db-default.yaml").write_text("a: 1")
+    index.refresh()
+    assert len(scans) == 2
+    assert index.lookup("db", ".yaml") == tmp_path / "db-default.yaml"
+
+
+def test_default_index_missing_directory(tmp_path):
+    index = DefaultIndex(tmp_path / "missing")
+    assert index.lookup("app", ".yaml") is None
+
+
+def test_default_index_shared_between_loaders(tmp_path):
+    first = ConfigLoader([], tmp_path)
+    second = ConfigLoader([], tmp_path)
+    assert first._defaults is second._defaults is get_default_index(tmp_path)
@@ -0,0 +1,94 @@
+import pytest
+
+from config_loader import FlatConfig, LoadStats, load_configs
+
+CONFIG = {
+    "database": {
+        "host": "localhost",
+        "pool": {"size": 5, "timeout": 10},
+        "replicas": ["a", "b"],
+    },
+    "features": {},
+    "name": "Example",
+}
+
+
+def test_get_values_and_sections():
+    flat = FlatConfig(CONFIG)
+
+    assert flat.get("database.pool.size") == 5
+    assert flat.get("database.pool.missing", 7) == 7
+    assert flat.get("database.replicas") == ["a", "b"]
+    assert flat.get("features") == {}
+    assert flat.get("database.pool") == {"size": 5, "timeout": 10}
+    with pytest.raises(TypeError):
+        flat.get("database.pool")["size"] = 6
+
+
+def test_mapping_of_leaves():
+    flat = FlatConfig(CONFIG)
+
+    assert list(flat) == [
+        "database.host",
+        "database.pool.size",
+        "database.pool.timeout",
+        "database.replicas",
+        "features",
+        "name",
+    ]
+    assert len(flat) == 6
+    assert flat["name"] == "Example"
+    assert "database.pool" not in flat
+    with pytest.raises(KeyError):
+        flat["database.pool"]
+
+
+def test_leaves_under_prefix():
+    flat = FlatConfig(CONFIG)
+
+    assert list(flat.leaves("database.pool")) == [
+        ("database.pool.size", 5),
+        ("database.pool.timeout", 10),
+    ]
+    assert [path for path, _ in flat.leaves("database")] == [
+        "database.host",
+        "database.pool.size",
+        "database.pool.timeout",
+        "database.replicas",
+    ]
+    assert len(list(flat.leaves())) == 6
+    assert list(flat.leaves("name")) == []
+    assert list(flat.leaves("missing")) == []
+    assert flat.sections() == ["", "database", "database.pool"]
+
+
+def test_deep_config():
+    config = node = {}
+    for i in range(5000):
+        node["next"] = {"level": i}
+        node = node["next"]
+    flat = FlatConfig(config)
+    assert flat.get(".".join(["next"] * 5000 + ["level"])) == 4999
+
+
+def test_load_flat(multiple_configs):
+    stats = LoadStats()
+    multiple_configs.stats = stats
+    flat = multiple_configs.load(flat=True)
+    configs = multiple_configs.load()
+
+    assert flat.get("config-test.settings.debug") is True
+    assert flat.to_dict() == configs
+    assert "index" in stats.summary()["phases"]
+    with pytest.raises(ValueError):
+        multiple_configs.load(lazy=True, flat=True)
+
+
+def test_load_configs_flat_after_secrets():
+    flat = load_configs("tests/config-test-secrets.yaml", flat=True)
+    assert flat.get("database") == "secret_pass"
+    assert dict(flat) == {
+        "database": "secret_pass",
+        "apikey": "12345",
+        "plain_secret": "my_secret",
+    }
@@ -0,0 +1,183 @@
+import json
+import os
+
+import pytest
+
+from config_loader import (
+    ConfigLoader,
+    ConfigWatcher,
+    IncludeCycleError,
+    IncludeError,
+    LoadStats,
+    ParsedFileCache,
+    load_configs,
+)
+from config_loader.includes import IncludeResolver
+
+
+@pytest.fixture
+def fragments(tmp_path):
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    (shared / "db.yaml").write_text(
+        "primary:\n  host: db-1\n  pool: !include pool.json\nreplica:\n  host: db-2\n"
+    )
+    (shared / "pool.json").write_text('{"size": 5, "timeout": 10}')
+    (shared / "logging.toml").write_text('level = "info"\nhandlers = ["console"]\n')
+    (tmp_path / "default").mkdir()
+    (tmp_path / "default" / "app-default.yaml").write_text(
+        "logging:\n  $include: ../shared/logging.toml\n"
+    )
+    (tmp_path / "app.yaml").write_text(
+        "database:\n  $ref: shared/db.yaml#/primary\n  pool:\n    size: 20\n"
+        "replicas:\n  - $ref: shared/db.yaml#/replica\n"
+    )
+    (tmp_path / "worker.json").write_text(
+        json.dumps({"database": {"$include": ["shared/db.yaml", "shared/db.yaml"]}})
+    )
+    return tmp_path
+
+
+def test_directives_resolved(fragments):
+    loader = ConfigLoader(
+        [fragments / "app.yaml", fragments / "worker.json"],
+        fragments / "default",
+        includes=True,
+    )
+    configs = loader.load()
+
+    assert configs["app"] == {
+        "logging": {"level": "info", "handlers": ["console"]},
+        "database": {"host": "db-1", "pool": {"size": 20, "timeout": 10}},
+        "replicas": [{"host": "db-2"}],
+    }
+    assert configs["worker"]["database"]["primary"]["pool"]["size"] == 5
+    # Files including the same fragment do not share it
+    assert configs["worker"]["database"]["primary"] is not configs["app"]["database"]
+    shared = fragments / "shared"
+    assert loader.fragments["app"] == [
+        shared / "logging.toml",
+        shared / "pool.json",
+        shared / "db.yaml",
+    ]
+    assert loader.provenance["app"].source("database.host") == str(
+        fragments / "app.yaml"
+    )
+
+
+def test_fragments_parsed_once_per_load(fragments):
+    stats = LoadStats()
+    loader = ConfigLoader(
+        [fragments / "app.yaml", fragments / "worker.json"],
+        fragments / "default",
+        cache=False,
+        max_workers=4,
+        stats=stats,
+        includes=True,
+    )
+    loader.load()
+    parsed = [
+        os.path.basename(record.filepath)
+        for record in stats.records
+        if record.phase == "parse"
+    ]
+    assert sorted(parsed) == [
+        "app-default.yaml",
+        "app.yaml",
+        "db.yaml",
+        "logging.toml",
+        "pool.json",
+        "worker.json",
+    ]
+    assert "include" in stats.summary()["phases"]
+
+
+def test_directives_kept_without_includes(fragments):
+    config = load_configs(fragments / "worker.json", fragments / "default")
+    assert config["database"] == {"$include": ["shared/db.yaml", "shared/db.yaml"]}
+
+
+def test_include_cycle(tmp_path):
+    (tmp_path / "a.yaml").write_text("b: !include b.yaml\n")
+    (tmp_path / "b.yaml").write_text("c:\n  $include: c.yaml\n")
+    (tmp_path / "c.yaml").write_text("a: !include a.yaml\n")
+    with pytest.raises(IncludeCycleError) as error:
+        ConfigLoader(tmp_path / "a.yaml", tmp_path, includes=True).load()
+    names = [os.path.basename(filepath) for filepath in error.value.cycle]
+    assert names == ["a.yaml", "b.yaml", "c.yaml", "a.yaml"]
+    assert " -> " in str(error.value)
+
+
+@pytest.mark.parametrize(
+    "content, error",
+    [
+        ("x:\n  $include: missing.yaml\n", FileNotFoundError),
+        ("x:\n  $include: [1]\n", IncludeError),
+        ("x:\n  $include: a.yaml\n  $ref: a.yaml\n", IncludeError),
+        ("x:\n  $ref: frag.json#/nope\n", IncludeError),
+        ("x:\n  $ref: frag.json#/list\n  extra: 1\n", IncludeError),
+        ("x: !include notes.txt\n", IncludeError),
+    ],
+)
+def test_invalid_directives(tmp_path, content, error):
+    (tmp_path / "frag.json").write_text('{"list": [1, 2]}')
+    (tmp_path / "notes.txt").write_text("notes")
+    (tmp_path / "app.yaml").write_text(content)
+    with pytest.raises(error):
+        load_configs(tmp_path / "app.yaml", tmp_path, includes=True)
+
+
+def test_resolver_memoizes_fragments(tmp_path):
+    (tmp_path / "frag.json").write_text('{"servers": [{"host": "a/b"}]}')
+    loaded = []
+
+    def load(filepath):
+        loaded.append(filepath)
+        return json.loads(filepath.read_text())
+
+    resolver = IncludeResolver(load)
+    first, _ = resolver.resolve({"$ref": "frag.json#/servers/0"}, tmp_path / "x.yaml")
+    second, fragments = resolver.resolve(
+        {"servers": {"$ref": "frag.json#/servers"}}, tmp_path / "y.yaml"
+    )
+    assert first == {"host": "a/b"}
+    assert second == {"servers": [{"host": "a/b"}]}
+    assert fragments == [tmp_path / "frag.json"]
+    assert len(loaded) == 1
+
+
+def test_fragment_changes_invalidate_snapshot_and_watcher(fragments):
+    snapshot = fragments / "snapshot.pickle"
+    loader = ConfigLoader(
+        fragments / "app.yaml",
+        fragments / "default",
+        cache=ParsedFileCache(),
+        snapshot=snapshot,
+        includes=True,
+    )
+    assert loader.load()["database"]["host"] == "db-1"
+    watcher = ConfigWatcher(loader, use_inotify=False)
+
+    (fragments / "shared" / "db.yaml").write_text(
+        "primary:\n  host: db-3\nreplica:\n  host: db-2\n"
+    )
+    assert ConfigLoader(
+        fragments / "app.yaml", fragments / "default", snapshot=snapshot, includes=True
+    ).load()["database"] == {"host": "db-3", "pool": {"size": 20}}
+    assert ("database", "host") in watcher.check()
+
+
+def test_snapshot_keyed_on_includes(fragments):
+    snapshot = fragments / "snapshot.pickle"
+
+    def load(includes):
+        return ConfigLoader(
+            fragments / "app.yaml",
+            fragments / "default",
+            snapshot=snapshot,
+            includes=includes,
+        ).load()
+
+    assert load(False)["logging"] == {"$include": "../shared/logging.toml"}
+    assert load(True)["logging"] == {"level": "info", "handlers": ["console"]}
+    assert load(False)["logging"] == {"$include": "../shared/logging.toml"}
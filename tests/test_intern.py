@@ -0,0 +1,117 @@
+import datetime
+import json
+import math
+import sys
+
+from config_loader import ConfigLoader, InternPool, LoadStats, load_configs
+
+
+def parse(value):
+    # A parse allocates new objects for every key and value
+    return json.loads(json.dumps(value))
+
+
+def test_intern_shares_keys_and_values():
+    pool = InternPool()
+    template = {"region": "eu-west-1", "pool": {"size": 1000, "ratio": 0.75}}
+    first = pool.intern(parse(template))
+    second = pool.intern(parse(template))
+
+    assert first == second == template
+    assert first is not second and first["pool"] is not second["pool"]
+    assert first["region"] is second["region"]
+    assert next(iter(first)) is next(iter(second))
+    assert first["pool"]["size"] is second["pool"]["size"]
+    assert first["pool"]["ratio"] is second["pool"]["ratio"]
+
+    stats = pool.stats()
+    assert stats["hits"] == 7
+    assert stats["entries"] == len(pool) == 7
+    assert stats["bytes_saved"] > 0
+
+
+def test_intern_keeps_types_apart():
+    pool = InternPool(max_length=8)
+    config = {
+        "values": [1, 1.0, True, None, "1", float("nan")],
+        "date": datetime.date(2024, 1, 2),
+        "long": "".join(["x"] * 9),
+    }
+    interned = pool.intern(config)
+    assert [type(value) for value in interned["values"]] == [
+        int,
+        float,
+        bool,
+        type(None),
+        str,
+        float,
+    ]
+    assert math.isnan(interned["values"][-1])
+    assert interned["date"] == datetime.date(2024, 1, 2)
+    assert pool.intern({"long": "".join(["x"] * 9)})["long"] is not interned["long"]
+
+    pool.clear()
+    assert len(pool) == 0 and pool.stats()["hits"] == 0
+
+
+def test_intern_deep_trees():
+    depth = sys.getrecursionlimit() * 2
+    config = node = {}
+    for _ in range(depth):
+        node["next"] = {"items": ["a", 1]}
+        node = node["next"]
+
+    node = InternPool().intern(config)
+    assert node is not config
+    for _ in range(depth):
+        node = node["next"]
+        assert node["items"] == ["a", 1]
+
+
+def test_loaders_share_a_pool(tmp_path):
+    for tenant in ("a", "b"):
+        (tmp_path / f"{tenant}.json").write_text(
+            json.dumps({"database": {"host": "db.example.com", "port": 5432}})
+        )
+    pool = InternPool()
+    stats = LoadStats()
+    first = load_configs(tmp_path / "a.json", tmp_path, intern=pool, stats=stats)
+    second = ConfigLoader(
+        tmp_path / "b.json", tmp_path, cache=False, intern=pool
+    ).load()
+
+    assert first == second
+    assert first["database"]["host"] is second["database"]["host"]
+    assert pool.stats()["bytes_saved"] > 0
+    assert "intern" in stats.summary()["phases"]
+
+
+def test_merge_configs_interns(tmp_path):
+    pool = InternPool()
+    loader = ConfigLoader(tmp_path / "app.yaml", tmp_path, intern=pool)
+    merged = loader._merge_configs(parse({"a": {"b": "value"}}), parse({"c": "value"}))
+    assert merged["a"]["b"] is merged["c"]
+
+
+def test_provenance_keeps_interned_keys(tmp_path):
+    (tmp_path / "default").mkdir()
+    (tmp_path / "default" / "app-default.json").write_text(
+        json.dumps({"database": {"host": "localhost", "port": 5432}})
+    )
+    (tmp_path / "app.json").write_text(
+        json.dumps({"database": {"host": "db.example.com"}})
+    )
+    loader = ConfigLoader(
+        tmp_path / "app.json", tmp_path / "default", intern=InternPool()
+    )
+    config = loader.load()
+
+    provenance = loader.provenance["app"]
+    assert provenance.source("database.host") == str(tmp_path / "app.json")
+    assert provenance.source("database.port") == str(
+        tmp_path / "default" / "app-default.json"
+    )
+    for tree, _ in provenance.layers:
+        assert tree["database"].keys() <= config["database"].keys()
+        assert set(tree["database"].values()) == {None}
+        assert next(iter(tree["database"])) is next(iter(config["database"]))
@@ -0,0 +1,73 @@
+import pytest
+
+from config_loader import ConfigLoader, ConfigWatcher
+
+
+@pytest.fixture
+def layered(tmp_path):
+    default_directory = tmp_path / "default"
+    layers = [tmp_path / "base", tmp_path / "prod", tmp_path / "eu-west"]
+    for directory in [default_directory, *layers]:
+        directory.mkdir()
+    (default_directory / "app-default.yaml").write_text(
+        "database:\n  host: localhost\n  pool:\n    size: 5\n    timeout: 10\ndebug: true\n"
+    )
+    (layers[0] / "app.yaml").write_text("database:\n  pool:\n    size: 10\n")
+    (layers[1] / "app.toml").write_text('debug = false\n[database]\nhost = "prod-db"\n')
+    (tmp_path / "app.yaml").write_text("database:\n  pool:\n    timeout: 30\n")
+    return tmp_path / "app.yaml", default_directory, layers
+
+
+def test_layer_directories_merged_in_order(layered):
+    filepath, default_directory, layers = layered
+    loader = ConfigLoader(filepath, default_directory, layers=layers)
+
+    assert loader.load() == {
+        "database": {"host": "prod-db", "pool": {"size": 10, "timeout": 30}},
+        "debug": False,
+    }
+
+    provenance = loader.provenance["app"]
+    assert provenance.source("database.host") == str(layers[1] / "app.toml")
+    assert provenance.source("database.pool.size") == str(layers[0] / "app.yaml")
+    assert provenance.source("database.pool.timeout") == str(filepath)
+
+
+def test_layer_files_per_stem(layered, tmp_path):
+    filepath, default_directory, layers = layered
+    local = tmp_path / "local.json"
+    local.write_text('{"debug": "verbose"}')
+    loader = ConfigLoader(
+        filepath,
+        default_directory,
+        layers={"app": [layers[1] / "app.toml", local]},
+    )
+
+    config = loader.load()
+    assert config["database"] == {
+        "host": "prod-db",
+        "pool": {"size": 5, "timeout": 30},
+    }
+    assert config["debug"] == "verbose"
+    assert loader.provenance["app"].source("debug") == str(local)
+
+
+def test_snapshot_rebuilt_when_layer_changes(layered, tmp_path):
+    filepath, default_directory, layers = layered
+    snapshot = tmp_path / "snapshot.pickle"
+    ConfigLoader(filepath, default_directory, snapshot=snapshot, layers=layers).load()
+
+    (layers[0] / "app.yaml").write_text("database:\n  pool:\n    size: 20\n")
+    config = ConfigLoader(
+        filepath, default_directory, snapshot=snapshot, layers=layers
+    ).load()
+    assert config["database"]["pool"]["size"] == 20
+
+
+def test_watcher_reloads_changed_layer(layered):
+    filepath, default_directory, layers = layered
+    watcher = ConfigWatcher(ConfigLoader(filepath, default_directory, layers=layers))
+
+    (layers[2] / "app.yaml").write_text("region: eu-west\n")
+    assert watcher.check() == [("region",)]
+    assert watcher.configs["region"] == "eu-west"
@@ -0,0 +1,58 @@
+import pytest
+
+from config_loader import ConfigLoader, LazyConfigs, load_configs
+from config_loader.config_loader import DuplicateConfigKeyError
+from conftest import config_file_mapping
+
+
+def test_lazy_load_defers_parsing(monkeypatch):
+    loader = ConfigLoader(
+        [config_file_mapping["yaml"], config_file_mapping["toml2"]], cache=False
+    )
+    parsed = []
+    parse_file = loader._parse_file
+    monkeypatch.setattr(
+        loader,
+        "_parse_file",
+        lambda filepath: parsed.append(filepath) or parse_file(filepath),
+    )
+
+    configs = loader.load(lazy=True)
+    assert isinstance(configs, LazyConfigs)
+    assert list(configs) == ["config-test", "config2-test"]
+    assert parsed == []
+
+    assert configs["config-test"]["settings"]["debug"] is True
+    assert parsed == [config_file_mapping["yaml"]]
+    assert configs.loaded() == ["config-test"]
+
+    configs["config-test"]
+    assert parsed == [config_file_mapping["yaml"]]
+
+
+def test_lazy_load_matches_eager(multiple_configs):
+    assert dict(multiple_configs.load(lazy=True)) == multiple_configs.load()
+
+
+def test_lazy_load_is_read_only(multiple_configs):
+    configs = multiple_configs.load(lazy=True)
+    with pytest.raises(TypeError):
+        configs["config-test"] = {}
+    with pytest.raises(KeyError):
+        configs["missing"]
+
+
+def test_lazy_load_checks_up_front(multiple_configs_duplicate):
+    with pytest.raises(DuplicateConfigKeyError):
+        multiple_configs_duplicate.load(lazy=True)
+    with pytest.raises(FileNotFoundError):
+        ConfigLoader(["tests/missing.yaml", "tests/config-test.yaml"]).load(lazy=True)
+
+
+def test_lazy_load_configs_with_secrets():
+    configs = load_configs("tests/config-test-secrets.yaml", lazy=True)
+    assert configs["config-test-secrets"] == {
+        "database": "secret_pass",
+        "apikey": "12345",
+        "plain_secret": "my_secret",
+    }
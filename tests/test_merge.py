@@ -0,0 +1,112 @@
+import copy
+import sys
+
+from config_loader.merge import merge_configs, merge_layers
+
+
+def test_merge_does_not_modify_inputs():
+    base = {"a": 1, "nested": {"x": 1, "y": {"z": 1}}, "only_base": {"k": "v"}}
+    new = {"a": 2, "nested": {"y": {"z": 2}, "w": [1]}, "only_new": {"k": "v"}}
+    base_copy, new_copy = copy.deepcopy(base), copy.deepcopy(new)
+
+    merged = merge_configs(base, new)
+
+    assert merged == {
+        "a": 2,
+        "nested": {"x": 1, "y": {"z": 2}, "w": [1]},
+        "only_base": {"k": "v"},
+        "only_new": {"k": "v"},
+    }
+    assert base == base_copy
+    assert new == new_copy
+
+
+def test_merge_shares_unmerged_subtrees():
+    base = {"shared": {"large": list(range(10))}, "both": {"a": 1}}
+    new = {"both": {"b": 2}, "added": {"c": [3]}}
+
+    merged = merge_configs(base, new)
+
+    assert merged["shared"] is base["shared"]
+    assert merged["added"] is new["added"]
+    assert merged["both"] is not base["both"]
+
+
+def test_merge_replaces_mismatched_types():
+    merged = merge_configs({"a": {"b": 1}, "c": 1}, {"a": 1, "c": {"d": 1}})
+    assert merged == {"a": 1, "c": {"d": 1}}
+
+
+def test_merge_key_order():
+    merged = merge_configs({"a": 1, "b": 2}, {"c": 3, "a": 4})
+    assert list(merged) == ["a", "b", "c"]
+
+
+def test_merge_deep_trees():
+    depth = sys.getrecursionlimit() * 2
+    base, new = {}, {}
+    base_node, new_node = base, new
+    for _ in range(depth):
+        base_node["next"] = {"base": True}
+        new_node["next"] = {"new": True}
+        base_node, new_node = base_node["next"], new_node["next"]
+
+    node = merge_configs(base, new)
+    for _ in range(depth):
+        node = node["next"]
+        assert node["base"] and node["new"]
+
+
+def test_one_default_many_overlays():
+    defaults = {"database": {"host": "localhost", "pool": {"size": 5}}, "features": {}}
+    tenants = [
+        merge_configs(defaults, {"database": {"pool": {"size": i}}}) for i in range(3)
+    ]
+    assert [tenant["database"]["pool"]["size"] for tenant in tenants] == [0, 1, 2]
+    assert all(tenant["features"] is defaults["features"] for tenant in tenants)
+    assert defaults["database"]["pool"]["size"] == 5
+
+
+def test_merge_layers_matches_pairwise_merges():
+    layers = [
+        {"a": 1, "db": {"host": "localhost", "pool": {"size": 5}}, "x": {"y": 1}},
+        {"db": {"pool": {"size": 10}}, "x": 2},
+        {"db": {"host": "prod"}, "x": {"z": 3}, "b": [1]},
+        {},
+        {"db": {"pool": {"timeout": 30}}, "a": {"nested": True}},
+    ]
+    base_copies = copy.deepcopy(layers)
+    expected = {}
+    for layer in layers:
+        expected = merge_configs(expected, layer)
+
+    merged, _ = merge_layers(layers, ["default", "base", "prod", "eu", "local"])
+
+    assert merged == expected
+    assert list(merged) == list(expected)
+    assert merged["b"] is layers[2]["b"]
+    assert layers == base_copies
+
+
+def test_merge_layers_provenance():
+    layers = [
+        {
+            "db": {"host": "localhost", "pool": {"size": 5, "timeout": 10}},
+            "debug": False,
+        },
+        {"db": {"pool": {"size": 10}}},
+        {"db": {"host": "prod"}, "region": {"name": "eu"}},
+    ]
+    _, provenance = merge_layers(layers, ["default", "base", "prod"])
+
+    assert provenance.source(("db", "host")) == "prod"
+    assert provenance.source("db.pool.size") == "base"
+    assert provenance.source("db.pool.timeout") == "default"
+    assert provenance.source("debug") == "default"
+    assert provenance.source("region.name") == "prod"
+
+
+def test_merge_layers_empty():
+    merged, provenance = merge_layers([{}, {}], ["default", "user"])
+    assert merged == {}
+    assert provenance.source("a") is None
@@ -0,0 +1,116 @@
+import datetime
+
+import pytest
+
+from config_loader import ConfigLoader, LoadStats, OverrideError, load_configs
+from config_loader.overrides import EnvOverrides
+
+CONFIG = {
+    "database": {
+        "host": "localhost",
+        "pool": {"size": 5, "timeout": 1.5},
+        "replicas": ["a", "b"],
+        "password": None,
+    },
+    "debug": False,
+    "log-level": "info",
+    "servers": [{"host": "a", "port": 80}],
+    "since": datetime.date(2024, 1, 1),
+}
+
+
+def test_apply_coerces_to_existing_types():
+    overrides = EnvOverrides(
+        "APP",
+        {
+            "APP__DATABASE__POOL__SIZE": "50",
+            "APP__DATABASE__POOL__TIMEOUT": "3",
+            "APP__DATABASE__REPLICAS": '["c"]',
+            "APP__DATABASE__PASSWORD": "secret",
+            "APP__DEBUG": "yes",
+            "APP__LOG_LEVEL": "debug",
+            "APP__SERVERS__0__PORT": "8080",
+            "APP__SINCE": "2025-06-01",
+            "APP__FEATURES__NEW_UI": "on",
+            "OTHER__DEBUG": "true",
+            "APP_DEBUG": "true",
+        },
+    )
+    config = overrides.apply(CONFIG)
+
+    assert config["database"] == {
+        "host": "localhost",
+        "pool": {"size": 50, "timeout": 3.0},
+        "replicas": ["c"],
+        "password": "secret",
+    }
+    assert config["debug"] is True
+    assert config["log-level"] == "debug"
+    assert config["servers"] == [{"host": "a", "port": 8080}]
+    assert config["since"] == datetime.date(2025, 6, 1)
+    assert config["features"] == {"new_ui": "on"}
+    assert len(overrides) == 9
+    # Only the containers on the paths of the overrides are copied
+    assert CONFIG["database"]["pool"]["size"] == 5
+    assert config["database"]["pool"] is not CONFIG["database"]["pool"]
+
+
+def test_apply_without_matches_returns_config():
+    overrides = EnvOverrides("APP", {"APP__DB__HOST": "db"})
+    assert overrides.apply(CONFIG) is not CONFIG
+    assert overrides.apply(CONFIG, "app") is CONFIG
+    assert overrides.apply({"host": "a"}, "db") == {"host": "db"}
+    with pytest.raises(ValueError):
+        EnvOverrides("")
+
+
+@pytest.mark.parametrize(
+    "variable, value",
+    [
+        ("APP__DATABASE__POOL__SIZE", "many"),
+        ("APP__DEBUG", "maybe"),
+        ("APP__DATABASE__REPLICAS", '{"a": 1}'),
+        ("APP__DATABASE__HOST__NAME", "x"),
+        ("APP__SERVERS__3__PORT", "80"),
+    ],
+)
+def test_invalid_overrides(variable, value):
+    with pytest.raises(OverrideError) as error:
+        EnvOverrides("APP", {variable: value}).apply(CONFIG)
+    assert variable in str(error.value) or "database.host" in str(error.value)
+
+
+def test_loader_applies_overrides_per_stem(tmp_path, monkeypatch):
+    (tmp_path / "app.yaml").write_text("port: 80\nname: app\n")
+    (tmp_path / "db.toml").write_text('host = "localhost"\nport = 5432\n')
+    monkeypatch.setenv("SVC__APP__PORT", "8080")
+    monkeypatch.setenv("SVC__DB__PORT", "6432")
+
+    stats = LoadStats()
+    configs = load_configs(
+        [tmp_path / "app.yaml", tmp_path / "db.toml"],
+        tmp_path,
+        env_prefix="SVC",
+        stats=stats,
+        select=["port"],
+    )
+    assert configs == {"app": {"port": 8080}, "db": {"port": 6432}}
+    assert "override" in stats.summary()["phases"]
+
+    single = ConfigLoader(tmp_path / "db.toml", tmp_path, env_prefix="SVC")
+    monkeypatch.setenv("SVC__PORT", "7432")
+    assert single.load()["port"] == 7432
+
+
+def test_snapshot_rebuilt_when_overrides_change(tmp_path, monkeypatch):
+    (tmp_path / "app.yaml").write_text("port: 80\n")
+    snapshot = tmp_path / "snapshot.pickle"
+
+    def load():
+        return ConfigLoader(
+            tmp_path / "app.yaml", tmp_path, snapshot=snapshot, env_prefix="SVC"
+        ).load()
+
+    assert load() == {"port": 80}
+    monkeypatch.setenv("SVC__PORT", "8080")
+    assert load() == {"port": 8080}
@@ -0,0 +1,94 @@
+from pathlib import Path
+
+import pytest
+
+from config_loader import ConfigLoader
+from config_loader import parsers
+from config_loader.parsers import (
+    ParserBackend,
+    available_parsers,
+    get_parser,
+    register_parser,
+    select_fastest,
+)
+
+# Documents exercising the corners where parser backends tend to disagree
+PARITY_DOCUMENTS = {
+    ".json": [
+        Path("tests/config-test.json").read_bytes(),
+        b'{"nan": NaN, "unicode": "\\u00e9\\ud83d\\ude00",'
+        b' "float": 1e-7, "nested": [[], {}, [null, true, false]], "dup": 1, "dup": 2}',
+        # Integers beyond 64 bits, in a document every backend can parse otherwise
+        b'{"big": 12345678901234567890123, "negative": -9223372036854775809,'
+        b' "unsigned": 18446744073709551616, "limits": [9223372036854775807, -9223372036854775808]}',
+    ],
+    ".yaml": [
+        Path("tests/config-test.yaml").read_bytes(),
+        b"anchors:\n  base: &base {a: 1, b: [1, 2]}\n  copy: *base\n"
+        b"scalars: [yes, no, ~, 0x1f, 0o17, 1_000, .inf, 2001-12-14, '2001-12-14']\n"
+        b"text: |\n  multi\n  line\n",
+    ],
+    ".toml": [
+        Path("tests/config-test.toml").read_bytes(),
+        b"utc = 1979-05-27T07:32:00Z\noffset = 1979-05-27T00:32:00-07:00\n"
+        b"local = 1979-05-27T07:32:00.999999\ndate = 1979-05-27\ntime = 07:32:00\n"
+        b'hex = 0xDEADBEEF\ninf = -inf\n[table]\n"quoted key" = "\\u00e9"\n'
+        b"array = [[1, 2], ['a', 'b']]\n",
+    ],
+}
+
+
+@pytest.mark.parametrize("suffix", sorted(PARITY_DOCUMENTS))
+def test_backend_parity(suffix):
+    backends = available_parsers(suffix)
+    reference = [backend for backend in backends if backend.reference][0]
+    for document in PARITY_DOCUMENTS[suffix]:
+        expected = reference.loads(document)
+        for backend in backends:
+            assert parsers._identical(backend.loads(document), expected), backend.name
+
+
+def test_fastest_backend_preferred():
+    for suffix in (".json", ".yaml", ".toml"):
+        backends = available_parsers(suffix)
+        assert get_parser(suffix) is backends[0]
+        assert backends == sorted(backends, key=lambda backend: backend.priority)
+
+
+def test_yml_extension(tmp_path):
+    filepath = tmp_path / "app.yml"
+    filepath.write_text("name: Example\nsettings:\n  debug: true\n")
+    config = ConfigLoader(filepath, tmp_path).load()
+    assert config == {"name": "Example", "settings": {"debug": True}}
+
+
+def test_unsupported_extension(tmp_path):
+    filepath = tmp_path / "app.ini"
+    filepath.write_text("[section]\nkey = value\n")
+    assert get_parser(".ini") is None
+    assert ConfigLoader(filepath, tmp_path).load() == {}
+
+
+def test_register_and_select_backend(monkeypatch):
+    monkeypatch.setattr(parsers, "_backends", {})
+    monkeypatch.setattr(parsers, "_selected", {})
+
+    reference = register_parser(
+        ParserBackend("reference", [".kv"], _parse_kv, reference=True)
+    )
+    wrong = register_parser(
+        ParserBackend("wrong", [".kv"], lambda data: {}, priority=1)
+    )
+    unavailable = register_parser(
+        ParserBackend("unavailable", [".kv"], _parse_kv, requires="no_such_module")
+    )
+
+    assert available_parsers(".kv") == [wrong, reference]
+    assert unavailable.available() is False
+    assert get_parser(".kv") is wrong
+    assert select_fastest(".kv", b"a=1\nb=2") == "reference"
+    assert get_parser(".kv") is reference
+
+
+def _parse_kv(data):
+    return dict(line.split("=", 1) for line in data.decode().splitlines())
@@ -0,0 +1,180 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Literal, Optional
+
+import pytest
+
+from config_loader import (
+    ConfigLoader,
+    ConfigValidationError,
+    LoadStats,
+    compile_schema,
+    load_configs,
+)
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "database": {
+            "type": "object",
+            "properties": {
+                "host": {"type": "string", "minLength": 1},
+                "port": {"type": "integer", "minimum": 1, "maximum": 65535},
+                "replicas": {"type": "array", "items": {"type": "string"}},
+            },
+            "required": ["host", "port"],
+            "additionalProperties": False,
+        },
+        "mode": {"enum": ["dev", "prod"]},
+        "limits": {"type": "object", "additionalProperties": {"type": "number"}},
+    },
+    "required": ["database"],
+}
+
+
+@dataclass
+class Pool:
+    size: int
+    timeout: float = 10.0
+
+
+@dataclass
+class Database:
+    host: str
+    pool: Pool
+    replicas: List[str] = field(default_factory=list)
+    password: Optional[str] = None
+
+
+@dataclass
+class App:
+    database: Database
+    mode: Literal["dev", "prod"] = "dev"
+    limits: Dict[str, int] = field(default_factory=dict)
+
+
+@pytest.fixture
+def layered(tmp_path):
+    default_directory = tmp_path / "default"
+    default_directory.mkdir()
+    (default_directory / "app-default.yaml").write_text(
+        "database:\n  host: localhost\n  port: 5432\nmode: dev\n"
+    )
+    filepath = tmp_path / "app.yaml"
+    filepath.write_text("database:\n  port: '5432'\n")
+    return filepath, default_directory
+
+
+def messages(violations):
+    return [str(violation) for violation in violations]
+
+
+def test_json_schema():
+    schema = compile_schema(SCHEMA)
+    assert schema.validate({"database": {"host": "db", "port": 5432}}) == []
+    assert messages(
+        schema.validate(
+            {
+                "database": {"host": "", "port": True, "replicas": ["a", 1], "x": 1},
+                "mode": "test",
+                "limits": {"cpu": 1.5, "memory": "1G"},
+            }
+        )
+    ) == [
+        "database.x: unexpected key",
+        "database.host: must be at least 1 characters long",
+        "database.port: expected integer, got boolean",
+        "database.replicas.1: expected string, got integer",
+        "mode: must be one of ['dev', 'prod']",
+        "limits.memory: expected number, got string",
+    ]
+    assert messages(schema.validate({"database": {"port": 0}})) == [
+        "database.host: required key is missing",
+        "database.port: must be at least 1",
+    ]
+    assert messages(schema.validate([])) == ["<root>: expected object, got array"]
+
+
+def test_dataclass_schema():
+    schema = compile_schema(App)
+    assert schema.validate({"database": {"host": "db", "pool": {"size": 5}}}) == []
+    assert messages(
+        schema.validate(
+            {
+                "database": {"host": "db", "pool": {"size": 5, "timeout": "x"}},
+                "mode": "test",
+                "limits": {"a": 1.5},
+                "debug": True,
+            }
+        )
+    ) == [
+        "debug: unexpected key",
+        "database.pool.timeout: expected number, got string",
+        "mode: must be one of ['dev', 'prod']",
+        "limits.a: expected integer, got number",
+    ]
+    assert messages(schema.validate({"database": {"password": None}})) == [
+        "database.host: required key is missing",
+        "database.pool: required key is missing",
+    ]
+
+
+def test_unsupported_schemas():
+    with pytest.raises(ValueError):
+        compile_schema({"anyOf": [{"type": "string"}]})
+    with pytest.raises(ValueError):
+        compile_schema({"type": "decimal"})
+    with pytest.raises(TypeError):
+        compile_schema("string")
+
+
+def test_compile_changed_schema():
+    schema = {"properties": {"port": {"type": "integer"}}}
+    assert compile_schema(schema).validate({"port": 5}) == []
+    schema["properties"]["port"]["type"] = "string"
+    assert messages(compile_schema(schema).validate({"port": 5})) == [
+        "port: expected string, got integer"
+    ]
+
+
+def test_loader_reports_source(layered):
+    filepath, default_directory = layered
+    stats = LoadStats()
+    loader = ConfigLoader(filepath, default_directory, schema=SCHEMA, stats=stats)
+
+    with pytest.raises(ConfigValidationError) as error:
+        loader.load()
+    (violation,) = error.value.violations
+    assert violation.path == ("database", "port")
+    assert violation.source == str(filepath)
+    assert error.value.stem == "app"
+    assert f"database.port: expected integer, got string (from {filepath})" in str(
+        error.value
+    )
+    assert "validate" in stats.summary()["phases"]
+
+    # A selection is only part of the configuration, so it is not validated
+    assert loader.load(select=["mode"]) == {"mode": "dev"}
+
+    filepath.write_text("database:\n  port: 5433\n")
+    assert load_configs(filepath, default_directory, schema=SCHEMA)["database"] == {
+        "host": "localhost",
+        "port": 5433,
+    }
+
+
+def test_schemas_per_stem(layered, tmp_path):
+    filepath, default_directory = layered
+    # A stem named like a schema keyword is not mistaken for a schema
+    other = tmp_path / "items.json"
+    other.write_text('{"enabled": "yes"}')
+    loader = ConfigLoader(
+        [filepath, other],
+        default_directory,
+        schemas={"items": {"properties": {"enabled": {"type": "boolean"}}}},
+    )
+    with pytest.raises(ConfigValidationError) as error:
+        loader.load()
+    assert error.value.stem == "items"
+    assert messages(error.value.violations) == [
+        f"enabled: expected boolean, got string (from {other})"
+    ]
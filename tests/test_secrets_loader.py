@@ -1,7 +1,15 @@
 import os
 import pytest
+from pathlib import Path
 
-from config_loader.secrets_loader import parse_secrets, get_secrets, load_secrets
+from config_loader.secrets_loader import (
+    SecretsProvider,
+    compile_secrets,
+    get_secrets_provider,
+    parse_secrets,
+    get_secrets,
+    load_secrets,
+)
 
 
 # Set up environment variables before the test
@@ -60,3 +68,109 @@ def test_load_secrets_file():
 
     assert os.getenv("DB_PASSWORD2") == "secret_pass2"
     assert os.getenv("API_KEY2") == "123456"
+
+
+def test_compile_secrets_records_placeholder_paths():
+    configs = {
+        "database": {"password": "${DB_PASSWORD}", "host": "localhost"},
+        "urls": ["https://${API_KEY}@example.com", "plain"],
+        "combined": "${DB_PASSWORD}:${API_KEY}",
+        "port": 5432,
+    }
+    plan = compile_secrets(configs)
+
+    assert list(plan.templates) == [
+        ("database", "password"),
+        ("urls", 0),
+        ("combined",),
+    ]
+    assert plan.index == {
+        "DB_PASSWORD": [("database", "password"), ("combined",)],
+        "API_KEY": [("urls", 0), ("combined",)],
+    }
+
+
+def test_secrets_plan_resolve_in_place():
+    plain_list = [1, 2, 3]
+    configs = {"urls": ["${API_KEY}", "plain"], "plain_list": plain_list}
+    urls = configs["urls"]
+
+    result = compile_secrets(configs).resolve(configs)
+
+    assert result is configs
+    assert configs["urls"] is urls
+    assert urls == ["12345", "plain"]
+    assert configs["plain_list"] is plain_list
+
+
+def test_secrets_plan_refresh_after_rotation():
+    configs = {"database": "${DB_PASSWORD}", "apikey": "${API_KEY}"}
+    plan = compile_secrets(configs)
+    plan.resolve(configs)
+
+    environ = {"DB_PASSWORD": "rotated", "API_KEY": "unused"}
+    plan.refresh(configs, ["DB_PASSWORD"], environ)
+
+    assert configs == {"database": "rotated", "apikey": "12345"}
+
+
+def test_secrets_provider_does_not_modify_environ(tmp_path):
+    filepath = tmp_path / "secrets.env"
+    filepath.write_text("PROVIDER_SECRET=from_file\nDB_PASSWORD=file_pass\n")
+    provider = SecretsProvider(filepath)
+
+    configs = provider.parse(
+        {"secret": "${PROVIDER_SECRET}", "database": "${DB_PASSWORD}"}
+    )
+
+    assert configs == {"secret": "from_file", "database": "file_pass"}
+    assert "PROVIDER_SECRET" not in os.environ
+    assert os.environ["DB_PASSWORD"] == "secret_pass"
+
+
+def test_secrets_provider_caches_until_file_changes(tmp_path, monkeypatch):
+    import config_loader.secrets_loader as secrets_loader
+
+    filepath = tmp_path / "secrets.env"
+    filepath.write_text("PROVIDER_SECRET=first\n")
+    provider = SecretsProvider(filepath)
+    calls = []
+    dotenv_values = secrets_loader.dotenv_values
+    monkeypatch.setattr(
+        secrets_loader,
+        "dotenv_values",
+        lambda path: calls.append(path) or dotenv_values(path),
+    )
+
+    assert provider.values() == {"PROVIDER_SECRET": "first"}
+    assert provider.values() == {"PROVIDER_SECRET": "first"}
+    assert len(calls) == 1
+
+    filepath.write_text("PROVIDER_SECRET=second_value\n")
+    assert provider.environ()["PROVIDER_SECRET"] == "second_value"
+    assert provider.environ()["API_KEY"] == "12345"
+    assert len(calls) == 2
+
+
+def test_secrets_provider_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        SecretsProvider(tmp_path / "missing.env")
+
+
+def test_get_secrets_provider_is_shared():
+    assert get_secrets_provider("tests/test.env") is get_secrets_provider(
+        Path("tests/test.env").resolve()
+    )
+
+
+def test_get_secrets_provider_keeps_absolute_path(tmp_path, monkeypatch):
+    first = tmp_path / "first"
+    second = tmp_path / "second"
+    for directory, value in ((first, "first"), (second, "second")):
+        directory.mkdir()
+        (directory / "chdir.env").write_text(f"CHDIR_SECRET={value}\n")
+    monkeypatch.chdir(first)
+    provider = get_secrets_provider("chdir.env")
+    monkeypatch.chdir(second)
+    assert provider.values()["CHDIR_SECRET"] == "first"
+    assert get_secrets_provider("chdir.env") is not provider
@@ -0,0 +1,104 @@
+import datetime
+import multiprocessing
+
+import pytest
+
+from config_loader import ConfigLoader, SharedConfig
+from config_loader.shared import encode_config
+from conftest import config_file_mapping
+
+CONFIG = {
+    "database": {
+        "host": "localhost",
+        "port": 5432,
+        "ratio": 0.5,
+        "enabled": True,
+        "password": None,
+        "replicas": ["a", {"host": "b", "port": 5433}, []],
+    },
+    "cache": {"host": "localhost", "port": 6379},
+    "created": datetime.date(2024, 1, 1),
+    "large": 2**70,
+    "ünïcode": "välue",
+    "": {},
+}
+
+
+def _read_port(name):
+    with SharedConfig.attach(name=name) as shared:
+        return shared.root["database"]["replicas"][1]["port"]
+
+
+def test_round_trip():
+    with SharedConfig.publish(CONFIG) as shared:
+        try:
+            root = shared.root
+            assert list(root) == list(CONFIG)
+            assert root["database"]["port"] == 5432
+            assert root["database"]["replicas"][-1] == []
+            assert root["created"] == datetime.date(2024, 1, 1)
+            assert root["large"] == 2**70
+            assert root["ünïcode"] == "välue"
+            assert root.to_dict() == CONFIG
+            assert root == CONFIG
+        finally:
+            shared.unlink()
+
+
+def test_lookups():
+    config = {str(i): i for i in range(100)}
+    with SharedConfig.publish(config) as shared:
+        try:
+            root = shared.root
+            assert all(root[key] == value for key, value in config.items())
+            assert "100" not in root
+            assert root.get(5) is None
+            assert root.get(["unhashable"], "default") == "default"
+            with pytest.raises(KeyError):
+                root["missing"]
+        finally:
+            shared.unlink()
+
+
+def test_repeated_scalars_are_stored_once():
+    value = "x" * 1000
+    config = {f"service{i}": {"url": value} for i in range(100)}
+    assert len(encode_config(config)) < 2 * len(value) + 100 * 100
+
+
+def test_file(tmp_path):
+    path = tmp_path / "config.bin"
+    publisher = SharedConfig.publish(CONFIG, path=path)
+    with SharedConfig.attach(path=path) as shared:
+        assert shared.root.to_dict() == CONFIG
+        assert shared.nbytes == path.stat().st_size
+    publisher.close()
+    publisher.unlink()
+    assert not path.exists()
+
+    path.write_bytes(b"not a configuration")
+    with pytest.raises(ValueError):
+        SharedConfig.attach(path=path)
+
+
+def test_worker_processes():
+    with SharedConfig.publish(CONFIG) as shared:
+        try:
+            context = multiprocessing.get_context("spawn")
+            with context.Pool(2) as pool:
+                assert pool.map(_read_port, [shared.name] * 2) == [5433, 5433]
+            # The workers exiting must not remove the segment
+            with SharedConfig.attach(name=shared.name) as attached:
+                assert attached.root["cache"]["port"] == 6379
+        finally:
+            shared.unlink()
+
+
+def test_publish_loaded_configs():
+    loader = ConfigLoader([config_file_mapping["yaml"], config_file_mapping["toml2"]])
+    configs = loader.load()
+    with SharedConfig.publish(configs) as shared:
+        try:
+            assert shared.root.to_dict() == configs
+        finally:
+            shared.unlink()
@@ -0,0 +1,118 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from config_loader import ConfigLoader, ConfigValidationError
+from config_loader.snapshot import ConfigSnapshot
+
+
+def write_config_set(directory):
+    (directory / "default").mkdir()
+    (directory / "default" / "app-default.yaml").write_text(
+        "name: Default\nsettings:\n  debug: false\n  timeout: 15\n"
+    )
+    (directory / "app.yaml").write_text("name: Example\nsettings:\n  debug: true\n")
+    (directory / "other.toml").write_text('name = "Other"\n')
+    return [directory / "app.yaml", directory / "other.toml"]
+
+
+def test_snapshot_is_written_and_reused(tmp_path):
+    filepaths = write_config_set(tmp_path)
+    snapshot_path = tmp_path / "snapshot.pickle"
+    loader = ConfigLoader(
+        filepaths, tmp_path / "default", cache=False, snapshot=snapshot_path
+    )
+    configs = loader.load()
+    assert snapshot_path.exists()
+    assert configs["app"]["settings"] == {"debug": True, "timeout": 15}
+
+    sources = loader._sources()
+    assert (
+        ConfigSnapshot(snapshot_path).read(sources, options=loader._options())
+        == configs
+    )
+    assert loader.load() == configs
+
+
+def test_snapshot_rebuilt_when_source_changes(tmp_path):
+    filepaths = write_config_set(tmp_path)
+    snapshot_path = tmp_path / "snapshot.pickle"
+    loader = ConfigLoader(
+        filepaths, tmp_path / "default", cache=False, snapshot=snapshot_path
+    )
+    loader.load()
+
+    (tmp_path / "default" / "app-default.yaml").write_text(
+        "name: Default\nsettings:\n  timeout: 20\n"
+    )
+    configs = loader.load()
+    assert configs["app"]["settings"] == {"debug": True, "timeout": 20}
+    assert (
+        ConfigSnapshot(snapshot_path).read(loader._sources(), options=loader._options())
+        == configs
+    )
+
+
+def test_snapshot_default_location(tmp_path):
+    filepaths = write_config_set(tmp_path)
+    loader = ConfigLoader(filepaths, tmp_path / "default", snapshot=True)
+    loader.load()
+    assert (tmp_path / ".config-snapshot.pickle").exists()
+
+
+def test_snapshot_load_skips_parser_imports(tmp_path):
+    filepaths = write_config_set(tmp_path)
+    snapshot_path = tmp_path / "snapshot.pickle"
+    ConfigLoader(filepaths, tmp_path / "default", snapshot=snapshot_path).load()
+
+    script = (
+        "import sys\n"
+        "from config_loader import ConfigLoader\n"
+        f"configs = ConfigLoader({[str(f) for f in filepaths]!r}, {str(tmp_path / 'default')!r},"
+        f" snapshot={str(snapshot_path)!r}).load()\n"
+        "assert configs['other'] == {'name': 'Other'}\n"
+        "print('yaml' in sys.modules, 'tomllib' in sys.modules)\n"
+    )
+    env = dict(os.environ, PYTHONPATH="src")
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    assert result.stdout.split() == ["False", "False"]
+
+
+def test_snapshot_keyed_on_options(tmp_path, monkeypatch):
+    filepaths = write_config_set(tmp_path)
+    (tmp_path / "app.yaml").write_text(
+        "name: Example\nsettings:\n  debug: true\n  url: https://${settings.host}\n"
+        "  host: example.com\n"
+    )
+    monkeypatch.setenv("APP__OTHER__NAME", "Overridden")
+    snapshot_path = tmp_path / "snapshot.pickle"
+
+    def load(**options):
+        return ConfigLoader(
+            filepaths,
+            tmp_path / "default",
+            cache=False,
+            snapshot=snapshot_path,
+            **options,
+        ).load()
+
+    assert load()["app"]["settings"]["url"] == "https://${settings.host}"
+    assert load(references=True)["app"]["settings"]["url"] == "https://example.com"
+    assert load()["app"]["settings"]["url"] == "https://${settings.host}"
+    assert load(env_prefix="APP")["other"]["name"] == "Overridden"
+    assert load()["other"]["name"] == "Other"
+
+    # A snapshot written without a schema was never validated against it
+    schema = {"type": "object", "required": ["missing"]}
+    with pytest.raises(ConfigValidationError):
+        load(schema=schema)
+    schema["required"] = ["name"]
+    assert load(schema=schema)["other"]["name"] == "Other"
@@ -0,0 +1,85 @@
+import logging
+from pathlib import Path
+
+import pytest
+
+from config_loader import ConfigLoader, LoadStats, ParsedFileCache, load_configs
+from config_loader.stats import count_nodes
+from conftest import config_file_mapping
+
+
+def test_phases_recorded_per_file():
+    stats = LoadStats()
+    filepaths = [config_file_mapping["yaml"], config_file_mapping["toml2"]]
+    ConfigLoader(filepaths, cache=False, stats=stats).load()
+
+    summary = stats.summary()
+    assert list(summary["phases"]) == ["check", "defaults", "read", "parse", "merge"]
+    assert summary["phases"]["check"]["calls"] == 2
+    assert summary["phases"]["merge"]["calls"] == 2
+    assert set(summary["files"]) == {str(filepath) for filepath in filepaths}
+    assert summary["total"]["calls"] == len(stats.records)
+    assert summary["total"]["seconds"] >= 0
+
+
+def test_bytes_and_nodes_counted():
+    stats = LoadStats()
+    filepath = config_file_mapping["json"]
+    ConfigLoader(filepath, cache=False, stats=stats).load()
+
+    user_reads = [
+        record
+        for record in stats.records
+        if record.phase == "read" and record.filepath == str(filepath)
+    ]
+    assert sum(record.nbytes for record in user_reads) > 0
+    parse = stats.summary()["phases"]["parse"]
+    assert parse["nodes"] > 0
+
+
+def test_cache_hit_recorded_instead_of_parse():
+    cache = ParsedFileCache()
+    filepath = config_file_mapping["yaml"]
+    ConfigLoader(filepath, cache=cache).load()
+
+    stats = LoadStats()
+    ConfigLoader(filepath, cache=cache, stats=stats).load()
+    phases = stats.summary()["phases"]
+    assert phases["cache"]["calls"] >= 1
+    assert "parse" not in phases
+    assert "read" not in phases
+
+
+def test_secrets_phase_and_reset():
+    stats = LoadStats()
+    load_configs(Path("tests/config-test-secrets.yaml"), stats=stats)
+    assert stats.summary()["phases"]["secrets"]["calls"] == 1
+
+    stats.reset()
+    assert stats.records == []
+    assert stats.summary()["total"]["calls"] == 0
+
+
+def test_measure_records_failed_phase():
+    stats = LoadStats()
+    with pytest.raises(ValueError):
+        with stats.measure("validate", "app.yaml"):
+            raise ValueError
+    (record,) = stats.records
+    assert (record.phase, record.filepath) == ("validate", "app.yaml")
+    assert record.seconds >= 0
+
+
+def test_log_emits_structured_summary(caplog):
+    stats = LoadStats()
+    ConfigLoader(config_file_mapping["toml"], cache=False, stats=stats).load()
+    with caplog.at_level(logging.INFO, logger="config_loader.stats"):
+        stats.log()
+    (record,) = caplog.records
+    assert record.config_load_stats == stats.summary()
+    assert "parse=" in record.getMessage()
+
+
+def test_count_nodes():
+    assert count_nodes({}) == 1
+    assert count_nodes({"a": 1, "b": [1, 2, {"c": None}]}) == 7
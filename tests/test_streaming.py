@@ -0,0 +1,101 @@
+import json
+
+import pytest
+
+from config_loader import ConfigLoader, LoadStats, load_configs
+from config_loader.parsers import get_parser
+from config_loader.streaming import compile_selection, select_json, select_tree
+
+DOCUMENT = {
+    "routing": {
+        "eu-west": {"hosts": ["a", "b"], "weights": {"a": 1, "b": 2}},
+        "us-east": {"hosts": ["c"], "note": 'brackets "}]" and \\ escapes'},
+        "empty": {},
+    },
+    'quoted "key"': {"x": 1},
+    "flags": {"f1": True, "f2": None, "f3": [1, {"g": "]"}]},
+    "scalar": 1.5,
+}
+
+
+@pytest.mark.parametrize(
+    "paths",
+    [
+        ["routing.eu-west"],
+        ["routing.eu-west.weights.b", "flags.f3"],
+        ["routing.empty", 'quoted "key".x'],
+        ["routing", "routing.eu-west"],
+        ["scalar.below", "missing", "routing.missing.key"],
+    ],
+)
+@pytest.mark.parametrize("indent", [None, 2])
+def test_select_json_matches_full_parse(paths, indent):
+    data = json.dumps(DOCUMENT, indent=indent).encode()
+    selection = compile_selection(paths)
+    expected = select_tree(DOCUMENT, selection)
+    assert select_json(data, selection, get_parser(".json").loads) == expected
+
+
+def test_compile_selection():
+    assert compile_selection(["a.b", "a.c.d", "a"]) == {"a": {}}
+    assert compile_selection(["a.b.c", ("a", "b.c")]) == {
+        "a": {"b": {"c": {}}, "b.c": {}}
+    }
+    with pytest.raises(ValueError):
+        compile_selection([""])
+
+
+def test_malformed_json_raises(tmp_path):
+    filepath = tmp_path / "broken.json"
+    filepath.write_text('{"routing": {"eu-west": [1, 2')
+    with pytest.raises(ValueError, match="broken.json"):
+        ConfigLoader(filepath, tmp_path).load(select=["routing.eu-west"])
+
+
+def test_load_select_with_defaults(tmp_path):
+    (tmp_path / "routes-default.yaml").write_text(
+        "routing:\n  eu-west:\n    timeout: 5\n    retries: 3\n  us-east:\n    timeout: 9\n"
+    )
+    filepath = tmp_path / "routes.json"
+    filepath.write_text(json.dumps(DOCUMENT))
+    stats = LoadStats()
+
+    config = ConfigLoader(filepath, tmp_path, stats=stats).load(
+        select=["routing.eu-west", "scalar"]
+    )
+
+    assert config == {
+        "routing": {
+            "eu-west": {
+                "timeout": 5,
+                "retries": 3,
+                "hosts": ["a", "b"],
+                "weights": {"a": 1, "b": 2},
+            }
+        },
+        "scalar": 1.5,
+    }
+    parsed = [
+        record.nbytes
+        for record in stats.records
+        if record.phase == "parse" and record.filepath == str(filepath)
+    ]
+    assert 0 < sum(parsed) < filepath.stat().st_size / 2
+
+
+def test_select_bypasses_cache_and_snapshot(tmp_path):
+    filepath = tmp_path / "app.json"
+    filepath.write_text(json.dumps(DOCUMENT))
+    snapshot = tmp_path / "snapshot.pickle"
+    loader = ConfigLoader(filepath, tmp_path, snapshot=snapshot)
+
+    assert loader.load(select=["flags.f1"]) == {"flags": {"f1": True}}
+    assert not snapshot.exists()
+    assert loader.load() == DOCUMENT
+
+
+def test_load_configs_select_lazy(tmp_path):
+    filepath = tmp_path / "app.json"
+    filepath.write_text(json.dumps(DOCUMENT))
+    configs = load_configs([filepath], tmp_path, lazy=True, select=["flags.f2"])
+    assert configs["app"] == {"flags": {"f2": None}}
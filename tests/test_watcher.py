@@ -0,0 +1,124 @@
+import os
+import threading
+
+from config_loader import ConfigLoader, ConfigWatcher
+from config_loader.watcher import diff_configs
+
+
+def write(filepath, text):
+    # Bump the modification time explicitly, coarse filesystem timestamps could hide the change
+    mtime_ns = filepath.stat().st_mtime_ns if filepath.exists() else 0
+    filepath.write_text(text)
+    stat = filepath.stat()
+    if stat.st_mtime_ns <= mtime_ns:
+        os.utime(filepath, ns=(stat.st_atime_ns, mtime_ns + 1_000_000))
+
+
+def make_loader(tmp_path):
+    (tmp_path / "default").mkdir()
+    write(
+        tmp_path / "default" / "app-default.yaml",
+        "database:\n  host: localhost\n  pool:\n    size: 5\n",
+    )
+    write(tmp_path / "app.yaml", "database:\n  pool:\n    size: 10\nname: app\n")
+    write(tmp_path / "other.json", '{"name": "other"}')
+    return ConfigLoader(
+        [tmp_path / "app.yaml", tmp_path / "other.json"], tmp_path / "default"
+    )
+
+
+def test_diff_configs():
+    old = {"a": 1, "b": {"c": [1, 2], "d": "x"}, "e": True}
+    new = {"a": 1, "b": {"c": [1, 2, 3], "d": "x"}, "e": 1, "f": None}
+    assert sorted(diff_configs(old, new)) == [("b", "c"), ("e",), ("f",)]
+    assert diff_configs(old, old) == []
+
+
+def test_watcher_reports_changed_paths(tmp_path):
+    watcher = ConfigWatcher(make_loader(tmp_path))
+    notifications = []
+    watcher.subscribe(lambda paths, configs: notifications.append(paths))
+
+    assert watcher.check() == []
+    write(tmp_path / "app.yaml", "database:\n  pool:\n    size: 20\nname: app\n")
+    assert watcher.check() == [("app", "database", "pool", "size")]
+    assert watcher.configs["app"]["database"] == {
+        "host": "localhost",
+        "pool": {"size": 20},
+    }
+    assert notifications == [[("app", "database", "pool", "size")]]
+
+
+def test_watcher_reloads_only_changed_stem(tmp_path):
+    watcher = ConfigWatcher(make_loader(tmp_path))
+    other = watcher.configs["other"]
+
+    write(
+        tmp_path / "default" / "app-default.yaml",
+        "database:\n  host: db.example.com\n  pool:\n    size: 5\n",
+    )
+    assert watcher.check() == [("app", "database", "host")]
+    assert watcher.configs["other"] is other
+
+
+def test_watcher_keeps_config_on_parse_error(tmp_path):
+    watcher = ConfigWatcher(make_loader(tmp_path))
+    write(tmp_path / "other.json", '{"name": ')
+    assert watcher.check() == []
+    assert watcher.configs["other"] == {"name": "other"}
+
+    write(tmp_path / "other.json", '{"name": "renamed"}')
+    assert watcher.check() == [("other", "name")]
+
+
+def test_watcher_thread(tmp_path):
+    for use_inotify in (True, False):
+        path = tmp_path / str(use_inotify)
+        path.mkdir()
+        changed = threading.Event()
+        watcher = ConfigWatcher(
+            make_loader(path), interval=0.05, use_inotify=use_inotify
+        )
+        watcher.subscribe(lambda paths, configs: changed.set())
+        with watcher:
+            write(path / "other.json", '{"name": "renamed"}')
+            assert changed.wait(5)
+        assert watcher.configs["other"] == {"name": "renamed"}
+
+
+def test_watcher_parses_secrets(tmp_path):
+    loader = make_loader(tmp_path)
+    write(tmp_path / "secrets.env", "DB_HOST=db.example.com\nDB_USER=admin\n")
+    write(tmp_path / "other.json", '{"name": "other", "user": "${DB_USER}"}')
+    watcher = ConfigWatcher(loader, secrets_filepath=tmp_path / "secrets.env")
+    assert watcher.configs["other"]["user"] == "admin"
+
+    write(
+        tmp_path / "app.yaml",
+        "database:\n  host: ${DB_HOST}\n  pool:\n    size: 10\nname: app\n",
+    )
+    assert watcher.check() == [("app", "database", "host")]
+    assert watcher.configs["app"]["database"]["host"] == "db.example.com"
+    assert watcher.configs["other"]["user"] == "admin"
+
+
+def test_watcher_watches_new_fragment_directories(tmp_path):
+    (tmp_path / "default").mkdir()
+    (tmp_path / "shared").mkdir()
+    write(tmp_path / "shared" / "db.json", '{"host": "db-1"}')
+    write(tmp_path / "app.json", '{"name": "app"}')
+    loader = ConfigLoader(tmp_path / "app.json", tmp_path / "default", includes=True)
+    changed = threading.Event()
+    watcher = ConfigWatcher(loader, interval=0.05)
+    watcher.subscribe(lambda paths, configs: changed.set())
+    with watcher:
+        write(
+            tmp_path / "app.json",
+            '{"name": "app", "database": {"$include": "shared/db.json"}}',
+        )
+        assert changed.wait(5)
+        assert watcher.configs["database"] == {"host": "db-1"}
+        changed.clear()
+        write(tmp_path / "shared" / "db.json", '{"host": "db-2"}')
+        assert changed.wait(5)
+    assert watcher.configs["database"] == {"host": "db-2"}